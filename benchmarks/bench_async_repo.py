@@ -0,0 +1,117 @@
+"""Compare the sync and asyncio repositories under concurrent load.
+
+Runs the same mix of ``get`` lookups and ``complete`` writes three ways:
+sequentially on the sync repository, on the sync repository from a
+thread pool, and as ``asyncio.gather`` on the async repository.
+
+    python -m benchmarks.bench_async_repo --operations 5000 --concurrency 1,8,32
+"""
+
+import asyncio
+from argparse import ArgumentParser
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from pathlib import Path
+from random import Random
+from tempfile import TemporaryDirectory
+
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from .common import (
+    create_database,
+    seed_tasks,
+    session_context,
+    sqlite_url,
+    timer,
+)
+
+from src.task_manager.database import async_database_url
+from src.task_manager.repositories import (
+    AsyncSQLAlchemyTaskRepository,
+    SQLAlchemyTaskRepository,
+)
+
+
+def workload(operations: int, rows: int, write_ratio: float) -> list[tuple[str, int]]:
+    rng = Random(7)
+    return [
+        ("complete" if rng.random() < write_ratio else "get", rng.randint(1, rows))
+        for _ in range(operations)
+    ]
+
+
+def run_sync(repository, operations, concurrency: int) -> float:
+    def call(operation):
+        name, task_id = operation
+        return getattr(repository, name)(task_id)
+
+    with timer() as elapsed:
+        if concurrency == 1:
+            for operation in operations:
+                call(operation)
+        else:
+            with ThreadPoolExecutor(concurrency) as pool:
+                list(pool.map(call, operations))
+
+    return elapsed()
+
+
+async def run_async(repository, operations, concurrency: int) -> float:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def call(operation):
+        name, task_id = operation
+
+        async with semaphore:
+            return await getattr(repository, name)(task_id)
+
+    with timer() as elapsed:
+        await asyncio.gather(*(call(operation) for operation in operations))
+
+    return elapsed()
+
+
+def async_repository(url: str):
+    engine = create_async_engine(async_database_url(url))
+
+    @asynccontextmanager
+    async def get_async_db():
+        async with AsyncSession(engine, expire_on_commit=False) as db:
+            yield db
+
+    return engine, AsyncSQLAlchemyTaskRepository(get_async_db)
+
+
+def main() -> None:
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--operations", type=int, default=5_000)
+    parser.add_argument("--write-ratio", type=float, default=0.1)
+    parser.add_argument("--concurrency", default="1,8,32")
+    args = parser.parse_args()
+
+    operations = workload(args.operations, args.rows, args.write_ratio)
+
+    with TemporaryDirectory() as directory:
+        url = sqlite_url(Path(directory), "tasks.db")
+        engine = create_database(url)
+        seed_tasks(engine, args.rows)
+        sync_repository = SQLAlchemyTaskRepository(session_context(engine))
+
+        print(f"{'mode':<14} {'concurrency':>11} {'ops/s':>10}")
+
+        for concurrency in map(int, args.concurrency.split(",")):
+            mode = "sync" if concurrency == 1 else "sync threads"
+            seconds = run_sync(sync_repository, operations, concurrency)
+            print(f"{mode:<14} {concurrency:>11} {len(operations) / seconds:>10.0f}")
+
+            async_engine, repository = async_repository(url)
+            seconds = asyncio.run(run_async(repository, operations, concurrency))
+            asyncio.run(async_engine.dispose())
+            print(f"{'async':<14} {concurrency:>11} {len(operations) / seconds:>10.0f}")
+
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""Compare write throughput of per-call commits and group commit.
+
+Each of ``--threads`` workers adds tasks and completes every other one it
+added, either through ``SQLAlchemyTaskRepository`` (one transaction per
+call) or through a shared ``GroupCommitWriter``. Every run gets a fresh
+database file under the chosen SQLite profile:
+
+    python -m benchmarks.bench_group_commit --threads 1,4,16,64 --profile safe
+"""
+
+from argparse import ArgumentParser
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from .common import BASE, Task, migrate, parse_sizes, session_context, sqlite_url, timer
+
+from src.task_manager.config import SQLITE_PROFILES, PoolOptions
+from src.task_manager.database import create_database_engine
+from src.task_manager.group_commit import GroupCommitWriter
+from src.task_manager.repositories import SQLAlchemyTaskRepository
+
+DUE_DATE = datetime(2030, 1, 1)
+
+
+def per_call(repository: SQLAlchemyTaskRepository, writes: int) -> None:
+    for number in range(writes // 2):
+        task_id = repository.add(Task(name=f"Task {number}", due_date=DUE_DATE))
+
+        if number % 2:
+            repository.complete(task_id)
+
+
+def grouped(writer: GroupCommitWriter, writes: int) -> None:
+    pending = []
+
+    for number in range(writes // 2):
+        # Each caller waits for its own write, like a request handler would.
+        task_id = writer.add(Task(name=f"Task {number}", due_date=DUE_DATE)).result()
+
+        if number % 2:
+            pending.append(writer.complete(task_id))
+
+    for future in pending:
+        future.result()
+
+
+def run(thread_counts: list[int], writes: int, profile: str) -> list[dict]:
+    results = []
+
+    with TemporaryDirectory() as directory:
+        for threads in thread_counts:
+            for mode in ("per-call", "grouped"):
+                engine = create_database_engine(
+                    sqlite_url(Path(directory), f"{mode}-{threads}.db"),
+                    SQLITE_PROFILES[profile] | {"busy_timeout": "30000"},
+                    PoolOptions(size=threads + 1, max_overflow=0),
+                )
+                BASE.metadata.create_all(bind=engine)
+                migrate(engine)
+                context = session_context(engine)
+                per_thread = writes // threads
+
+                with ThreadPoolExecutor(max_workers=threads) as executor:
+                    if mode == "per-call":
+                        repository = SQLAlchemyTaskRepository(context)
+
+                        with timer() as seconds:
+                            for future in [
+                                executor.submit(per_call, repository, per_thread)
+                                for _ in range(threads)
+                            ]:
+                                future.result()
+                        batches = None
+                    else:
+                        with GroupCommitWriter(context) as writer:
+                            with timer() as seconds:
+                                for future in [
+                                    executor.submit(grouped, writer, per_thread)
+                                    for _ in range(threads)
+                                ]:
+                                    future.result()
+                        batches = writer.stats.batches
+
+                done = per_thread // 2 * threads + per_thread // 4 * threads
+                results.append({
+                    "threads": threads,
+                    "mode": mode,
+                    "writes_per_s": done / seconds(),
+                    "batches": batches,
+                })
+                engine.dispose()
+
+    return results
+
+
+def main() -> None:
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--threads", type=parse_sizes, default="1,4,16,64")
+    parser.add_argument("--writes", type=int, default=4_000)
+    parser.add_argument("--profile", choices=SQLITE_PROFILES, default="default")
+    args = parser.parse_args()
+
+    print(f"{'threads':>8} {'mode':>9} {'writes/s':>10} {'batches':>8}")
+
+    for result in run(args.threads, args.writes, args.profile):
+        batches = "-" if result["batches"] is None else result["batches"]
+        print(
+            f"{result['threads']:>8} {result['mode']:>9} "
+            f"{result['writes_per_s']:>10.0f} {batches:>8}"
+        )
+
+
+if __name__ == "__main__":
+    main()
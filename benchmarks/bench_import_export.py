@@ -0,0 +1,99 @@
+"""Measure bulk import and streaming export throughput and peak memory.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_import_export --sizes 100k,1m
+"""
+
+import sys
+from argparse import ArgumentParser
+from tempfile import TemporaryDirectory
+from pathlib import Path
+
+from .common import (
+    create_database,
+    parse_sizes,
+    session_context,
+    sqlite_url,
+    synthetic_tasks,
+    timer,
+)
+
+from src.task_manager.repositories import SQLAlchemyTaskRepository
+from src.task_manager.serialization import (
+    TaskFormat,
+    read_tasks,
+    write_tasks,
+)
+
+
+def peak_rss_mb() -> float:
+    try:
+        from resource import getrusage, RUSAGE_SELF  # pylint: disable=import-outside-toplevel
+    except ImportError:
+        return float("nan")
+
+    peak = getrusage(RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS reports bytes.
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def write_source_file(path: Path, size: int, fmt: TaskFormat) -> None:
+    rows = (
+        {"id": number, **row}
+        for number, row in enumerate(synthetic_tasks(size), start=1)
+    )
+
+    with path.open("w", encoding="utf-8", newline="") as stream:
+        write_tasks(rows, stream, fmt)
+
+
+def run(size: int, fmt: TaskFormat, batch_size: int) -> dict:
+    with TemporaryDirectory() as directory:
+        directory = Path(directory)
+        source = directory / f"tasks.{fmt.value}"
+        target = directory / f"export.{fmt.value}"
+        write_source_file(source, size, fmt)
+
+        engine = create_database(sqlite_url(directory, "tasks.db"))
+        repository = SQLAlchemyTaskRepository(session_context(engine))
+
+        with source.open(encoding="utf-8", newline="") as stream, timer() as imported:
+            repository.add_many(read_tasks(stream, fmt), batch_size=batch_size)
+
+        with target.open("w", encoding="utf-8", newline="") as stream, timer() as exported:
+            write_tasks(repository.export_rows(), stream, fmt)
+
+        engine.dispose()
+
+    return {
+        "rows": size,
+        "format": fmt.value,
+        "import_s": imported(),
+        "export_s": exported(),
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def main() -> None:
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=parse_sizes, default="100k,1m")
+    parser.add_argument("--format", type=TaskFormat, default=TaskFormat.jsonl)
+    parser.add_argument("--batch-size", type=int, default=10_000)
+    args = parser.parse_args()
+
+    print(f"{'rows':>9} {'format':<6} {'import s':>9} {'rows/s':>10} "
+          f"{'export s':>9} {'rows/s':>10} {'peak MB':>8}")
+
+    for size in args.sizes:
+        result = run(size, args.format, args.batch_size)
+        print(
+            f"{result['rows']:>9} {result['format']:<6} "
+            f"{result['import_s']:>9.2f} {size / result['import_s']:>10.0f} "
+            f"{result['export_s']:>9.2f} {size / result['export_s']:>10.0f} "
+            f"{result['peak_rss_mb']:>8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Compare status-filter query times with and without the task indexes.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_indexes --sizes 10k,100k,1m
+"""
+
+from argparse import ArgumentParser
+from datetime import datetime
+from tempfile import TemporaryDirectory
+from pathlib import Path
+
+from sqlalchemy import select, text
+
+from .common import (
+    Task,
+    best_of,
+    create_database,
+    parse_sizes,
+    seed_tasks,
+    sqlite_url,
+)
+
+INDEX_NAMES = ("ix_tasks_completed_due_date", "ix_tasks_due_date")
+
+
+def status_queries(now: datetime) -> dict:
+    return {
+        "completed": select(Task.id).where(Task.completed.is_(True)),
+        "pending": select(Task.id).where(
+            Task.completed.is_(False), Task.due_date >= now),
+        "overdue": select(Task.id).where(
+            Task.completed.is_(False), Task.due_date < now),
+    }
+
+
+def time_queries(engine, queries: dict, repeat: int) -> dict:
+    timings = {}
+
+    with engine.connect() as connection:
+        for name, query in queries.items():
+            timings[name] = best_of(
+                repeat, lambda q=query: connection.execute(q).all())
+
+    return timings
+
+
+def run(sizes: list[int], repeat: int) -> list[dict]:
+    results = []
+    now = datetime.now()
+    queries = status_queries(now)
+
+    with TemporaryDirectory() as directory:
+        for size in sizes:
+            engine = create_database(sqlite_url(Path(directory), f"{size}.db"))
+            seed_tasks(engine, size)
+
+            with engine.begin() as connection:
+                connection.execute(text("ANALYZE"))
+
+            indexed = time_queries(engine, queries, repeat)
+
+            with engine.begin() as connection:
+                for name in INDEX_NAMES:
+                    connection.execute(text(f"DROP INDEX {name}"))
+
+            scanned = time_queries(engine, queries, repeat)
+            engine.dispose()
+
+            for name in queries:
+                results.append({
+                    "rows": size,
+                    "query": name,
+                    "scan_ms": scanned[name] * 1000,
+                    "index_ms": indexed[name] * 1000,
+                })
+
+    return results
+
+
+def main() -> None:
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=parse_sizes, default="10k,100k,1m")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'rows':>9} {'query':<10} {'scan ms':>10} {'index ms':>10} {'speedup':>8}")
+
+    for result in run(args.sizes, args.repeat):
+        speedup = result["scan_ms"] / max(result["index_ms"], 1e-9)
+        print(
+            f"{result['rows']:>9} {result['query']:<10} "
+            f"{result['scan_ms']:>10.2f} {result['index_ms']:>10.2f} "
+            f"{speedup:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Measure rows/second for each `list --format` encoder and the rich table.
+
+Rows are generated in memory and written to a discarding stream, so only
+encoding is timed:
+
+    python -m benchmarks.bench_output_formats --rows 100k
+"""
+
+from argparse import ArgumentParser
+
+from .common import NullStream, best_of, parse_sizes, synthetic_tasks
+
+from src.task_manager.models import TaskSummary
+from src.task_manager.serialization import OutputFormat, write_records
+from src.task_manager.commands.todos import print_task_pages
+
+
+def summaries(count: int) -> list[TaskSummary]:
+    return [
+        TaskSummary(
+            number,
+            row["name"],
+            row["due_date"],
+            row["description"],
+            "completed" if row["completed"] else "pending",
+        )
+        for number, row in enumerate(synthetic_tasks(count), start=1)
+    ]
+
+
+def render_table(rows: list[TaskSummary]) -> None:
+    from rich import reconfigure
+
+    reconfigure(file=NullStream(), width=120, force_terminal=False)
+    print_task_pages(rows, len(rows))
+
+
+def run(rows: int, table_rows: int, repeat: int) -> list[dict]:
+    results = []
+    data = summaries(rows)
+
+    for fmt in OutputFormat:
+        if fmt == OutputFormat.table:
+            # Rich tables grow superlinearly, so time a smaller sample.
+            sample = data[:table_rows]
+            seconds = best_of(repeat, lambda s=sample: render_table(s))
+            count = len(sample)
+        else:
+            seconds = best_of(repeat, lambda f=fmt: write_records(
+                data, TaskSummary._fields, NullStream(), f))
+            count = len(data)
+
+        results.append({
+            "format": fmt.value,
+            "rows": count,
+            "ms": seconds * 1000,
+            "rows_per_s": count / seconds,
+        })
+
+    return results
+
+
+def main() -> None:
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=lambda v: parse_sizes(v)[0], default="100k")
+    parser.add_argument("--table-rows", type=lambda v: parse_sizes(v)[0], default="2k")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'format':<7} {'rows':>8} {'ms':>10} {'rows/s':>12}")
+
+    for result in run(args.rows, args.table_rows, args.repeat):
+        print(
+            f"{result['format']:<7} {result['rows']:>8} "
+            f"{result['ms']:>10.1f} {result['rows_per_s']:>12,.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
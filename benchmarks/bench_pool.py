@@ -0,0 +1,106 @@
+"""Compare repository throughput across worker threads and pool types.
+
+Every worker shares one ``SQLAlchemyTaskRepository`` and runs a read mix
+(a lookup by ID and the first page of pending summaries) against a seeded
+database file, for each connection pool:
+
+    python -m benchmarks.bench_pool --size 100k --workers 1,2,4,8
+"""
+
+from argparse import ArgumentParser
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from pathlib import Path
+from random import Random
+from tempfile import TemporaryDirectory
+
+from .common import (
+    BASE,
+    best_of,
+    migrate,
+    parse_sizes,
+    seed_tasks,
+    session_context,
+    sqlite_url,
+)
+
+from src.task_manager.config import PoolOptions
+from src.task_manager.database import create_database_engine
+from src.task_manager.repositories import SQLAlchemyTaskRepository
+
+POOLS = ("queue", "thread", "null")
+OPERATIONS = 2_000
+
+
+def read_mix(repository, size: int, seed: int, count: int) -> None:
+    rng = Random(seed)
+
+    for _ in range(count):
+        repository.get(rng.randint(1, size))
+        list(islice(repository.iter_summaries(completed=False, page_size=20), 20))
+
+
+def run(size: int, worker_counts: list[int], repeat: int) -> list[dict]:
+    results = []
+
+    with TemporaryDirectory() as directory:
+        url = sqlite_url(Path(directory), "tasks.db")
+        seed_engine = create_database_engine(url)
+        BASE.metadata.create_all(bind=seed_engine)
+        migrate(seed_engine)
+        seed_tasks(seed_engine, size)
+        seed_engine.dispose()
+
+        for pool in POOLS:
+            # One long-lived executor per pool: the per-thread pool closes
+            # connections beyond its size, so the set of threads must stay
+            # fixed (the workers plus this thread).
+            options = PoolOptions(
+                size=max(worker_counts) + 1, max_overflow=0, sqlite_pool=pool)
+            engine = create_database_engine(url, pool=options)
+            repository = SQLAlchemyTaskRepository(session_context(engine))
+
+            with ThreadPoolExecutor(max_workers=max(worker_counts)) as executor:
+                for workers in worker_counts:
+                    per_worker = OPERATIONS // workers
+
+                    def batch(workers=workers, per_worker=per_worker):
+                        for future in [
+                            executor.submit(read_mix, repository, size, seed, per_worker)
+                            for seed in range(workers)
+                        ]:
+                            future.result()
+
+                    seconds = best_of(repeat, batch)
+                    results.append({
+                        "pool": pool,
+                        "workers": workers,
+                        "ops_per_s": per_worker * workers / seconds,
+                    })
+
+            engine.dispose()
+
+    return results
+
+
+def main() -> None:
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=parse_sizes, default="100k")
+    parser.add_argument("--workers", type=parse_sizes, default="1,2,4,8")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'pool':>6} {'workers':>8} {'ops/s':>10} {'speedup':>8}")
+    single = {}
+
+    for result in run(args.size[0], args.workers, args.repeat):
+        single.setdefault(result["pool"], result["ops_per_s"])
+        print(
+            f"{result['pool']:>6} {result['workers']:>8} "
+            f"{result['ops_per_s']:>10.0f} "
+            f"{result['ops_per_s'] / single[result['pool']]:>7.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
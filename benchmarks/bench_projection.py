@@ -0,0 +1,103 @@
+"""Compare listing through ORM Task objects with the SQL status projection.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_projection --sizes 10k,100k
+"""
+
+import tracemalloc
+from argparse import ArgumentParser
+from datetime import datetime
+from tempfile import TemporaryDirectory
+from pathlib import Path
+
+from .common import (
+    best_of,
+    create_database,
+    parse_sizes,
+    seed_tasks,
+    session_context,
+    sqlite_url,
+)
+
+from src.task_manager.repositories import SQLAlchemyTaskRepository
+
+PAGE_SIZE = 1_000
+
+
+def hydrate_tasks(repository: SQLAlchemyTaskRepository) -> int:
+    """The old `list` path: full ORM rows, status decided in Python."""
+    count = 0
+
+    for task in repository.iter_tasks(page_size=PAGE_SIZE):
+        now = datetime.now()
+        _ = (
+            "completed" if task.completed
+            else "pending" if task.due_date >= now
+            else "overdue"
+        )
+        count += 1
+
+    return count
+
+
+def project_summaries(repository: SQLAlchemyTaskRepository) -> int:
+    count = 0
+
+    for summary in repository.iter_summaries(page_size=PAGE_SIZE):
+        _ = summary.status
+        count += 1
+
+    return count
+
+
+def peak_kib(func, repository) -> float:
+    tracemalloc.start()
+    func(repository)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 1024
+
+
+def run(sizes: list[int], repeat: int) -> list[dict]:
+    results = []
+    methods = {"orm": hydrate_tasks, "projection": project_summaries}
+
+    with TemporaryDirectory() as directory:
+        for size in sizes:
+            engine = create_database(sqlite_url(Path(directory), f"{size}.db"))
+            seed_tasks(engine, size)
+            repository = SQLAlchemyTaskRepository(session_context(engine))
+
+            for name, func in methods.items():
+                seconds = best_of(repeat, lambda f=func: f(repository))
+                results.append({
+                    "rows": size,
+                    "method": name,
+                    "ms": seconds * 1000,
+                    "rows_per_s": size / seconds,
+                    "peak_kib": peak_kib(func, repository),
+                })
+
+            engine.dispose()
+
+    return results
+
+
+def main() -> None:
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=parse_sizes, default="10k,100k")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'rows':>9} {'method':<11} {'ms':>10} {'rows/s':>12} {'peak KiB':>10}")
+
+    for result in run(args.sizes, args.repeat):
+        print(
+            f"{result['rows']:>9} {result['method']:<11} {result['ms']:>10.1f} "
+            f"{result['rows_per_s']:>12,.0f} {result['peak_kib']:>10.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""Time a month view over many recurrence rules.
+
+Each rule repeats one seeded task daily, weekly, monthly or on a weekday
+cron schedule; one in ten rules also has a skipped occurrence in the
+month. The view is expanded lazily from the rules and that month's
+exceptions, and the statements it runs are counted:
+
+    python -m benchmarks.bench_recurrence --rules 10k
+"""
+
+from argparse import ArgumentParser
+from datetime import datetime, timedelta
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from sqlalchemy import event, insert, select
+
+from .common import (
+    Task,
+    best_of,
+    create_database,
+    parse_sizes,
+    seed_tasks,
+    session_context,
+    sqlite_url,
+)
+
+from src.task_manager.models import RecurrenceException, RecurrenceRule
+from src.task_manager.recurrence import Rule, occurrence_times
+from src.task_manager.repositories import SQLAlchemyRecurrenceRepository
+
+SCHEDULES = (
+    ("daily", None),
+    ("weekly", None),
+    ("monthly", None),
+    ("cron", "30 9 * * 1-5"),
+)
+
+
+def seed_rules(engine, count: int, window_start: datetime, window_end: datetime) -> None:
+    with engine.begin() as connection:
+        tasks = connection.execute(
+            select(Task.id, Task.due_date).order_by(Task.id).limit(count)).all()
+        rules = []
+
+        for number, (task_id, due_date) in enumerate(tasks):
+            frequency, cron = SCHEDULES[number % len(SCHEDULES)]
+            rules.append({
+                "task_id": task_id,
+                "frequency": frequency,
+                "interval": 1,
+                "cron": cron,
+                "starts_at": min(due_date, window_start - timedelta(days=1)),
+                "until": None,
+            })
+
+        connection.execute(insert(RecurrenceRule), rules)
+        stored = connection.execute(select(
+            RecurrenceRule.id, RecurrenceRule.task_id,
+            RecurrenceRule.name, RecurrenceRule.description,
+            RecurrenceRule.frequency, RecurrenceRule.interval, RecurrenceRule.cron,
+            RecurrenceRule.starts_at, RecurrenceRule.until,
+        )).all()
+
+        exceptions = []
+
+        for row in stored[::10]:
+            when = next(occurrence_times(Rule._make(row), window_start, window_end), None)
+
+            if when is not None:
+                exceptions.append({"rule_id": row.id, "occurs_at": when, "kind": "skip"})
+
+        connection.execute(insert(RecurrenceException), exceptions)
+
+
+def run(rule_counts: list[int], repeat: int) -> list[dict]:
+    results = []
+    today = datetime.now()
+    window_start = datetime(today.year, today.month, 1)
+    window_end = (window_start + timedelta(days=32)).replace(day=1)
+
+    with TemporaryDirectory() as directory:
+        for count in rule_counts:
+            engine = create_database(sqlite_url(Path(directory), f"{count}.db"))
+            seed_tasks(engine, count)
+            seed_rules(engine, count, window_start, window_end)
+            repository = SQLAlchemyRecurrenceRepository(session_context(engine))
+
+            statements = []
+
+            def record(conn, cursor, statement, *args):
+                statements.append(statement)
+
+            event.listen(engine, "before_cursor_execute", record)
+            occurrences = sum(
+                1 for _ in repository.iter_occurrences(window_start, window_end))
+            event.remove(engine, "before_cursor_execute", record)
+
+            seconds = best_of(repeat, lambda r=repository: sum(
+                1 for _ in r.iter_occurrences(window_start, window_end)))
+            first_page = best_of(repeat, lambda r=repository: list(zip(
+                range(100), r.iter_occurrences(window_start, window_end))))
+
+            results.append({
+                "rules": count,
+                "occurrences": occurrences,
+                "statements": len(statements),
+                "month_ms": seconds * 1000,
+                "first_100_ms": first_page * 1000,
+            })
+            engine.dispose()
+
+    return results
+
+
+def main() -> None:
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rules", type=parse_sizes, default="1k,10k")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'rules':>7} {'occurrences':>12} {'statements':>11} "
+          f"{'month ms':>10} {'first 100 ms':>13}")
+
+    for result in run(args.rules, args.repeat):
+        print(
+            f"{result['rules']:>7} {result['occurrences']:>12} "
+            f"{result['statements']:>11} {result['month_ms']:>10.1f} "
+            f"{result['first_100_ms']:>13.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
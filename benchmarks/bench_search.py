@@ -0,0 +1,87 @@
+"""Compare FTS5 search with a LIKE '%word%' scan over the tasks table.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_search --sizes 100k,1m
+"""
+
+from argparse import ArgumentParser
+from tempfile import TemporaryDirectory
+from pathlib import Path
+
+from sqlalchemy import or_, select
+
+from .common import (
+    Task,
+    best_of,
+    create_database,
+    parse_sizes,
+    seed_tasks,
+    session_context,
+    sqlite_url,
+)
+
+from src.task_manager.repositories import SQLAlchemyTaskRepository
+
+LIMIT = 20
+
+
+def like_scan(engine, word: str) -> list:
+    pattern = f"%{word}%"
+    query = (
+        select(Task.id)
+        .where(or_(Task.name.like(pattern), Task.description.like(pattern)))
+        .limit(LIMIT)
+    )
+
+    with engine.connect() as connection:
+        return connection.execute(query).all()
+
+
+def run(sizes: list[int], repeat: int) -> list[dict]:
+    results = []
+
+    with TemporaryDirectory() as directory:
+        for size in sizes:
+            engine = create_database(sqlite_url(Path(directory), f"{size}.db"))
+            seed_tasks(engine, size)
+            repository = SQLAlchemyTaskRepository(session_context(engine))
+
+            # A word from the last row: LIKE has to scan the whole table.
+            word = str(size - 1)
+            searches = {
+                "like": lambda: like_scan(engine, word),
+                "fts": lambda: repository.search(word, limit=LIMIT, prefix=False),
+                "fts prefix": lambda: repository.search(word[:-1], limit=LIMIT),
+            }
+
+            for name, func in searches.items():
+                results.append({
+                    "rows": size,
+                    "method": name,
+                    "ms": best_of(repeat, func) * 1000,
+                    "matches": len(func()),
+                })
+
+            engine.dispose()
+
+    return results
+
+
+def main() -> None:
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=parse_sizes, default="100k,1m")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'rows':>9} {'method':<11} {'ms':>10} {'matches':>8}")
+
+    for result in run(args.sizes, args.repeat):
+        print(
+            f"{result['rows']:>9} {result['method']:<11} "
+            f"{result['ms']:>10.2f} {result['matches']:>8}"
+        )
+
+
+if __name__ == "__main__":
+    main()
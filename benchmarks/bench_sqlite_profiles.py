@@ -0,0 +1,110 @@
+"""Compare SQLite PRAGMA profiles: commit throughput and reader latency.
+
+Each profile gets a fresh database file. A writer inserts one task per
+transaction (as the ``create`` command does) while reader threads run a
+status query in a loop.
+
+    python -m benchmarks.bench_sqlite_profiles --writes 2000 --readers 4
+"""
+
+from argparse import ArgumentParser
+from datetime import datetime
+from pathlib import Path
+from statistics import quantiles
+from tempfile import TemporaryDirectory
+from threading import Event, Thread
+from time import perf_counter
+
+from sqlalchemy import insert, select
+from sqlalchemy.exc import OperationalError
+
+from .common import Task, create_database, seed_tasks, sqlite_url, timer
+
+from src.task_manager.config import SQLITE_PROFILES
+from src.task_manager.database import install_sqlite_pragmas
+
+
+def reader(engine, stop: Event, latencies: list, errors: list) -> None:
+    query = select(Task.id).where(
+        Task.completed.is_(False), Task.due_date < datetime.now()).limit(50)
+
+    while not stop.is_set():
+        start = perf_counter()
+
+        try:
+            with engine.connect() as connection:
+                connection.execute(query).all()
+        except OperationalError:
+            errors.append(1)
+            continue
+
+        latencies.append(perf_counter() - start)
+
+
+def run(profile: str, writes: int, readers: int, seed: int) -> dict:
+    with TemporaryDirectory() as directory:
+        engine = create_database(sqlite_url(Path(directory), f"{profile}.db"))
+        seed_tasks(engine, seed)
+        engine.dispose()
+
+        install_sqlite_pragmas(engine, SQLITE_PROFILES[profile])
+
+        stop = Event()
+        latencies: list[float] = []
+        errors: list[int] = []
+        threads = [
+            Thread(target=reader, args=(engine, stop, latencies, errors))
+            for _ in range(readers)
+        ]
+
+        for thread in threads:
+            thread.start()
+
+        row = {"name": "Bench", "completed": False, "due_date": datetime.now()}
+
+        with timer() as elapsed:
+            for _ in range(writes):
+                with engine.begin() as connection:
+                    connection.execute(insert(Task), row)
+
+        stop.set()
+
+        for thread in threads:
+            thread.join()
+
+        engine.dispose()
+
+    cuts = quantiles(latencies, n=100) if len(latencies) > 1 else [0.0] * 99
+
+    return {
+        "profile": profile,
+        "writes_per_s": writes / elapsed(),
+        "reads": len(latencies),
+        "read_p50_ms": cuts[49] * 1000,
+        "read_p95_ms": cuts[94] * 1000,
+        "read_errors": len(errors),
+    }
+
+
+def main() -> None:
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--profiles", default=",".join(SQLITE_PROFILES))
+    parser.add_argument("--writes", type=int, default=2000)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--seed-rows", type=int, default=50_000)
+    args = parser.parse_args()
+
+    print(f"{'profile':<12} {'writes/s':>9} {'reads':>7} {'p50 ms':>8} "
+          f"{'p95 ms':>8} {'errors':>7}")
+
+    for profile in args.profiles.split(","):
+        result = run(profile, args.writes, args.readers, args.seed_rows)
+        print(
+            f"{result['profile']:<12} {result['writes_per_s']:>9.0f} "
+            f"{result['reads']:>7} {result['read_p50_ms']:>8.2f} "
+            f"{result['read_p95_ms']:>8.2f} {result['read_errors']:>7}"
+        )
+
+
+if __name__ == "__main__":
+    main()
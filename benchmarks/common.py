@@ -0,0 +1,132 @@
+# pylint: disable=wrong-import-position
+
+from io import StringIO
+from time import perf_counter
+from random import Random
+from pathlib import Path
+from datetime import datetime, timedelta
+from typing import Callable, Iterator
+from contextlib import contextmanager
+
+from kink import di
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import sessionmaker
+
+# Dependency injection must happen before BASE and Task are imported.
+if "db_url" not in di:
+    di["db_url"] = "sqlite://"
+
+from src.task_manager.database import BASE
+from src.task_manager.models import Task
+from src.task_manager.migrations import migrate
+
+SEED_BATCH_SIZE = 10_000
+
+
+def sqlite_url(directory: Path, name: str) -> str:
+    return f"sqlite:///{directory / name}"
+
+
+def create_database(url: str, **engine_options) -> Engine:
+    engine = create_engine(url, **engine_options)
+    BASE.metadata.create_all(bind=engine)
+    migrate(engine)
+    return engine
+
+
+def session_context(engine: Engine) -> Callable:
+    """Build a ``db_session_context`` for repositories bound to ``engine``."""
+    session_local = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    @contextmanager
+    def get_db():
+        db = session_local()
+
+        try:
+            yield db
+        finally:
+            db.close()
+
+    return get_db
+
+
+def synthetic_tasks(
+    count: int,
+    completed_ratio: float = 0.9,
+    seed: int = 42,
+) -> Iterator[dict]:
+    """Yield task rows with due dates spread a year either side of now."""
+    rng = Random(seed)
+    now = datetime.now()
+
+    for number in range(count):
+        yield {
+            "name": f"Task {number}",
+            "description": f"Synthetic task number {number}",
+            "completed": rng.random() < completed_ratio,
+            "due_date": now + timedelta(minutes=rng.randint(-525_600, 525_600)),
+        }
+
+
+def seed_tasks(engine: Engine, count: int, **options) -> None:
+    batch = []
+
+    with engine.begin() as connection:
+        for row in synthetic_tasks(count, **options):
+            batch.append(row)
+
+            if len(batch) == SEED_BATCH_SIZE:
+                connection.execute(insert(Task), batch)
+                batch = []
+
+        if batch:
+            connection.execute(insert(Task), batch)
+
+
+@contextmanager
+def timer() -> Iterator[Callable[[], float]]:
+    start = perf_counter()
+    elapsed = None
+
+    def seconds() -> float:
+        return elapsed if elapsed is not None else perf_counter() - start
+
+    yield seconds
+    elapsed = perf_counter() - start
+
+
+def best_of(repeat: int, func: Callable[[], object]) -> float:
+    timings = []
+
+    for _ in range(repeat):
+        with timer() as seconds:
+            func()
+        timings.append(seconds())
+
+    return min(timings)
+
+
+class NullStream(StringIO):
+    """A text stream that discards everything, so only encoding is timed."""
+
+    def write(self, s: str) -> int:
+        return len(s)
+
+
+def parse_sizes(value: str) -> list[int]:
+    sizes = []
+
+    for item in value.split(","):
+        item = item.strip().lower()
+        multiplier = 1
+
+        if item.endswith("k"):
+            multiplier, item = 1_000, item[:-1]
+        elif item.endswith("m"):
+            multiplier, item = 1_000_000, item[:-1]
+
+        sizes.append(int(float(item) * multiplier))
+
+    return sizes
@@ -0,0 +1,257 @@
+"""Time repository and CLI hot paths, save the results and catch regressions.
+
+Each size gets a freshly seeded SQLite file. Results can be written as
+JSON and compared with an earlier run; the exit status is 1 if any
+benchmark got slower than the baseline by more than the threshold:
+
+    python -m benchmarks.suite --sizes 1k,100k --output baseline.json
+    python -m benchmarks.suite --sizes 1k,100k --baseline baseline.json
+"""
+
+import os
+import sys
+import json
+import platform
+import subprocess
+from argparse import ArgumentParser
+from datetime import datetime
+from pathlib import Path
+from random import Random
+from tempfile import TemporaryDirectory
+from typing import Callable, Optional
+
+from .common import (
+    NullStream,
+    Task,
+    best_of,
+    create_database,
+    parse_sizes,
+    seed_tasks,
+    session_context,
+    sqlite_url,
+)
+
+from src.task_manager.models import TaskSummary
+from src.task_manager.repositories import SQLAlchemyTaskRepository
+from src.task_manager.serialization import OutputFormat, write_records
+from src.task_manager.commands.todos import print_task_pages
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+RENDER_ROWS = 1_000
+CLI_LIST_LIMIT = 20
+
+
+def new_task(number: int) -> Task:
+    return Task(
+        name=f"Benchmark task {number}",
+        description="Added by the benchmark suite",
+        due_date=datetime.now(),
+    )
+
+
+def time_ops(repeat: int, ops: int, func: Callable[[], object]) -> dict:
+    seconds = best_of(repeat, func)
+    return {"ops": ops, "ms": seconds * 1000, "us_per_op": seconds * 1e6 / ops}
+
+
+def repository_benchmarks(
+    repository: SQLAlchemyTaskRepository,
+    size: int,
+    ops: int,
+    repeat: int,
+) -> dict[str, dict]:
+    rng = Random(size)
+    ids = [rng.randint(1, size) for _ in range(ops)]
+    added: list[int] = []
+
+    def add() -> None:
+        added.extend(repository.add(new_task(number)) for number in range(ops))
+
+    def delete() -> None:
+        for task_id in added[:ops]:
+            repository.delete_by_id(task_id)
+
+        del added[:ops]
+
+    results = {"add": time_ops(repeat, ops, add)}
+
+    # ``add`` ran ``repeat`` times; each ``delete`` run removes one batch,
+    # so the table is back at ``size`` rows afterwards.
+    results["delete"] = time_ops(repeat, ops, delete)
+    results["get"] = time_ops(
+        repeat, ops, lambda: [repository.get(task_id) for task_id in ids])
+    results["complete"] = time_ops(
+        repeat, ops, lambda: [repository.complete(task_id) for task_id in ids])
+    results["list"] = time_ops(repeat, 1, repository.list)
+    results["filter_by_status"] = time_ops(
+        repeat, 1, lambda: repository.filter_by_status(completed=False))
+    return results
+
+
+def render_benchmarks(
+    repository: SQLAlchemyTaskRepository,
+    repeat: int,
+) -> dict[str, dict]:
+    from rich import reconfigure
+
+    rows = list(repository.iter_summaries(page_size=RENDER_ROWS))
+    table_rows = rows[:RENDER_ROWS]
+    reconfigure(file=NullStream(), width=120, force_terminal=False)
+
+    return {
+        "render_table": time_ops(
+            repeat, len(table_rows), lambda: print_task_pages(table_rows, 100)),
+        "render_jsonl": time_ops(repeat, len(rows), lambda: write_records(
+            rows, TaskSummary._fields, NullStream(), OutputFormat.jsonl)),
+    }
+
+
+def run_cli(args: list[str], db_url: str) -> None:
+    env = {
+        **os.environ,
+        "DATABASE_URL": db_url,
+        "TASK_MANAGER_NO_DAEMON": "1",
+    }
+    subprocess.run(
+        [sys.executable, "-m", "src.task_manager", *args],
+        cwd=ROOT_DIR,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        check=True,
+    )
+
+
+def cli_benchmarks(db_url: str, repeat: int) -> dict[str, dict]:
+    return {
+        "cli_help": time_ops(
+            repeat, 1, lambda: run_cli(["--help"], db_url)),
+        "cli_list": time_ops(repeat, 1, lambda: run_cli(
+            ["list", "--limit", str(CLI_LIST_LIMIT)], db_url)),
+    }
+
+
+def run(sizes: list[int], ops: int, repeat: int, cli: bool) -> list[dict]:
+    results = []
+
+    with TemporaryDirectory() as directory:
+        for size in sizes:
+            db_url = sqlite_url(Path(directory), f"{size}.db")
+            engine = create_database(db_url)
+            seed_tasks(engine, size)
+            repository = SQLAlchemyTaskRepository(session_context(engine))
+
+            timings = {
+                **repository_benchmarks(repository, size, ops, repeat),
+                **render_benchmarks(repository, repeat),
+            }
+            engine.dispose()
+
+            if cli:
+                timings.update(cli_benchmarks(db_url, repeat))
+
+            results += [
+                {"benchmark": name, "rows": size, **timing}
+                for name, timing in timings.items()
+            ]
+
+    return results
+
+
+def compare(
+    results: list[dict],
+    baseline: list[dict],
+    threshold: float,
+) -> list[dict]:
+    """Pair results with the baseline and flag those slower by ``threshold``."""
+    previous = {(r["benchmark"], r["rows"]): r for r in baseline}
+    comparisons = []
+
+    for result in results:
+        old = previous.get((result["benchmark"], result["rows"]))
+
+        if old is None:
+            continue
+
+        change = result["us_per_op"] / old["us_per_op"] - 1
+        comparisons.append({
+            "benchmark": result["benchmark"],
+            "rows": result["rows"],
+            "baseline_us_per_op": old["us_per_op"],
+            "us_per_op": result["us_per_op"],
+            "change": change,
+            "regression": change > threshold,
+        })
+
+    return comparisons
+
+
+def load_results(path: Path) -> list[dict]:
+    return json.loads(path.read_text(encoding="utf-8"))["results"]
+
+
+def save_results(path: Path, results: list[dict], args) -> None:
+    document = {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "ops": args.ops,
+        "repeat": args.repeat,
+        "results": results,
+    }
+    path.write_text(json.dumps(document, indent=2) + "\n", encoding="utf-8")
+
+
+def print_results(results: list[dict], comparisons: Optional[list[dict]]) -> None:
+    changes = {(c["benchmark"], c["rows"]): c for c in comparisons or ()}
+    header = f"{'benchmark':<17} {'rows':>9} {'ops':>6} {'ms':>10} {'us/op':>11}"
+    print(header + (f" {'change':>8}" if comparisons is not None else ""))
+
+    for result in results:
+        line = (
+            f"{result['benchmark']:<17} {result['rows']:>9} {result['ops']:>6} "
+            f"{result['ms']:>10.1f} {result['us_per_op']:>11.1f}"
+        )
+        comparison = changes.get((result["benchmark"], result["rows"]))
+
+        if comparison is not None:
+            line += f" {comparison['change']:>+8.1%}"
+            line += "  REGRESSION" if comparison["regression"] else ""
+
+        print(line)
+
+
+def main() -> None:
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=parse_sizes, default="1k,10k")
+    parser.add_argument("--ops", type=int, default=200,
+                        help="Operations per timed add/get/complete/delete run.")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--no-cli", dest="cli", action="store_false",
+                        help="Skip the subprocess cold-start benchmarks.")
+    parser.add_argument("--output", type=Path, help="Write results as JSON.")
+    parser.add_argument("--baseline", type=Path,
+                        help="JSON results from an earlier run to compare with.")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="Slowdown that counts as a regression (0.2 = 20%%).")
+    args = parser.parse_args()
+
+    results = run(args.sizes, args.ops, args.repeat, args.cli)
+    comparisons = None
+
+    if args.baseline is not None:
+        comparisons = compare(results, load_results(args.baseline), args.threshold)
+
+    print_results(results, comparisons)
+
+    if args.output is not None:
+        save_results(args.output, results, args)
+
+    if comparisons and any(c["regression"] for c in comparisons):
+        regressions = sum(c["regression"] for c in comparisons)
+        print(f"\n{regressions} benchmark(s) slower than the baseline by more "
+              f"than {args.threshold:.0%}.", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,2 @@
+# Imported first so `--profile` can measure startup from this point.
+from . import profiling
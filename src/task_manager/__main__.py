@@ -1,4 +1,24 @@
-from .cli import app
+# pylint: disable=import-outside-toplevel
+
+import sys
+
+from .daemon import forward
+
+
+def main():
+    """Console entry point: use a running daemon, else run in-process."""
+    result = forward(sys.argv[1:])
+
+    if result is None:
+        from .cli import app
+        app()
+        return
+
+    exit_code, output = result
+    sys.stdout.write(output)
+    sys.stdout.flush()
+    sys.exit(exit_code)
+
 
 if __name__ == "__main__":
-    app()
+    main()
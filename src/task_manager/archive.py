@@ -0,0 +1,65 @@
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection
+
+from .changes import CHANGE_ARCHIVE, CHANGE_DELETE, LOCAL_NOW
+from .models import ArchivedTask, Task
+
+# Archiving copies a row into tasks_archive before deleting it, so the
+# change log records one archive rather than a delete.
+ARCHIVED_DELETE_CONDITION = "NOT EXISTS (SELECT 1 FROM tasks_archive WHERE id = old.id)"
+
+ARCHIVE_TRIGGERS = (
+    # ``completed_at`` follows ``completed`` however the row was written.
+    f"""
+    CREATE TRIGGER IF NOT EXISTS tasks_completed_at_insert AFTER INSERT ON tasks
+    WHEN new.completed AND new.completed_at IS NULL BEGIN
+        UPDATE tasks SET completed_at = {LOCAL_NOW} WHERE id = new.id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS tasks_completed_at_update
+    AFTER UPDATE OF completed ON tasks
+    WHEN new.completed IS NOT old.completed BEGIN
+        UPDATE tasks SET completed_at = CASE WHEN new.completed THEN {LOCAL_NOW} END
+        WHERE id = new.id;
+    END
+    """,
+    "DROP TRIGGER IF EXISTS task_changes_delete",
+    f"""
+    CREATE TRIGGER task_changes_delete AFTER DELETE ON tasks
+    WHEN {ARCHIVED_DELETE_CONDITION} BEGIN
+        INSERT INTO task_changes (task_id, kind, changed_at)
+        VALUES (old.id, '{CHANGE_DELETE}', {LOCAL_NOW});
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS task_changes_archive AFTER INSERT ON tasks_archive
+    BEGIN
+        INSERT INTO task_changes (task_id, kind, changed_at)
+        VALUES (new.id, '{CHANGE_ARCHIVE}', {LOCAL_NOW});
+    END
+    """,
+)
+
+
+def create_archive(connection: Connection) -> None:
+    """Add ``tasks.completed_at``, the archive table and their triggers.
+
+    Tasks completed before ``completed_at`` existed get their due date as
+    an estimate, so an archive policy can still age them out.
+    """
+    columns = {column["name"] for column in inspect(connection).get_columns("tasks")}
+
+    if "completed_at" not in columns:
+        connection.execute(text("ALTER TABLE tasks ADD COLUMN completed_at DATETIME"))
+        connection.execute(text(
+            "UPDATE tasks SET completed_at = due_date WHERE completed"))
+
+    for index in Task.__table__.indexes:
+        if index.name == "ix_tasks_completed_completed_at":
+            index.create(connection, checkfirst=True)
+
+    ArchivedTask.__table__.create(connection, checkfirst=True)
+
+    for statement in ARCHIVE_TRIGGERS:
+        connection.execute(text(statement))
@@ -1,24 +1,138 @@
 # pylint: disable=import-outside-toplevel
 # pylint: disable=unused-import
+# pylint: disable=global-statement
 
 from os import getenv, path
 from pathlib import Path
-from kink import di
+from typing import Optional
+
+from . import profiling
+
+SCRIPT_DIRECTORY = path.dirname(path.abspath(__file__))
+DB_DIRECTORY = Path(SCRIPT_DIRECTORY + "/db")
+DEFAULT_DB_URL = f"sqlite:///{SCRIPT_DIRECTORY}/db/todos_db.db"
+DEFAULT_LOG_PATH = DB_DIRECTORY / "todos_log.jsonl"
+
+_INITIALIZED = False
+
+
+def database_url() -> str:
+    return getenv("DATABASE_URL", DEFAULT_DB_URL)
+
+
+def storage_location(
+    backend: Optional[str] = None,
+    db_url: Optional[str] = None,
+    log_path: Optional[Path] = None,
+) -> str:
+    """Identify the task store, so the daemon only serves matching clients.
+
+    Missing values are resolved the same way ``initialize`` resolves them.
+    """
+    from .config import resolve_backend, resolve_log_path
+
+    backend = backend or resolve_backend()
+
+    if backend == "memory":
+        return "memory:"
+
+    if backend == "log":
+        log_path = log_path or resolve_log_path(DEFAULT_LOG_PATH)
+        return f"log:{Path(log_path).resolve()}"
+
+    return db_url or database_url()
+
+
+def _initialize_python_backend(di) -> None:
+    """Register the memory or log repository; neither needs an engine."""
+    from .protocols import TaskRepository
+    from .repositories import InMemoryTaskRepository, LogTaskRepository
+
+    if di["task_backend"] == "memory":
+        di[TaskRepository] = InMemoryTaskRepository()
+        return
+
+    if "task_log_path" not in di:
+        from .config import resolve_log_path
+        di["task_log_path"] = resolve_log_path(DEFAULT_LOG_PATH)
+
+    di[TaskRepository] = LogTaskRepository(di["task_log_path"])
 
 
 def initialize():
-    script_path = path.abspath(__file__)
-    script_directory = path.dirname(script_path)
+    """Configure the container and make sure the schema exists.
+
+    Runs once per process. Values already registered in ``di`` (for
+    example by an embedding application or the test suite) are kept.
+    """
+    global _INITIALIZED
+
+    if _INITIALIZED:
+        return
+
+    with profiling.phase("initialize"):
+        _configure()
+
+    _INITIALIZED = True
+
+
+def _configure() -> None:
+    # kink pulls in asyncio, so it is imported here rather than at startup.
+    from kink import di
+
+    DB_DIRECTORY.mkdir(exist_ok=True)
+
+    if "db_url" not in di:
+        di["db_url"] = database_url()
+
+    if "task_backend" not in di:
+        from .config import resolve_backend
+        di["task_backend"] = resolve_backend()
+
+    if di["task_backend"] != "sqlalchemy":
+        _initialize_python_backend(di)
+
+        # Each call on the Python backends is already atomic under their lock.
+        if "unit_of_work" not in di:
+            from contextlib import nullcontext
+            di["unit_of_work"] = nullcontext
+
+        return
+
+    if "db_pragmas" not in di:
+        from .config import resolve_sqlite_pragmas
+        di["db_pragmas"] = resolve_sqlite_pragmas()
+
+    if "db_pool" not in di:
+        from .config import resolve_pool_options
+        di["db_pool"] = resolve_pool_options()
+
+    with profiling.phase("imports"):
+        from .database import get_db, get_async_db, get_engine, BASE
+        from .models import Task
+        from .migrations import migrate, schema_is_current
+
+    profiling.instrument_sqlalchemy()
+
+    with profiling.phase("schema"):
+        engine = get_engine()
+
+        if not schema_is_current(engine):
+            BASE.metadata.create_all(bind=engine)
+            migrate(engine)
 
-    db_path = Path(script_directory + "/db")
-    db_path.mkdir(exist_ok=True)
+    if "db_session_context" not in di:
+        di["db_session_context"] = get_db
 
-    DEFAULT_DB_URL = f"sqlite:///{script_directory}/db/todos_db.db"
-    di["db_url"] = getenv("DATABASE_URL", DEFAULT_DB_URL)
+    if "async_db_session_context" not in di:
+        di["async_db_session_context"] = get_async_db
 
-    from .database import get_db, BASE, ENGINE
-    from .models import Task
-    BASE.metadata.create_all(bind=ENGINE)
-    di["db_session_context"] = get_db
+    if "unit_of_work" not in di:
+        from .unit_of_work import unit_of_work
+        di["unit_of_work"] = unit_of_work
 
-    from .repositories import SQLAlchemyTaskRepository
+    from .repositories import (
+        SQLAlchemyTaskRepository,
+        AsyncSQLAlchemyTaskRepository,
+        SQLAlchemyRecurrenceRepository,
+    )
@@ -0,0 +1,51 @@
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from .models import TaskChangeRecord
+
+CHANGE_INSERT = "insert"
+CHANGE_UPDATE = "update"
+CHANGE_DELETE = "delete"
+CHANGE_ARCHIVE = "archive"
+CHANGE_KINDS = (CHANGE_INSERT, CHANGE_UPDATE, CHANGE_DELETE, CHANGE_ARCHIVE)
+
+# Local time, like the due dates the application writes.
+LOCAL_NOW = "strftime('%Y-%m-%d %H:%M:%f', 'now', 'localtime')"
+
+# Triggers rather than repository code, so bulk statements and writes from
+# other tools are logged too. Updates that change nothing are left out. The
+# delete trigger is later replaced by one that leaves archived rows to
+# ``archive.ARCHIVE_TRIGGERS``.
+CHANGE_TRIGGERS = (
+    f"""
+    CREATE TRIGGER IF NOT EXISTS task_changes_insert AFTER INSERT ON tasks BEGIN
+        INSERT INTO task_changes (task_id, kind, changed_at)
+        VALUES (new.id, '{CHANGE_INSERT}', {LOCAL_NOW});
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS task_changes_update AFTER UPDATE ON tasks
+    WHEN old.name IS NOT new.name
+        OR old.description IS NOT new.description
+        OR old.completed IS NOT new.completed
+        OR old.due_date IS NOT new.due_date
+    BEGIN
+        INSERT INTO task_changes (task_id, kind, changed_at)
+        VALUES (new.id, '{CHANGE_UPDATE}', {LOCAL_NOW});
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS task_changes_delete AFTER DELETE ON tasks BEGIN
+        INSERT INTO task_changes (task_id, kind, changed_at)
+        VALUES (old.id, '{CHANGE_DELETE}', {LOCAL_NOW});
+    END
+    """,
+)
+
+
+def create_change_log(connection: Connection) -> None:
+    """Create the change log table and the triggers that fill it."""
+    TaskChangeRecord.__table__.create(connection, checkfirst=True)
+
+    for statement in CHANGE_TRIGGERS:
+        connection.execute(text(statement))
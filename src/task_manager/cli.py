@@ -1,10 +1,9 @@
 # pylint: disable=import-outside-toplevel
 
-from .bootstrap import initialize
-
 
 def create_app():
-    initialize()
+    # The commands initialize the database lazily, so building the app only
+    # costs the Typer import and argument parsing stays fast.
     from .commands import todos
     return todos.app
 
@@ -1,16 +1,98 @@
-from typing import Annotated
+# pylint: disable=import-outside-toplevel
+
+import sys
+import json
+import time
+import heapq
+from typing import Annotated, Iterable, NamedTuple, Optional, TYPE_CHECKING
 from enum import Enum
-from datetime import datetime
+from pathlib import Path
+from itertools import islice
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+from click import ClickException
+from typer import Typer, Argument, Context, Option, Exit, BadParameter
+from typer.core import TyperGroup
+
+from .. import profiling
+from ..bootstrap import initialize
+from ..config import ConfigError
+from ..serialization import (
+    OutputFormat,
+    TaskFormat,
+    detect_format,
+    read_tasks,
+    write_records,
+    write_tasks,
+)
+
+# Rich, kink and SQLAlchemy are only imported once a command runs, which keeps
+# `--help` and argument errors off the expensive import path.
+if TYPE_CHECKING:
+    from rich.table import Table
+    from ..models import DueDateBucket, TaskChange, TaskSummary
+    from ..protocols import RecurrenceRepository, TaskRepository
+    from ..recurrence import Occurrence
+
+RECUR_PAGE_SIZE = 100
+WATCH_BATCH_SIZE = 500
+
+
+class TaskManagerGroup(TyperGroup):
+    """Report bad configuration like a bad option, not with a traceback.
+
+    Settings are read lazily once a command runs, so their errors can only
+    be caught around the whole invocation.
+    """
+
+    def invoke(self, ctx: Context):
+        try:
+            return super().invoke(ctx)
+        except ConfigError as exc:
+            raise ClickException(str(exc)) from exc
+
+
+app = Typer(name="task-manager", cls=TaskManagerGroup)
+recur_app = Typer(
+    name="recur", help="Repeat tasks daily, weekly, monthly or on a cron schedule.")
+app.add_typer(recur_app)
+
+
+def rich_print(*objects) -> None:
+    with profiling.phase("render"):
+        from rich import print as _rich_print
+        _rich_print(*objects)
+
 
-from kink import di
-from typer import Typer, Argument, Option, Exit
-from rich import print as rich_print
-from rich.table import Table
+def get_repository() -> "TaskRepository":
+    initialize()
+    from kink import di
+    from ..protocols import TaskRepository
+    return profiling.wrap_repository(di[TaskRepository])
 
-from ..models import Task
-from ..protocols import TaskRepository
 
-app = Typer(name="task-manager")
+def _require_sqlalchemy(message: str) -> None:
+    initialize()
+    from kink import di
+
+    if di["task_backend"] != "sqlalchemy":
+        rich_print(f"\n[red]{message}[/red]\n")
+        raise Exit(code=1)
+
+
+def get_recurrence_repository() -> "RecurrenceRepository":
+    _require_sqlalchemy("Recurring tasks need the sqlalchemy backend")
+    from kink import di
+    from ..protocols import RecurrenceRepository
+    return profiling.wrap_repository(di[RecurrenceRepository])
+
+
+STATUS_LABELS = {
+    "completed": "✅ Completed",
+    "pending": "⌛ Pending",
+    "overdue": "❌ Overdue",
+}
 
 
 class StatusFilter(str, Enum):
@@ -20,6 +102,54 @@ class StatusFilter(str, Enum):
     all = "all"
 
 
+class SortKey(str, Enum):
+    id = "id"
+    due = "due"
+    name = "name"
+
+
+class Frequency(str, Enum):
+    daily = "daily"
+    weekly = "weekly"
+    monthly = "monthly"
+
+
+class ConflictPolicy(str, Enum):
+    newer = "newer"
+    local = "local"
+    remote = "remote"
+
+
+class StatsBucket(str, Enum):
+    day = "day"
+    week = "week"
+
+
+class IdSpec(NamedTuple):
+    start: int
+    end: Optional[int]
+
+    @property
+    def is_single(self) -> bool:
+        return self.start == self.end
+
+
+def parse_id_spec(value: str) -> IdSpec:
+    """Parse ``7``, ``3-9`` or the open-ended ``12-`` into an ID range."""
+    start, separator, end = value.partition("-")
+
+    try:
+        first = int(start)
+        last = (int(end) if end else None) if separator else first
+    except ValueError:
+        raise BadParameter(f"{value!r} is not a task ID or range such as 3-7.")
+
+    if first < 1 or (last is not None and last < first):
+        raise BadParameter(f"{value!r} is not a valid task ID or range.")
+
+    return IdSpec(first, last)
+
+
 TASK_ID = Annotated[
     int,
     Argument(
@@ -28,6 +158,30 @@ TASK_ID = Annotated[
     )
 ]
 
+TASK_IDS = Annotated[
+    Optional[list[IdSpec]],
+    Argument(
+        help="Task IDs or ranges such as 3, 5-9 or 12- (open-ended).",
+        parser=parse_id_spec,
+    )
+]
+
+SELECT_STATUS = Annotated[
+    Optional[StatusFilter],
+    Option("--status", "-s",
+           help="Select tasks by status; 'all' selects every task.")
+]
+
+SELECT_DUE_BEFORE = Annotated[
+    Optional[datetime],
+    Option("--due-before", help="Select tasks due before this date.")
+]
+
+SELECT_DUE_AFTER = Annotated[
+    Optional[datetime],
+    Option("--due-after", help="Select tasks due on or after this date.")
+]
+
 TASK_NAME = Annotated[
     str,
     Argument(help="The name of the task to create.")
@@ -54,6 +208,66 @@ STATUS_FILTER = Annotated[
            help="Filter by task status: completed, pending, or overdue.")
 ]
 
+LIST_DUE_FROM = Annotated[
+    Optional[datetime],
+    Option("--due-from", help="Only show tasks due on or after this date.")
+]
+
+LIST_DUE_TO = Annotated[
+    Optional[datetime],
+    Option("--due-to",
+           help="Only show tasks due up to this date (a date alone includes that day).")
+]
+
+LIST_TODAY = Annotated[
+    bool,
+    Option("--today", help="Only show tasks due today.")
+]
+
+LIST_THIS_WEEK = Annotated[
+    bool,
+    Option("--this-week", help="Only show tasks due this week, Monday to Sunday.")
+]
+
+LIST_NEXT_DAYS = Annotated[
+    Optional[int],
+    Option("--next", metavar="DAYS", help="Only show tasks due in the next DAYS days.",
+           min=1)
+]
+
+LIST_SORT = Annotated[
+    SortKey,
+    Option("--sort", help="Order by ID, due date or name.")
+]
+
+LIST_LIMIT = Annotated[
+    Optional[int],
+    Option("--limit", "-l", help="Maximum number of tasks to show.", min=1)
+]
+
+LIST_AFTER = Annotated[
+    int,
+    Option("--after", help="Only show tasks with an ID greater than this.", min=0)
+]
+
+LIST_PAGE_SIZE = Annotated[
+    int,
+    Option("--page-size", help="Number of tasks fetched per query.", min=1)
+]
+
+LIST_INCLUDE_ARCHIVED = Annotated[
+    bool,
+    Option("--include-archived", help="Also list completed tasks moved to the archive.")
+]
+
+OUTPUT_FORMAT = Annotated[
+    Optional[OutputFormat],
+    Option("--format", "-f",
+           help="Render a table, or stream json, jsonl, csv or tsv rows. "
+                "Defaults to a table on a terminal and tsv otherwise.",
+           show_default=False)
+]
+
 UPDATE_NAME = Annotated[
     str,
     Option("--name", "-n", help="New name for the task.")
@@ -74,6 +288,182 @@ UPDATE_COMPLETION = Annotated[
     Option("--complete", "-c", help="Mark the task as complete or incomplete.")
 ]
 
+IMPORT_PATH = Annotated[
+    Path,
+    Argument(help="CSV or JSONL file to import, or - for standard input.")
+]
+
+EXPORT_PATH = Annotated[
+    Path,
+    Argument(help="File to write, or - for standard output.")
+]
+
+FILE_FORMAT = Annotated[
+    Optional[TaskFormat],
+    Option("--format", "-f",
+           help="File format. Defaults to the file extension, else jsonl.")
+]
+
+BATCH_SIZE = Annotated[
+    int,
+    Option("--batch-size", help="Number of rows per database round trip.", min=1)
+]
+
+SEARCH_QUERY = Annotated[
+    str,
+    Argument(help="Words to find in task names and descriptions.")
+]
+
+SEARCH_LIMIT = Annotated[
+    int,
+    Option("--limit", "-l", help="Maximum number of matches to show.", min=1)
+]
+
+SEARCH_PREFIX = Annotated[
+    bool,
+    Option("--prefix/--exact",
+           help="Match words by prefix, or only whole words.")
+]
+
+STATS_BUCKET = Annotated[
+    StatsBucket,
+    Option("--by", "-b", help="Group the due-date histogram by day or week.")
+]
+
+STATS_JSON = Annotated[
+    bool,
+    Option("--json", help="Print machine-readable JSON instead of tables.")
+]
+
+PROFILE = Annotated[
+    bool,
+    Option("--profile",
+           help="Print a timing breakdown of the command to stderr.")
+]
+
+PROFILE_JSON = Annotated[
+    Optional[str],
+    Option("--profile-json", metavar="PATH",
+           help="Write the timing breakdown as JSON to PATH (- for stdout).")
+]
+
+RULE_ID = Annotated[
+    int,
+    Argument(help="The ID of the recurrence rule.", min=1)
+]
+
+RECUR_EVERY = Annotated[
+    Optional[Frequency],
+    Option("--every", "-e",
+           help="Repeat daily, weekly or monthly from the task's due date.")
+]
+
+RECUR_INTERVAL = Annotated[
+    int,
+    Option("--interval", "-i", help="Repeat every N days, weeks or months.", min=1)
+]
+
+RECUR_CRON = Annotated[
+    Optional[str],
+    Option("--cron", help="Repeat on a cron schedule such as '0 9 * * 1-5'.")
+]
+
+RECUR_UNTIL = Annotated[
+    Optional[datetime],
+    Option("--until", help="Stop repeating after this date.")
+]
+
+OCCURRENCE_DATE = Annotated[
+    datetime,
+    Argument(help="Due date and time of the occurrence.")
+]
+
+AGENDA_FROM = Annotated[
+    Optional[datetime],
+    Option("--from", help="Start of the window. Defaults to the 1st of this month.")
+]
+
+AGENDA_TO = Annotated[
+    Optional[datetime],
+    Option("--to", help="End of the window, exclusive. Defaults to a month after --from.")
+]
+
+WATCH_SINCE = Annotated[
+    Optional[int],
+    Option("--since", help="Print changes after this change number; "
+           "defaults to the latest change.", min=0)
+]
+
+WATCH_INTERVAL = Annotated[
+    float,
+    Option("--interval", help="Seconds between polls.", min=0.1)
+]
+
+WATCH_ONCE = Annotated[
+    bool,
+    Option("--once", help="Print the changes so far and exit.")
+]
+
+WATCH_FORMAT = Annotated[
+    OutputFormat,
+    Option("--format", "-f", help="Print one line per change (table) or jsonl records.")
+]
+
+ARCHIVE_OLDER_THAN = Annotated[
+    Optional[int],
+    Option("--older-than", metavar="DAYS",
+           help="Archive tasks completed more than DAYS days ago. "
+           "Defaults to the [archive] policy (30 days).", min=0)
+]
+
+ARCHIVE_BATCH_SIZE = Annotated[
+    Optional[int],
+    Option("--batch-size", help="Tasks moved per transaction.", min=1)
+]
+
+SYNC_TO = Annotated[
+    str,
+    Option("--to", help="SQLAlchemy URL of the database to sync with.")
+]
+
+SYNC_CONFLICT = Annotated[
+    Optional[ConflictPolicy],
+    Option("--conflict",
+           help="Which edit wins when a task changed in both databases. "
+           "Defaults to the [sync] policy (newer).")
+]
+
+SYNC_BATCH_SIZE = Annotated[
+    int,
+    Option("--batch-size", help="Tasks read or written per statement.", min=1)
+]
+
+SERVE_SOCKET = Annotated[
+    Optional[Path],
+    Option("--socket", help="Unix socket to listen on.")
+]
+
+
+@app.callback()
+def main(
+    ctx: Context,
+    profile: PROFILE = False,
+    profile_json: PROFILE_JSON = None,
+):
+    """Manage tasks from the command line."""
+    if not (profile or profile_json):
+        return
+
+    profiler = profiling.enable()
+
+    def report() -> None:
+        profiling.write_report(profiler, profile_json)
+        profiling.disable()
+
+    # Close callbacks run last-in first-out: the phase ends, then we report.
+    ctx.call_on_close(report)
+    ctx.with_resource(profiler.phase("command"))
+
 
 @app.command("create")
 def create_task(
@@ -83,7 +473,8 @@ def create_task(
     complete: TASK_COMPLETION = False,
 ):
     """Create a new task."""
-    repo: TaskRepository = di[TaskRepository]
+    repo = get_repository()
+    from ..models import Task
 
     task = Task(
         name=name,
@@ -96,104 +487,905 @@ def create_task(
     rich_print(f"\n[green]Task created with ID {task_id}[/green]\n")
 
 
-@app.command("list")
-def list_tasks(status: STATUS_FILTER = StatusFilter.all):
-    """List tasks, optionally filtered by status."""
-    repo: TaskRepository = di[TaskRepository]
-
+def _status_filters(status: StatusFilter, now: datetime) -> dict:
     if status == StatusFilter.completed:
-        tasks = repo.filter_by_status(completed=True)
-    elif status == StatusFilter.pending:
-        tasks = repo.filter_by_status(
-            completed=False, due_after=datetime.now())
-    elif status == StatusFilter.overdue:
-        tasks = repo.filter_by_status(
-            completed=False, due_before=datetime.now())
-    else:
-        tasks = repo.list()
-
-    if not tasks:
-        rich_print("\n[yellow]No tasks found[/yellow]\n")
-        return
+        return {"completed": True}
 
-    table = Table(title="Tasks", show_lines=True)
-    table.add_column("ID", style="cyan", justify="right")
-    table.add_column("Name", style="bold white")
-    table.add_column("Due Date", style="magenta")
-    table.add_column("Description", style="dim")
-    table.add_column("Status", style="green")
-
-    for t in tasks:
-        status_icon = (
-            "✅ Completed" if t.completed
-            else "⌛ Pending" if t.due_date >= datetime.now()
-            else "❌ Overdue"
-        )
+    if status == StatusFilter.pending:
+        return {"completed": False, "due_after": now}
 
-        table.add_row(
-            str(t.id),
-            t.name,
-            t.due_date.strftime("%Y-%m-%d"),
-            t.description or "-",
-            status_icon,
-        )
+    if status == StatusFilter.overdue:
+        return {"completed": False, "due_before": now}
 
-    rich_print("")
-    rich_print(table)
-    rich_print("")
+    return {}
 
 
-@app.command("complete")
-def complete_task(task_id: TASK_ID):
-    """Mark a task as complete."""
-    repo: TaskRepository = di[TaskRepository]
+def _due_window(
+    now: datetime,
+    due_from: Optional[datetime],
+    due_to: Optional[datetime],
+    today: bool,
+    this_week: bool,
+    next_days: Optional[int],
+) -> tuple[Optional[datetime], Optional[datetime]]:
+    """Turn the window options into a ``[due_after, due_before)`` range."""
+    shortcuts = today + this_week + (next_days is not None)
 
-    task = repo.get(task_id)
-    if not task:
-        rich_print(f"\n[red]Task {task_id} not found[/red]\n")
-        raise Exit(code=2)
+    if shortcuts > 1 or (shortcuts and (due_from or due_to)):
+        raise BadParameter(
+            "Use only one of --today, --this-week, --next or --due-from/--due-to.")
 
-    repo.complete(task_id)
-    rich_print(f"\n[green]Task {task_id} marked complete[/green]\n")
+    midnight = now.replace(hour=0, minute=0, second=0, microsecond=0)
 
+    if today:
+        return midnight, midnight + timedelta(days=1)
 
-@app.command("delete")
-def delete_task(task_id: TASK_ID):
-    """Delete a task."""
-    repo: TaskRepository = di[TaskRepository]
+    if this_week:
+        monday = midnight - timedelta(days=midnight.weekday())
+        return monday, monday + timedelta(weeks=1)
+
+    if next_days is not None:
+        return now, now + timedelta(days=next_days)
+
+    if due_to is not None and due_to.time() == datetime.min.time():
+        due_to += timedelta(days=1)
+
+    if due_from is not None and due_to is not None and due_to <= due_from:
+        raise BadParameter("--due-to must not be before --due-from.")
+
+    return due_from, due_to
+
+
+def _narrow(
+    filters: dict,
+    due_after: Optional[datetime],
+    due_before: Optional[datetime],
+) -> dict:
+    """Intersect the status filters with a due-date window."""
+    if due_after is not None:
+        filters["due_after"] = max(filters.get("due_after", due_after), due_after)
+
+    if due_before is not None:
+        filters["due_before"] = min(filters.get("due_before", due_before), due_before)
+
+    return filters
+
+
+SORT_ORDER = {
+    SortKey.id: lambda t: (t.id, t.due_date),
+    SortKey.due: lambda t: (t.due_date, t.id),
+    SortKey.name: lambda t: (t.name, t.id, t.due_date),
+}
+
+
+def _merge_occurrences(
+    tasks: Iterable["TaskSummary"],
+    status: StatusFilter,
+    filters: dict,
+    sort: SortKey,
+    after: int,
+    now: datetime,
+) -> Iterable["TaskSummary"]:
+    """Add occurrences of recurring tasks in the window, in ``sort`` order."""
+    from kink import di
+
+    if di["task_backend"] != "sqlalchemy":
+        return tasks
+
+    from ..models import TaskSummary
+    from ..protocols import RecurrenceRepository
+
+    repo = profiling.wrap_repository(di[RecurrenceRepository])
+    occurrences = (
+        TaskSummary(o.task_id, o.name, o.due_date, o.description, o.status)
+        for o in repo.iter_occurrences(
+            filters["due_after"], filters["due_before"], filters.get("completed"), now)
+        if o.task_id > after and status in (StatusFilter.all, o.status)
+    )
+
+    # Occurrences come in due-date order; the other sorts need the window's
+    # occurrences sorted first.
+    if sort != SortKey.due:
+        occurrences = sorted(occurrences, key=SORT_ORDER[sort])
+
+    return heapq.merge(tasks, occurrences, key=SORT_ORDER[sort])
+
+
+def _selection(
+    task_ids: Optional[list[IdSpec]],
+    status: Optional[StatusFilter],
+    due_before: Optional[datetime],
+    due_after: Optional[datetime],
+) -> dict:
+    """Translate the ID and filter arguments into repository keywords."""
+    task_ids = task_ids or []
+
+    if not task_ids and status is None and due_before is None and due_after is None:
+        raise BadParameter(
+            "Select tasks by ID or with --status, --due-before or --due-after.")
+
+    selection = _status_filters(status, datetime.now()) if status else {}
 
-    task = repo.get(task_id)
-    if not task:
+    if due_before is not None:
+        selection["due_before"] = min(
+            due_before, selection.get("due_before", due_before))
+
+    if due_after is not None:
+        selection["due_after"] = max(
+            due_after, selection.get("due_after", due_after))
+
+    if not task_ids and not selection:
+        # `--status all` on its own deliberately selects every task.
+        task_ids = [IdSpec(1, None)]
+
+    selection["task_ids"] = [spec.start for spec in task_ids if spec.is_single]
+    selection["id_ranges"] = [
+        (spec.start, spec.end) for spec in task_ids if not spec.is_single
+    ]
+
+    return selection
+
+
+def _single_task_id(selection: dict) -> Optional[int]:
+    """Return the ID when the selection is exactly one plain task ID."""
+    if selection["id_ranges"] or len(selection["task_ids"]) != 1:
+        return None
+
+    if any(key in selection for key in ("completed", "due_before", "due_after")):
+        return None
+
+    return selection["task_ids"][0]
+
+
+def _report_batch(selection: dict, count: int, action: str) -> None:
+    task_id = _single_task_id(selection)
+
+    if task_id is not None and not count:
         rich_print(f"\n[red]Task {task_id} not found[/red]\n")
         raise Exit(code=2)
 
-    repo.delete(task)
-    rich_print(f"\n[green]Task {task_id} deleted[/green]\n")
+    if task_id is not None:
+        rich_print(f"\n[green]Task {task_id} {action}[/green]\n")
+        return
+
+    if not count:
+        rich_print("\n[red]No matching tasks found[/red]\n")
+        raise Exit(code=2)
+
+    noun = "task" if count == 1 else "tasks"
+    rich_print(f"\n[green]{count} {noun} {action}[/green]\n")
+
+
+def _task_table(title: Optional[str], show_header: bool) -> "Table":
+    from rich.table import Table
+
+    # Full-width tables with fixed and ratio columns line up across pages.
+    table = Table(
+        title=title, show_header=show_header, show_lines=True, expand=True)
+    table.add_column("ID", style="cyan", justify="right", width=6, no_wrap=True)
+    table.add_column("Name", style="bold white", ratio=1)
+    table.add_column("Due Date", style="magenta", width=10, no_wrap=True)
+    table.add_column("Description", style="dim", ratio=1)
+    table.add_column("Status", style="green", width=12, no_wrap=True)
+    return table
+
+
+def print_task_pages(tasks: Iterable["TaskSummary"], page_size: int) -> int:
+    """Render tasks as tables of ``page_size`` rows; returns how many were shown."""
+    count = 0
+    iterator = iter(tasks)
+
+    while page := list(islice(iterator, page_size)):
+        table = _task_table("Tasks" if not count else None, not count)
+
+        for t in page:
+            table.add_row(
+                str(t.id),
+                t.name,
+                t.due_date.strftime("%Y-%m-%d"),
+                t.description or "-",
+                STATUS_LABELS[t.status],
+            )
+
+        if not count:
+            rich_print("")
+
+        rich_print(table)
+        count += len(page)
+
+    return count
+
+
+def _output_format(output: Optional[OutputFormat]) -> OutputFormat:
+    """The format asked for; else a table for a terminal and tsv for a pipe."""
+    if output is not None:
+        return output
+
+    return OutputFormat.table if sys.stdout.isatty() else OutputFormat.tsv
+
+
+def _show_tasks(
+    tasks: Iterable["TaskSummary"],
+    page_size: int,
+    output: Optional[OutputFormat],
+    empty_message: str,
+) -> None:
+    output = _output_format(output)
+
+    if output != OutputFormat.table:
+        # Machine formats stream straight to stdout and never import rich.
+        from ..models import TaskSummary
+        write_records(tasks, TaskSummary._fields, sys.stdout, output)
+        return
+
+    if not print_task_pages(tasks, page_size):
+        rich_print(f"\n[yellow]{empty_message}[/yellow]\n")
+        return
+
+    rich_print("")
+
+
+@app.command("list")
+def list_tasks(
+    status: STATUS_FILTER = StatusFilter.all,
+    due_from: LIST_DUE_FROM = None,
+    due_to: LIST_DUE_TO = None,
+    today: LIST_TODAY = False,
+    this_week: LIST_THIS_WEEK = False,
+    next_days: LIST_NEXT_DAYS = None,
+    sort: LIST_SORT = SortKey.id,
+    limit: LIST_LIMIT = None,
+    after: LIST_AFTER = 0,
+    page_size: LIST_PAGE_SIZE = 100,
+    include_archived: LIST_INCLUDE_ARCHIVED = False,
+    output: OUTPUT_FORMAT = None,
+):
+    """List tasks, optionally filtered by status and due date.
+
+    With a bounded due-date window, occurrences of recurring tasks in that
+    window are listed too. Archived tasks are left out unless
+    --include-archived is given.
+    """
+    now = datetime.now()
+    window = _due_window(now, due_from, due_to, today, this_week, next_days)
+
+    if after and sort != SortKey.id:
+        raise BadParameter("--after only works with --sort id.")
+
+    repo = get_repository()
+
+    # One page of LIMIT rows is all a top-N listing needs to fetch.
+    if limit is not None:
+        page_size = min(page_size, limit)
+
+    filters = _narrow(_status_filters(status, now), *window)
+
+    # Each keyset page is read in its own short transaction, so a slow
+    # consumer never holds one open for the whole listing.
+    tasks = repo.iter_summaries(
+        now=now, after_id=after, page_size=page_size, sort=sort.value,
+        include_archived=include_archived, **filters)
+
+    if None not in window:
+        tasks = _merge_occurrences(tasks, status, filters, sort, after, now)
+
+    if limit is not None:
+        tasks = islice(tasks, limit)
+
+    _show_tasks(tasks, page_size, output, "No tasks found")
+
+
+@app.command("complete")
+def complete_task(
+    task_ids: TASK_IDS = None,
+    status: SELECT_STATUS = None,
+    due_before: SELECT_DUE_BEFORE = None,
+    due_after: SELECT_DUE_AFTER = None,
+):
+    """Mark tasks as complete by ID, ID range or filter."""
+    selection = _selection(task_ids, status, due_before, due_after)
+    repo = get_repository()
+
+    count = repo.complete_many(**selection)
+    _report_batch(selection, count, "marked complete")
+    _auto_archive(repo)
+
+
+@app.command("delete")
+def delete_task(
+    task_ids: TASK_IDS = None,
+    status: SELECT_STATUS = None,
+    due_before: SELECT_DUE_BEFORE = None,
+    due_after: SELECT_DUE_AFTER = None,
+):
+    """Delete tasks by ID, ID range or filter."""
+    selection = _selection(task_ids, status, due_before, due_after)
+    repo = get_repository()
+
+    count = repo.delete_many(**selection)
+    _report_batch(selection, count, "deleted")
 
 
 @app.command("update")
 def update_task(
-    task_id: TASK_ID,
+    task_ids: TASK_IDS = None,
     name: UPDATE_NAME = "",
     description: UPDATE_DESCRIPTION = "",
     due_date: UPDATE_DUE_DATE = None,
     complete: UPDATE_COMPLETION = False,
+    status: SELECT_STATUS = None,
+    due_before: SELECT_DUE_BEFORE = None,
+    due_after: SELECT_DUE_AFTER = None,
 ):
-    """Update a task."""
-    repo: TaskRepository = di[TaskRepository]
-
-    task = repo.get(task_id)
-    if not task:
-        rich_print(f"\n[red]Task {task_id} not found[/red]\n")
-        raise Exit(code=2)
+    """Update tasks by ID, ID range or filter."""
+    values = {}
 
     if name:
-        task.name = name
+        values["name"] = name
     if description:
-        task.description = description
+        values["description"] = description
     if due_date:
-        task.due_date = due_date
+        values["due_date"] = due_date
+    if complete:
+        values["completed"] = complete
+
+    if not values:
+        raise BadParameter(
+            "Pass at least one of --name, --description, --due or --complete.")
+
+    selection = _selection(task_ids, status, due_before, due_after)
+    repo = get_repository()
+
+    count = repo.update_many(values, **selection)
+    _report_batch(selection, count, "updated")
+
     if complete:
-        task.completed = complete
+        _auto_archive(repo)
+
+
+def _auto_archive(repo: "TaskRepository") -> None:
+    """Apply an ``[archive]`` policy with ``auto = yes`` after completing tasks."""
+    from kink import di
+
+    if di["task_backend"] != "sqlalchemy":
+        return
+
+    from ..config import resolve_archive_policy
+
+    policy = resolve_archive_policy()
+
+    if policy.auto:
+        cutoff = datetime.now() - timedelta(days=policy.older_than_days)
+        count = repo.archive_completed(cutoff, policy.batch_size)
+
+        if count:
+            rich_print(f"[dim]Archived {count} completed tasks[/dim]\n")
+
+
+@app.command("archive")
+def archive_tasks(
+    older_than: ARCHIVE_OLDER_THAN = None,
+    batch_size: ARCHIVE_BATCH_SIZE = None,
+):
+    """Move tasks completed a while ago out of the working table.
+
+    Archived tasks no longer slow down listings of current work; list
+    --include-archived still shows them.
+    """
+    _require_sqlalchemy("Archiving needs the sqlalchemy backend")
+    from ..config import resolve_archive_policy
+
+    policy = resolve_archive_policy()
+    days = policy.older_than_days if older_than is None else older_than
+    repo = get_repository()
+
+    count = repo.archive_completed(
+        datetime.now() - timedelta(days=days),
+        policy.batch_size if batch_size is None else batch_size,
+    )
+
+    if not count:
+        rich_print(f"\n[yellow]No tasks completed more than {days} days ago[/yellow]\n")
+        return
+
+    rich_print(f"\n[green]Archived {count} tasks[/green]\n")
+
+
+@contextmanager
+def _open_stream(path: Path, mode: str):
+    if str(path) == "-":
+        yield sys.stdin if mode == "r" else sys.stdout
+        return
+
+    with path.open(mode, encoding="utf-8", newline="") as stream:
+        yield stream
+
+
+@app.command("import")
+def import_tasks(
+    path: IMPORT_PATH,
+    file_format: FILE_FORMAT = None,
+    batch_size: BATCH_SIZE = 10_000,
+):
+    """Bulk import tasks from a CSV or JSONL file."""
+    repo = get_repository()
+    file_format = file_format or detect_format(path)
+
+    try:
+        with _open_stream(path, "r") as stream:
+            count = repo.add_many(
+                read_tasks(stream, file_format), batch_size=batch_size)
+    except OSError as exc:
+        rich_print(f"\n[red]Cannot read {path}: {exc.strerror}[/red]\n")
+        raise Exit(code=2)
+    except ValueError as exc:
+        rich_print(f"\n[red]Import failed, no tasks added. {exc}[/red]\n")
+        raise Exit(code=1)
+
+    rich_print(f"\n[green]Imported {count} tasks[/green]\n")
+
+
+@app.command("export")
+def export_tasks(
+    path: EXPORT_PATH = Path("-"),
+    file_format: FILE_FORMAT = None,
+    batch_size: BATCH_SIZE = 1_000,
+):
+    """Stream all tasks to a CSV or JSONL file."""
+    repo = get_repository()
+    file_format = file_format or detect_format(path)
+
+    try:
+        with _open_stream(path, "w") as stream:
+            count = write_tasks(
+                repo.export_rows(batch_size=batch_size), stream, file_format)
+    except OSError as exc:
+        rich_print(f"\n[red]Cannot write {path}: {exc.strerror}[/red]\n")
+        raise Exit(code=2)
+
+    if str(path) != "-":
+        rich_print(f"\n[green]Exported {count} tasks to {path}[/green]\n")
+
+
+@app.command("search")
+def search_tasks(
+    query: SEARCH_QUERY,
+    limit: SEARCH_LIMIT = 20,
+    prefix: SEARCH_PREFIX = True,
+    output: OUTPUT_FORMAT = None,
+):
+    """Find tasks by name or description, best matches first."""
+    repo = get_repository()
+
+    try:
+        tasks = repo.search(query, limit=limit, prefix=prefix)
+    except ValueError as exc:
+        raise BadParameter(str(exc), param_hint="QUERY") from exc
+
+    _show_tasks(tasks, limit, output, "No matching tasks found")
+
+
+def _stats_document(
+    now: datetime,
+    bucket: StatsBucket,
+    histogram: list["DueDateBucket"],
+) -> dict:
+    totals = {
+        "completed": sum(b.completed for b in histogram),
+        "pending": sum(b.pending for b in histogram),
+        "overdue": sum(b.overdue for b in histogram),
+    }
+    totals["total"] = sum(totals.values())
+
+    return {
+        "generated_at": now.isoformat(timespec="seconds"),
+        "totals": totals,
+        "bucket": bucket.value,
+        "histogram": [
+            {**b._asdict(), "start": b.start.isoformat(), "total": b.total}
+            for b in histogram
+        ],
+    }
+
+
+def _print_stats(document: dict) -> None:
+    from rich.table import Table
+
+    totals = document["totals"]
+    summary = Table(title="Tasks by Status", show_lines=True)
+    summary.add_column("Status", style="bold white")
+    summary.add_column("Count", style="cyan", justify="right")
+
+    for status in ("completed", "pending", "overdue"):
+        summary.add_row(STATUS_LABELS[status], str(totals[status]))
+
+    summary.add_row("Total", str(totals["total"]))
+    rich_print("")
+    rich_print(summary)
+
+    if not document["histogram"]:
+        rich_print("")
+        return
+
+    histogram = Table(
+        title=f"Tasks by Due {document['bucket'].title()}", show_lines=False)
+    histogram.add_column("Starting", style="magenta", no_wrap=True)
+
+    for status in ("completed", "pending", "overdue"):
+        histogram.add_column(status.title(), justify="right")
+
+    histogram.add_column("Total", style="cyan", justify="right")
+
+    for row in document["histogram"]:
+        histogram.add_row(
+            row["start"],
+            str(row["completed"]),
+            str(row["pending"]),
+            str(row["overdue"]),
+            str(row["total"]),
+        )
+
+    rich_print(histogram)
+    rich_print("")
+
+
+@app.command("stats")
+def task_stats(
+    by: STATS_BUCKET = StatsBucket.day,
+    due_before: SELECT_DUE_BEFORE = None,
+    due_after: SELECT_DUE_AFTER = None,
+    as_json: STATS_JSON = False,
+):
+    """Count tasks by status and by due day or week."""
+    repo = get_repository()
+    now = datetime.now()
+
+    # Totals are summed from the histogram so both come from one query.
+    histogram = repo.histogram_by_due_date(
+        bucket=by.value, now=now, due_before=due_before, due_after=due_after)
+    document = _stats_document(now, by, histogram)
+
+    if as_json:
+        print(json.dumps(document))
+        return
+
+    _print_stats(document)
+
+
+def _describe_rule(frequency: str, interval: int, cron: Optional[str]) -> str:
+    if cron is not None:
+        return f"cron {cron}"
+
+    if interval == 1:
+        return frequency
+
+    unit = {"daily": "days", "weekly": "weeks", "monthly": "months"}[frequency]
+    return f"every {interval} {unit}"
+
+
+def _month_window(start: Optional[datetime], end: Optional[datetime]):
+    if start is None:
+        start = datetime.now().replace(
+            day=1, hour=0, minute=0, second=0, microsecond=0)
+
+    if end is None:
+        following = start.replace(day=28) + timedelta(days=4)
+        end = following.replace(day=min(start.day, 28))
+
+    if end <= start:
+        raise BadParameter("--to must be later than --from.")
+
+    return start, end
+
+
+def _print_occurrences(occurrences: Iterable["Occurrence"]) -> int:
+    from rich.table import Table
+
+    count = 0
+    iterator = iter(occurrences)
+
+    while page := list(islice(iterator, RECUR_PAGE_SIZE)):
+        table = Table(
+            title="Occurrences" if not count else None,
+            show_header=not count,
+            show_lines=True,
+            expand=True,
+        )
+        table.add_column("Task", style="cyan", justify="right", width=6, no_wrap=True)
+        table.add_column("Rule", style="cyan", justify="right", width=6, no_wrap=True)
+        table.add_column("Name", style="bold white", ratio=1)
+        table.add_column("Due", style="magenta", width=16, no_wrap=True)
+        table.add_column("Status", style="green", width=12, no_wrap=True)
+
+        for o in page:
+            table.add_row(
+                str(o.task_id),
+                str(o.rule_id),
+                o.name,
+                o.due_date.strftime("%Y-%m-%d %H:%M"),
+                STATUS_LABELS[o.status],
+            )
+
+        if not count:
+            rich_print("")
+
+        rich_print(table)
+        count += len(page)
+
+    return count
+
+
+@recur_app.command("add")
+def add_rule(
+    task_id: TASK_ID,
+    every: RECUR_EVERY = None,
+    interval: RECUR_INTERVAL = 1,
+    cron: RECUR_CRON = None,
+    until: RECUR_UNTIL = None,
+):
+    """Repeat a task, starting from its due date."""
+    if (every is None) == (cron is None):
+        raise BadParameter("Pass exactly one of --every or --cron.")
+
+    if cron is not None and interval != 1:
+        raise BadParameter("--interval does not apply to --cron schedules.")
+
+    repo = get_recurrence_repository()
+    frequency = every.value if every is not None else "cron"
+
+    try:
+        rule_id = repo.add_rule(task_id, frequency, interval, cron, until)
+    except ValueError as exc:
+        raise BadParameter(str(exc)) from exc
+
+    if rule_id is None:
+        rich_print(f"\n[red]Task {task_id} not found[/red]\n")
+        raise Exit(code=2)
+
+    rich_print(
+        f"\n[green]Task {task_id} repeats {_describe_rule(frequency, interval, cron)} "
+        f"(rule {rule_id})[/green]\n")
+
+
+@recur_app.command("rules")
+def list_rules():
+    """List recurrence rules."""
+    from rich.table import Table
+
+    rules = get_recurrence_repository().list_rules()
+
+    if not rules:
+        rich_print("\n[yellow]No recurrence rules found[/yellow]\n")
+        return
+
+    table = Table(title="Recurrence Rules", show_lines=True)
+    table.add_column("Rule", style="cyan", justify="right")
+    table.add_column("Task", style="cyan", justify="right")
+    table.add_column("Repeats", style="bold white")
+    table.add_column("Starts", style="magenta", no_wrap=True)
+    table.add_column("Until", style="magenta", no_wrap=True)
+
+    for rule in rules:
+        table.add_row(
+            str(rule.id),
+            str(rule.task_id),
+            _describe_rule(rule.frequency, rule.interval, rule.cron),
+            rule.starts_at.strftime("%Y-%m-%d %H:%M"),
+            rule.until.strftime("%Y-%m-%d") if rule.until else "-",
+        )
+
+    rich_print("")
+    rich_print(table)
+    rich_print("")
+
+
+@recur_app.command("delete")
+def delete_rule(rule_id: RULE_ID):
+    """Stop repeating a task. The task itself is kept."""
+    if not get_recurrence_repository().delete_rule(rule_id):
+        rich_print(f"\n[red]Rule {rule_id} not found[/red]\n")
+        raise Exit(code=2)
+
+    rich_print(f"\n[green]Rule {rule_id} deleted[/green]\n")
+
+
+def _mark_occurrence(rule_id: int, when: datetime, kind: str, action: str) -> None:
+    repo = get_recurrence_repository()
+
+    try:
+        count = repo.mark_occurrence(rule_id, when, kind)
+    except ValueError as exc:
+        raise BadParameter(str(exc), param_hint="WHEN") from exc
+
+    if not count:
+        rich_print(f"\n[red]Rule {rule_id} not found[/red]\n")
+        raise Exit(code=2)
+
+    rich_print(
+        f"\n[green]Occurrence on {when:%Y-%m-%d %H:%M} {action}[/green]\n")
+
+
+@recur_app.command("skip")
+def skip_occurrence(rule_id: RULE_ID, when: OCCURRENCE_DATE):
+    """Skip one occurrence of a recurring task."""
+    _mark_occurrence(rule_id, when, "skip", "skipped")
+
+
+@recur_app.command("done")
+def complete_occurrence(rule_id: RULE_ID, when: OCCURRENCE_DATE):
+    """Mark one occurrence of a recurring task complete."""
+    _mark_occurrence(rule_id, when, "done", "marked complete")
+
+
+@recur_app.command("agenda")
+def agenda(
+    start: AGENDA_FROM = None,
+    end: AGENDA_TO = None,
+    status: STATUS_FILTER = StatusFilter.all,
+    limit: LIST_LIMIT = None,
+    output: OUTPUT_FORMAT = None,
+):
+    """Show the occurrences of recurring tasks in a window, by due date."""
+    repo = get_recurrence_repository()
+    start, end = _month_window(start, end)
+    completed = None if status == StatusFilter.all else status == StatusFilter.completed
+    occurrences = repo.iter_occurrences(start, end, completed=completed)
+
+    if status not in (StatusFilter.all, StatusFilter.completed):
+        occurrences = (o for o in occurrences if o.status == status.value)
+
+    if limit is not None:
+        occurrences = islice(occurrences, limit)
+
+    output = _output_format(output)
+
+    if output != OutputFormat.table:
+        from ..recurrence import Occurrence
+        write_records(occurrences, Occurrence._fields, sys.stdout, output)
+        return
+
+    if not _print_occurrences(occurrences):
+        rich_print("\n[yellow]No occurrences found[/yellow]\n")
+        return
+
+    rich_print("")
+
+
+CHANGE_STYLES = {
+    "insert": "green",
+    "update": "yellow",
+    "delete": "red",
+    "archive": "blue",
+}
+
+
+def _print_changes(changes: Iterable["TaskChange"], now: datetime) -> None:
+    from rich.markup import escape
+
+    for c in changes:
+        style = CHANGE_STYLES[c.kind]
+        line = f"[dim]#{c.seq}[/dim] [{style}]{c.kind:<7}[/{style}] [cyan]{c.task_id}[/cyan]"
+
+        # Deleted tasks, and tasks deleted since this change, have no row.
+        if c.name is not None:
+            status = (
+                "completed" if c.completed
+                else "pending" if c.due_date >= now
+                else "overdue"
+            )
+            line += (f" {escape(c.name)} [magenta]{c.due_date:%Y-%m-%d}[/magenta]"
+                     f" {STATUS_LABELS[status]}")
+
+        rich_print(line)
+
+
+@app.command("watch")
+def watch_changes(
+    since: WATCH_SINCE = None,
+    interval: WATCH_INTERVAL = 2.0,
+    once: WATCH_ONCE = False,
+    output: WATCH_FORMAT = OutputFormat.table,
+):
+    """Print task inserts, updates, deletes and archiving as they happen.
+
+    Each change has an increasing number; pass the last one seen to
+    --since to carry on from there.
+    """
+    if output not in (OutputFormat.table, OutputFormat.jsonl):
+        raise BadParameter("watch prints a table or jsonl.", param_hint="--format")
+
+    _require_sqlalchemy("Watching changes needs the sqlalchemy backend")
+    repo = get_repository()
+    cursor = start = repo.change_cursor() if since is None else since
+
+    try:
+        while True:
+            changes = repo.changes_since(cursor, limit=WATCH_BATCH_SIZE)
+
+            if changes:
+                cursor = changes[-1].seq
+
+                if output == OutputFormat.table:
+                    _print_changes(changes, datetime.now())
+                else:
+                    from ..models import TaskChange
+                    write_records(changes, TaskChange._fields, sys.stdout, output)
+                    sys.stdout.flush()
+
+            # A full batch means more are waiting; fetch them straight away.
+            if len(changes) == WATCH_BATCH_SIZE:
+                continue
+
+            if once:
+                if cursor == start and output == OutputFormat.table:
+                    rich_print(f"\n[yellow]No changes after {start}[/yellow]\n")
+
+                return
+
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        print(f"Stopped after change {cursor}; resume with --since {cursor}",
+              file=sys.stderr)
+
+
+@app.command("sync")
+def sync_tasks(
+    to: SYNC_TO,
+    conflict: SYNC_CONFLICT = None,
+    batch_size: SYNC_BATCH_SIZE = 500,
+):
+    """Exchange changed tasks with another database, both ways.
+
+    Only tasks changed since the last sync with that database are read and
+    copied. A task changed in both is settled by --conflict.
+    """
+    _require_sqlalchemy("Syncing needs the sqlalchemy backend")
+    from kink import di
+
+    if to == di["db_url"]:
+        raise BadParameter("Cannot sync a database with itself.", param_hint="--to")
+
+    from ..config import resolve_sync_policy
+    from ..sync import open_peer, sync
+
+    policy = resolve_sync_policy(conflict.value if conflict else None)
+
+    with open_peer(to, di["db_pragmas"]) as peer_context:
+        stats = sync(di["db_session_context"], peer_context, to, policy, batch_size)
+
+    rich_print(
+        f"\n[green]Pushed {stats.pushed} and pulled {stats.pulled} tasks[/green]"
+        + (f", [yellow]{stats.conflicts} conflicts ({policy} wins)[/yellow]"
+           if stats.conflicts else "")
+        + "\n"
+    )
+
+
+@app.command("serve")
+def serve(socket_path: SERVE_SOCKET = None):
+    """Run a daemon that answers commands over a Unix socket."""
+    from .. import daemon
+
+    if not hasattr(daemon.socket, "AF_UNIX"):
+        rich_print("\n[red]Unix domain sockets are not available here[/red]\n")
+        raise Exit(code=1)
+
+    get_repository()
+    from kink import di
+    from ..bootstrap import storage_location
+
+    path = socket_path or daemon.socket_path()
+    store = storage_location(
+        di["task_backend"],
+        di["db_url"],
+        di["task_log_path"] if "task_log_path" in di else None,
+    )
+
+    try:
+        server = daemon.create_server(app, path, store)
+    except RuntimeError as exc:
+        rich_print(f"\n[red]{exc}[/red]\n")
+        raise Exit(code=1)
 
-    rich_print(f"\n[green]Task {task_id} updated[/green]\n")
+    rich_print(f"\n[green]Serving on {path}[/green] (Ctrl+C to stop)\n")
+    daemon.run_server(server, path)
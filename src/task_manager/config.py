@@ -0,0 +1,280 @@
+import re
+from os import getenv
+from pathlib import Path
+from configparser import ConfigParser
+from typing import Mapping, NamedTuple, Optional
+
+# PRAGMA settings applied to every new SQLite connection, by profile name.
+SQLITE_PROFILES: dict[str, dict[str, str]] = {
+    "default": {},
+    "safe": {
+        "journal_mode": "WAL",
+        "synchronous": "FULL",
+        "busy_timeout": "5000",
+    },
+    "performance": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "mmap_size": str(256 * 1024 * 1024),
+        "cache_size": str(-64 * 1024),
+        "temp_store": "MEMORY",
+        "busy_timeout": "5000",
+    },
+}
+
+ALLOWED_PRAGMAS = frozenset({
+    "journal_mode",
+    "synchronous",
+    "mmap_size",
+    "cache_size",
+    "temp_store",
+    "busy_timeout",
+    "foreign_keys",
+    "wal_autocheckpoint",
+})
+
+_PRAGMA_VALUE = re.compile(r"^-?[A-Za-z0-9_]+$")
+
+BACKENDS = ("sqlalchemy", "memory", "log")
+
+# Connection pools for SQLite: a queue of connections shared by threads,
+# one connection per thread, one connection for everything, or none kept.
+SQLITE_POOLS = ("queue", "thread", "static", "null")
+
+# Who wins when ``sync`` finds a task changed in both databases.
+SYNC_POLICIES = ("newer", "local", "remote")
+
+
+class PoolOptions(NamedTuple):
+    """How the engine pools connections; see ``database.engine_options``."""
+
+    size: int = 5
+    max_overflow: int = 10
+    timeout: float = 30.0
+    pre_ping: bool = False
+    recycle: int = -1
+    sqlite_pool: Optional[str] = None
+
+
+class ArchivePolicy(NamedTuple):
+    """When completed tasks move to ``tasks_archive``; see ``archive``."""
+
+    older_than_days: int = 30
+    auto: bool = False
+    batch_size: int = 1_000
+
+
+class ConfigError(ValueError):
+    """A setting from the environment or the config file is invalid."""
+
+
+PROFILE_ENV = "TASK_MANAGER_DB_PROFILE"
+CONFIG_ENV = "TASK_MANAGER_CONFIG"
+BACKEND_ENV = "TASK_MANAGER_BACKEND"
+LOG_PATH_ENV = "TASK_MANAGER_LOG_PATH"
+
+
+def _config_path(config_path: Optional[Path]) -> Optional[Path]:
+    if config_path is None and getenv(CONFIG_ENV):
+        return Path(getenv(CONFIG_ENV, ""))
+
+    return config_path
+
+
+def load_config(path: Optional[Path]) -> ConfigParser:
+    config = ConfigParser()
+
+    if path is not None:
+        if not path.is_file():
+            raise ConfigError(f"Config file {path} does not exist.")
+
+        config.read(path, encoding="utf-8")
+
+    return config
+
+
+def validate_pragmas(pragmas: Mapping[str, str]) -> dict[str, str]:
+    validated = {}
+
+    for name, value in pragmas.items():
+        name = name.lower()
+        value = str(value).strip()
+
+        if name not in ALLOWED_PRAGMAS:
+            raise ConfigError(f"Unsupported SQLite pragma {name!r}.")
+
+        if not _PRAGMA_VALUE.match(value):
+            raise ConfigError(f"Invalid value {value!r} for pragma {name!r}.")
+
+        validated[name] = value
+
+    return validated
+
+
+def resolve_sqlite_pragmas(
+    profile: Optional[str] = None,
+    config_path: Optional[Path] = None,
+) -> dict[str, str]:
+    """Work out the PRAGMAs for new connections.
+
+    The profile comes from ``profile``, then ``TASK_MANAGER_DB_PROFILE``,
+    then the ``[database] profile`` key of the INI file named by
+    ``TASK_MANAGER_CONFIG``. Keys in that file's ``[pragmas]`` section
+    override individual profile values.
+    """
+    config = load_config(_config_path(config_path))
+    profile = (
+        profile
+        or getenv(PROFILE_ENV)
+        or config.get("database", "profile", fallback="default")
+    )
+
+    if profile not in SQLITE_PROFILES:
+        choices = ", ".join(SQLITE_PROFILES)
+        raise ConfigError(f"Unknown database profile {profile!r}; use one of {choices}.")
+
+    pragmas = dict(SQLITE_PROFILES[profile])
+
+    if config.has_section("pragmas"):
+        pragmas.update(config.items("pragmas"))
+
+    return validate_pragmas(pragmas)
+
+
+def resolve_backend(
+    backend: Optional[str] = None,
+    config_path: Optional[Path] = None,
+) -> str:
+    """Pick the storage backend: ``sqlalchemy`` (default), ``memory`` or ``log``.
+
+    Taken from ``backend``, then ``TASK_MANAGER_BACKEND``, then the
+    ``[storage] backend`` key of the ``TASK_MANAGER_CONFIG`` file.
+    """
+    config = load_config(_config_path(config_path))
+    backend = (
+        backend
+        or getenv(BACKEND_ENV)
+        or config.get("storage", "backend", fallback="sqlalchemy")
+    )
+
+    if backend not in BACKENDS:
+        choices = ", ".join(BACKENDS)
+        raise ConfigError(f"Unknown storage backend {backend!r}; use one of {choices}.")
+
+    return backend
+
+
+def resolve_log_path(default: Path, config_path: Optional[Path] = None) -> Path:
+    """Where the ``log`` backend keeps its file, much like ``resolve_backend``."""
+    config = load_config(_config_path(config_path))
+    return Path(
+        getenv(LOG_PATH_ENV)
+        or config.get("storage", "log_path", fallback=None)
+        or default
+    )
+
+
+def resolve_pool_options(config_path: Optional[Path] = None) -> PoolOptions:
+    """Read the ``[pool]`` section of the ``TASK_MANAGER_CONFIG`` file.
+
+    Keys are ``size``, ``max_overflow``, ``timeout``, ``pre_ping``,
+    ``recycle`` and ``sqlite_pool``; missing keys keep their defaults.
+    """
+    config = load_config(_config_path(config_path))
+    defaults = PoolOptions()
+
+    if not config.has_section("pool"):
+        return defaults
+
+    unknown = set(config.options("pool")) - set(PoolOptions._fields)
+
+    if unknown:
+        raise ConfigError(f"Unsupported pool setting {sorted(unknown)[0]!r}.")
+
+    try:
+        options = PoolOptions(
+            size=config.getint("pool", "size", fallback=defaults.size),
+            max_overflow=config.getint(
+                "pool", "max_overflow", fallback=defaults.max_overflow),
+            timeout=config.getfloat("pool", "timeout", fallback=defaults.timeout),
+            pre_ping=config.getboolean("pool", "pre_ping", fallback=defaults.pre_ping),
+            recycle=config.getint("pool", "recycle", fallback=defaults.recycle),
+            sqlite_pool=config.get("pool", "sqlite_pool", fallback=None),
+        )
+    except ValueError as exc:
+        raise ConfigError(f"Invalid pool setting: {exc}") from exc
+
+    pool_check(options)
+    return options
+
+
+def resolve_archive_policy(config_path: Optional[Path] = None) -> ArchivePolicy:
+    """Read the ``[archive]`` section of the ``TASK_MANAGER_CONFIG`` file.
+
+    Keys are ``older_than_days``, ``auto`` and ``batch_size``; missing keys
+    keep their defaults.
+    """
+    config = load_config(_config_path(config_path))
+    defaults = ArchivePolicy()
+
+    if not config.has_section("archive"):
+        return defaults
+
+    unknown = set(config.options("archive")) - set(ArchivePolicy._fields)
+
+    if unknown:
+        raise ConfigError(f"Unsupported archive setting {sorted(unknown)[0]!r}.")
+
+    try:
+        policy = ArchivePolicy(
+            older_than_days=config.getint(
+                "archive", "older_than_days", fallback=defaults.older_than_days),
+            auto=config.getboolean("archive", "auto", fallback=defaults.auto),
+            batch_size=config.getint(
+                "archive", "batch_size", fallback=defaults.batch_size),
+        )
+    except ValueError as exc:
+        raise ConfigError(f"Invalid archive setting: {exc}") from exc
+
+    if policy.older_than_days < 0:
+        raise ConfigError("Archive older_than_days cannot be negative.")
+
+    if policy.batch_size < 1:
+        raise ConfigError("Archive batch_size must be at least 1.")
+
+    return policy
+
+
+def resolve_sync_policy(
+    policy: Optional[str] = None,
+    config_path: Optional[Path] = None,
+) -> str:
+    """Pick the ``sync`` conflict policy: ``newer`` (default), ``local`` or ``remote``.
+
+    Taken from ``policy``, then the ``[sync] conflict`` key of the
+    ``TASK_MANAGER_CONFIG`` file.
+    """
+    config = load_config(_config_path(config_path))
+    policy = policy or config.get("sync", "conflict", fallback="newer")
+
+    if policy not in SYNC_POLICIES:
+        choices = ", ".join(SYNC_POLICIES)
+        raise ConfigError(f"Unknown conflict policy {policy!r}; use one of {choices}.")
+
+    return policy
+
+
+def pool_check(options: PoolOptions) -> None:
+    if options.size < 1:
+        raise ConfigError("Pool size must be at least 1.")
+
+    if options.max_overflow < -1:
+        raise ConfigError("Pool max_overflow must be -1 (unlimited) or more.")
+
+    if options.timeout <= 0:
+        raise ConfigError("Pool timeout must be positive.")
+
+    if options.sqlite_pool is not None and options.sqlite_pool not in SQLITE_POOLS:
+        choices = ", ".join(SQLITE_POOLS)
+        raise ConfigError(
+            f"Unknown SQLite pool {options.sqlite_pool!r}; use one of {choices}.")
@@ -0,0 +1,238 @@
+# pylint: disable=import-outside-toplevel
+
+"""Unix socket daemon that keeps the engine and container warm.
+
+Clients send one JSON line ``{"argv": [...], "store": ..., ...}`` and get
+one JSON line back with the exit code and captured output. The daemon only
+declines a request before running it. Once a command has run, or may
+have, the client reports the daemon's result rather than running the
+command again itself. This module is
+imported on every CLI start, so only the client side may live at the top
+level; the server pulls in Typer, rich and the database lazily.
+"""
+
+import json
+import socket
+from os import getenv
+from pathlib import Path
+from typing import Optional, Sequence
+
+from .bootstrap import DB_DIRECTORY, storage_location
+
+SOCKET_ENV = "TASK_MANAGER_SOCKET"
+DISABLE_ENV = "TASK_MANAGER_NO_DAEMON"
+
+# Commands that only talk to the database. Anything that reads local files
+# or must run in the caller's process (import, export, serve) stays local.
+FORWARDED_COMMANDS = frozenset(
+    {"create", "list", "complete", "delete", "update", "stats", "search", "recur",
+     "archive"})
+
+CONNECT_TIMEOUT = 0.5
+# Commands run one at a time, so a reply may wait behind other clients.
+REPLY_TIMEOUT = 300.0
+
+
+def socket_path() -> Path:
+    return Path(getenv(SOCKET_ENV) or DB_DIRECTORY / "task-manager.sock")
+
+
+def _read_line(connection: socket.socket) -> bytes:
+    chunks = []
+
+    while chunk := connection.recv(65536):
+        chunks.append(chunk)
+
+        if chunk.endswith(b"\n"):
+            break
+
+    return b"".join(chunks)
+
+
+def _terminal_options() -> dict:
+    import sys
+    from shutil import get_terminal_size
+
+    return {
+        "columns": get_terminal_size().columns,
+        "color": sys.stdout.isatty(),
+    }
+
+
+def forward(
+    argv: Sequence[str],
+    path: Optional[Path] = None,
+    store: Optional[str] = None,
+) -> Optional[tuple[int, str]]:
+    """Run a command on the daemon.
+
+    Returns ``(exit_code, output)``, or None when the command should run
+    in-process: no daemon is listening, forwarding is disabled, the command
+    is not forwardable or the daemon serves a different task store. Once
+    the request is sent, failures come back as a non-zero exit code: the
+    command may already have run, so running it again could repeat a write.
+    """
+    if not hasattr(socket, "AF_UNIX") or getenv(DISABLE_ENV):
+        return None
+
+    if not argv or argv[0] not in FORWARDED_COMMANDS:
+        return None
+
+    path = path or socket_path()
+
+    if not path.exists():
+        return None
+
+    try:
+        store = store or storage_location()
+    except ValueError:
+        # Bad configuration: let the in-process run report it.
+        return None
+
+    request = {
+        "argv": list(argv),
+        "store": store,
+        **_terminal_options(),
+    }
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        try:
+            client.settimeout(CONNECT_TIMEOUT)
+            client.connect(str(path))
+            client.sendall(json.dumps(request).encode() + b"\n")
+        except OSError:
+            return None
+
+        try:
+            client.settimeout(REPLY_TIMEOUT)
+            reply = json.loads(_read_line(client))
+        except (OSError, ValueError) as exc:
+            reason = "timed out" if isinstance(exc, socket.timeout) else "no valid reply"
+            return 1, (f"task-manager: the daemon at {path} sent {reason}; "
+                       f"{argv[0]} may or may not have run.\n")
+
+    if reply.get("status") == "declined":
+        return None
+
+    return reply.get("exit_code", 1), reply.get("output", "")
+
+
+def run_command(
+    app,
+    argv: Sequence[str],
+    columns: int = 80,
+    color: bool = False,
+) -> tuple[int, str]:
+    """Invoke the Typer app in-process and capture what it prints."""
+    import rich
+    from io import StringIO
+    from contextlib import redirect_stdout, redirect_stderr
+    from typer.main import get_command
+
+    class CapturedOutput(StringIO):
+        # Commands pick their default format by the client's terminal.
+        def isatty(self) -> bool:
+            return color
+
+    command = get_command(app)
+    buffer = CapturedOutput()
+    rich.reconfigure(file=buffer, width=columns, force_terminal=color)
+
+    try:
+        with redirect_stdout(buffer), redirect_stderr(buffer):
+            command.main(args=list(argv), prog_name="task-manager")
+        exit_code = 0
+    except SystemExit as exc:
+        exit_code = exc.code if isinstance(exc.code, int) else int(bool(exc.code))
+    except Exception as exc:  # pylint: disable=broad-exception-caught
+        # Report it like an in-process crash would, and keep serving.
+        buffer.write(f"Error: {type(exc).__name__}: {exc}\n")
+        exit_code = 1
+    finally:
+        rich.reconfigure()
+
+    return exit_code, buffer.getvalue()
+
+
+def _handle(app, store: str, request: dict) -> dict:
+    if request.get("store") != store:
+        return {"status": "declined", "reason": "different task store"}
+
+    argv = request.get("argv") or []
+
+    if argv[:1] and argv[0] not in FORWARDED_COMMANDS:
+        return {"status": "declined", "reason": "command runs locally"}
+
+    exit_code, output = run_command(
+        app,
+        argv,
+        columns=int(request.get("columns") or 80),
+        color=bool(request.get("color")),
+    )
+
+    return {"status": "ok", "exit_code": exit_code, "output": output}
+
+
+def create_server(app, path: Path, store: str):
+    """Bind a single-threaded server; commands run one at a time."""
+    import socketserver
+
+    class TaskRequestHandler(socketserver.StreamRequestHandler):
+        def handle(self):
+            line = self.rfile.readline()
+
+            # Liveness probes connect and hang up without sending anything.
+            if not line:
+                return
+
+            try:
+                reply = _handle(app, store, json.loads(line))
+            except (ValueError, AttributeError) as exc:
+                reply = {
+                    "status": "error",
+                    "exit_code": 2,
+                    "output": f"task-manager: bad daemon request: {exc}\n",
+                }
+
+            try:
+                self.wfile.write(json.dumps(reply).encode() + b"\n")
+            except OSError:
+                pass
+
+    _remove_stale_socket(path)
+    server = socketserver.UnixStreamServer(str(path), TaskRequestHandler)
+    path.chmod(0o600)
+    return server
+
+
+def _remove_stale_socket(path: Path) -> None:
+    if not path.exists():
+        return
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        try:
+            probe.connect(str(path))
+        except OSError:
+            path.unlink()
+            return
+
+    raise RuntimeError(f"A daemon is already listening on {path}.")
+
+
+def _exit_on_signal(signum, frame):
+    raise SystemExit(0)
+
+
+def run_server(server, path: Path) -> None:
+    import signal
+
+    # Background jobs ignore SIGINT, so also stop cleanly on SIGTERM.
+    signal.signal(signal.SIGTERM, _exit_on_signal)
+
+    try:
+        server.serve_forever()
+    except (KeyboardInterrupt, SystemExit):
+        pass
+    finally:
+        server.server_close()
+        path.unlink(missing_ok=True)
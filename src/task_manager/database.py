@@ -1,20 +1,222 @@
-from contextlib import contextmanager
+# pylint: disable=import-outside-toplevel
+# pylint: disable=global-statement
+
+import os
+from threading import Lock
+from typing import Any, Mapping, Optional
+from contextlib import contextmanager, asynccontextmanager
 from kink import di
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.pool import NullPool, QueuePool, SingletonThreadPool, StaticPool
+
+from .config import PoolOptions, pool_check
+
+SQLITE_POOL_CLASSES = {
+    "queue": QueuePool,
+    "thread": SingletonThreadPool,
+    "static": StaticPool,
+    "null": NullPool,
+}
+
+
+def install_sqlite_pragmas(engine: Engine, pragmas: Mapping[str, str]) -> None:
+    """Run the given PRAGMAs on every connection the engine opens."""
+    if engine.dialect.name != "sqlite" or not pragmas:
+        return
+
+    statements = [f"PRAGMA {name}={value}" for name, value in pragmas.items()]
+
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+
+        try:
+            for statement in statements:
+                cursor.execute(statement)
+        finally:
+            cursor.close()
+
+
+def async_database_url(db_url: str) -> str:
+    """Swap the blocking SQLite driver for aiosqlite."""
+    url = make_url(db_url)
+
+    if url.get_backend_name() == "sqlite" and url.get_driver_name() == "pysqlite":
+        url = url.set(drivername="sqlite+aiosqlite")
+
+    return url.render_as_string(hide_password=False)
+
+
+def engine_options(db_url: str, pool: Optional[PoolOptions] = None) -> dict[str, Any]:
+    """Translate ``pool`` into ``create_engine`` keyword arguments.
+
+    SQLite connections may be handed between threads by the pool, so
+    ``check_same_thread`` is turned off. File databases default to a queue
+    pool; in-memory ones to a single static connection, since every new
+    connection would otherwise see an empty database.
+    """
+    pool = pool or PoolOptions()
+    pool_check(pool)
+    url = make_url(db_url)
+    options: dict[str, Any] = {
+        "pool_pre_ping": pool.pre_ping,
+        "pool_recycle": pool.recycle,
+    }
+
+    if url.get_backend_name() != "sqlite":
+        options.update(
+            pool_size=pool.size,
+            max_overflow=pool.max_overflow,
+            pool_timeout=pool.timeout,
+        )
+        return options
+
+    memory = not url.database or url.database == ":memory:"
+    kind = pool.sqlite_pool or ("static" if memory else "queue")
+
+    if memory and kind not in ("static", "thread"):
+        raise ValueError("In-memory SQLite needs the static or thread pool.")
+
+    options["poolclass"] = SQLITE_POOL_CLASSES[kind]
+    options["connect_args"] = {"check_same_thread": False}
+
+    if kind == "queue":
+        options.update(
+            pool_size=pool.size,
+            max_overflow=pool.max_overflow,
+            pool_timeout=pool.timeout,
+        )
+    elif kind == "thread":
+        # Past this many threads the pool closes connections that may still
+        # be in use, so it only suits a fixed set of long-lived threads.
+        options["pool_size"] = pool.size
+
+    return options
+
+
+def create_database_engine(
+    db_url: str,
+    pragmas: Optional[Mapping[str, str]] = None,
+    pool: Optional[PoolOptions] = None,
+) -> Engine:
+    engine = create_engine(db_url, **engine_options(db_url, pool))
+    install_sqlite_pragmas(engine, pragmas or {})
+    return engine
 
 
-ENGINE = create_engine(di["db_url"])
-SESSION_LOCAL = sessionmaker(autocommit=False, autoflush=False, bind=ENGINE)
 BASE = declarative_base()
 
+_ENGINE: Optional[Engine] = None
+_SESSION_LOCAL: Optional[sessionmaker] = None
+_ENGINE_LOCK = Lock()
+ASYNC_ENGINE = None
+
+
+def get_engine() -> Engine:
+    """Create the engine from ``di`` on first use and share it afterwards."""
+    global _ENGINE, _SESSION_LOCAL
+
+    if _ENGINE is None:
+        with _ENGINE_LOCK:
+            if _ENGINE is None:
+                engine = create_database_engine(
+                    di["db_url"],
+                    di["db_pragmas"] if "db_pragmas" in di else {},
+                    di["db_pool"] if "db_pool" in di else None,
+                )
+                _SESSION_LOCAL = sessionmaker(
+                    autocommit=False, autoflush=False, bind=engine)
+                _ENGINE = engine
+
+    return _ENGINE
+
+
+def get_session_factory() -> sessionmaker:
+    get_engine()
+    assert _SESSION_LOCAL is not None
+    return _SESSION_LOCAL
+
+
+def dispose_engine() -> None:
+    """Close every pooled connection and forget the engines.
+
+    The next ``get_engine`` call builds a new engine from the current
+    ``di`` settings, so embedders can call this after changing them.
+    """
+    global _ENGINE, _SESSION_LOCAL, ASYNC_ENGINE
+
+    with _ENGINE_LOCK:
+        if _ENGINE is not None:
+            _ENGINE.dispose()
+
+        _ENGINE = _SESSION_LOCAL = None
+        # An async engine can only be closed from its event loop.
+        ASYNC_ENGINE = None
+
+
+def _reset_after_fork() -> None:
+    # Connections inherited from the parent belong to the parent: drop them
+    # without closing, so the child opens its own and the parent's survive.
+    global _ENGINE_LOCK
+
+    _ENGINE_LOCK = Lock()
+
+    if _ENGINE is not None:
+        _ENGINE.dispose(close=False)
+
+    if ASYNC_ENGINE is not None:
+        ASYNC_ENGINE.sync_engine.dispose(close=False)
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def __getattr__(name: str) -> Any:
+    # ENGINE and SESSION_LOCAL used to be built at import time.
+    if name == "ENGINE":
+        return get_engine()
+
+    if name == "SESSION_LOCAL":
+        return get_session_factory()
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 @contextmanager
 def get_db():
-    db = SESSION_LOCAL()
+    db = get_session_factory()()
 
     try:
         yield db
     finally:
         db.close()
+
+
+def get_async_engine():
+    """Create the asyncio engine on first use so aiosqlite stays optional."""
+    global ASYNC_ENGINE
+
+    if ASYNC_ENGINE is None:
+        from sqlalchemy.ext.asyncio import create_async_engine
+
+        ASYNC_ENGINE = create_async_engine(async_database_url(di["db_url"]))
+        install_sqlite_pragmas(
+            ASYNC_ENGINE.sync_engine,
+            di["db_pragmas"] if "db_pragmas" in di else {},
+        )
+
+    return ASYNC_ENGINE
+
+
+@asynccontextmanager
+async def get_async_db():
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+    # Attributes must stay loaded after commit: lazy refreshes cannot run
+    # outside the event loop's greenlet.
+    async with AsyncSession(get_async_engine(), expire_on_commit=False) as db:
+        yield db
@@ -0,0 +1,205 @@
+"""Group commit for high-rate writes to the SQLAlchemy repository.
+
+Every ``SQLAlchemyTaskRepository.add`` or ``complete`` is normally its own
+transaction, so a busy writer waits on one commit (and one fsync) per
+call. ``GroupCommitWriter`` hands those calls to a background thread
+instead. The thread collects everything submitted within ``max_delay``
+seconds, up to ``max_batch`` operations, and runs the lot in one unit of
+work. Callers get a ``Future`` that resolves once their operation's batch
+has committed.
+
+If a batch fails in the database (a constraint violation, say), it is
+rolled back and its operations are retried one per transaction, so only
+the operation at fault fails.
+"""
+
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from queue import Empty, SimpleQueue
+from threading import Lock, Thread
+from time import monotonic
+from typing import Any, Optional, TYPE_CHECKING
+
+from .unit_of_work import SessionContext, unit_of_work
+
+if TYPE_CHECKING:
+    from .models import Task
+
+_STOP = object()
+
+
+@dataclass(frozen=True)
+class _Operation:
+    method: str
+    args: tuple
+    future: Future = field(default_factory=Future)
+    # ``add`` assigns the new ID to the task; a retry must start from this.
+    task_id: Optional[int] = None
+
+
+@dataclass
+class GroupCommitStats:
+    operations: int = 0
+    batches: int = 0
+    retries: int = 0
+
+
+class GroupCommitWriter:
+    """Batch writes from many threads into shared transactions.
+
+    Use it as a context manager, or call ``close`` when done: the writer
+    thread commits everything already submitted before it stops.
+    """
+
+    def __init__(
+        self,
+        db_session_context: Optional[SessionContext] = None,
+        max_batch: int = 256,
+        max_delay: float = 0.002,
+    ) -> None:
+        if max_batch < 1:
+            raise ValueError("`max_batch` must be a positive integer.")
+
+        if max_delay < 0:
+            raise ValueError("`max_delay` cannot be negative.")
+
+        if db_session_context is None:
+            from kink import di
+            db_session_context = di["db_session_context"]
+
+        from .repositories import SQLAlchemyTaskRepository
+
+        self._db_context = db_session_context
+        self._repository = SQLAlchemyTaskRepository(db_session_context)
+        self._max_batch = max_batch
+        self._max_delay = max_delay
+        self._queue: SimpleQueue = SimpleQueue()
+        self._lock = Lock()
+        self._closed = False
+        self.stats = GroupCommitStats()
+        self._thread = Thread(
+            target=self._run, name="task-manager-group-commit", daemon=True)
+        self._thread.start()
+
+    def __enter__(self) -> "GroupCommitWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _submit(self, method: str, *args, task_id: Optional[int] = None) -> Future:
+        operation = _Operation(method, args, task_id=task_id)
+
+        # The lock keeps submissions from landing behind the stop marker.
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("The group commit writer is closed.")
+
+            self._queue.put(operation)
+
+        return operation.future
+
+    def add(self, task: "Task") -> "Future[Optional[int]]":
+        """Queue an insert; the future resolves with the new task's ID."""
+        return self._submit("add", task, task_id=getattr(task, "id", None))
+
+    def complete(self, task_id: int) -> "Future[int]":
+        """Queue a completion; the future resolves with the row count."""
+        return self._submit("complete", task_id)
+
+    def update(self, task: "Task") -> "Future[None]":
+        return self._submit("update", task)
+
+    def flush(self) -> None:
+        """Wait until everything submitted so far has been committed."""
+        self._submit("flush").result()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._closed:
+                return
+
+            self._closed = True
+            self._queue.put(_STOP)
+
+        self._thread.join()
+
+    def _run(self) -> None:
+        stopping = False
+
+        while not stopping:
+            first = self._queue.get()
+
+            if first is _STOP:
+                return
+
+            batch = [first]
+            deadline = monotonic() + self._max_delay
+
+            while len(batch) < self._max_batch:
+                try:
+                    timeout = deadline - monotonic()
+                    item = (self._queue.get(timeout=timeout) if timeout > 0
+                            else self._queue.get_nowait())
+                except Empty:
+                    break
+
+                if item is _STOP:
+                    stopping = True
+                    break
+
+                batch.append(item)
+
+            self._commit(
+                [op for op in batch if op.future.set_running_or_notify_cancel()])
+
+    def _apply(self, operation: _Operation) -> Any:
+        if operation.method == "flush":
+            return None
+
+        return getattr(self._repository, operation.method)(*operation.args)
+
+    def _commit(self, batch: list[_Operation]) -> None:
+        if not batch:
+            return
+
+        from sqlalchemy.exc import SQLAlchemyError
+
+        outcomes: list[tuple[_Operation, Any, Optional[BaseException]]] = []
+
+        try:
+            with unit_of_work(self._db_context):
+                for operation in batch:
+                    try:
+                        outcomes.append((operation, self._apply(operation), None))
+                    except (TypeError, ValueError) as exc:
+                        # Argument checks fail before the session is touched.
+                        outcomes.append((operation, None, exc))
+        except SQLAlchemyError as exc:
+            if len(batch) == 1:
+                batch[0].future.set_exception(exc)
+                return
+
+            self.stats.retries += 1
+            self._retry(batch)
+            return
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            for operation in batch:
+                operation.future.set_exception(exc)
+            return
+
+        self.stats.batches += 1
+        self.stats.operations += len(batch)
+
+        for operation, result, error in outcomes:
+            if error is None:
+                operation.future.set_result(result)
+            else:
+                operation.future.set_exception(error)
+
+    def _retry(self, batch: list[_Operation]) -> None:
+        for operation in batch:
+            if operation.method == "add" and hasattr(operation.args[0], "id"):
+                operation.args[0].id = operation.task_id
+
+            self._commit([operation])
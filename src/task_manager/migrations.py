@@ -0,0 +1,238 @@
+from typing import Callable
+
+from sqlalchemy import (
+    Column, Integer, MetaData, Table, func, select, insert, inspect, text, update,
+)
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.schema import CreateTable
+from sqlalchemy.exc import OperationalError, ProgrammingError
+
+from .archive import create_archive
+from .changes import create_change_log
+from .models import RecurrenceException, RecurrenceRule, Task
+from .search import create_search_index
+from .sync import create_sync_schema
+
+
+MIGRATION_METADATA = MetaData()
+
+SCHEMA_VERSION_TABLE = Table(
+    "schema_version",
+    MIGRATION_METADATA,
+    Column("version", Integer, nullable=False),
+)
+
+
+def _create_task_indexes(connection: Connection, *names: str) -> None:
+    indexes = {index.name: index for index in Task.__table__.indexes}
+
+    for name in names:
+        indexes[name].create(connection, checkfirst=True)
+
+
+def _add_status_due_date_indexes(connection: Connection) -> None:
+    _create_task_indexes(
+        connection,
+        "ix_tasks_completed_due_date",
+        "ix_tasks_due_date",
+    )
+
+
+# SQLite leaves foreign keys unenforced by default, so deletes cascade by
+# trigger. Without them a reused task ID would inherit a deleted task's rule.
+RECURRENCE_TRIGGERS = (
+    """
+    CREATE TRIGGER IF NOT EXISTS recurrence_rules_task_delete
+    AFTER DELETE ON tasks BEGIN
+        DELETE FROM recurrence_rules WHERE task_id = old.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS recurrence_exceptions_rule_delete
+    AFTER DELETE ON recurrence_rules BEGIN
+        DELETE FROM recurrence_exceptions WHERE rule_id = old.id;
+    END
+    """,
+)
+
+
+# Rules carry a copy of their task's name and description, so expanding a
+# window never reads ``tasks``.
+RULE_TEXT_TRIGGERS = (
+    """
+    CREATE TRIGGER IF NOT EXISTS recurrence_rules_text_insert
+    AFTER INSERT ON recurrence_rules BEGIN
+        UPDATE recurrence_rules SET (name, description) = (
+            SELECT name, description FROM tasks WHERE id = new.task_id
+        )
+        WHERE id = new.id AND EXISTS (SELECT 1 FROM tasks WHERE id = new.task_id);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS recurrence_rules_task_text_update
+    AFTER UPDATE OF name, description ON tasks BEGIN
+        UPDATE recurrence_rules SET name = new.name, description = new.description
+        WHERE task_id = new.id;
+    END
+    """,
+)
+
+
+def _add_name_index(connection: Connection) -> None:
+    _create_task_indexes(connection, "ix_tasks_name")
+
+
+def _create_recurrence_tables(connection: Connection) -> None:
+    RecurrenceRule.__table__.create(connection, checkfirst=True)
+    RecurrenceException.__table__.create(connection, checkfirst=True)
+
+    for statement in RECURRENCE_TRIGGERS:
+        connection.execute(text(statement))
+
+
+def _autoincrement_task_ids(connection: Connection) -> None:
+    """Rebuild ``tasks`` with AUTOINCREMENT so no task ID is ever handed out twice.
+
+    Without it SQLite reuses the IDs of archived and deleted tasks, which
+    then clash with ``tasks_archive`` and the change log. Dropping the old
+    table also drops its indexes and triggers, so they are recreated.
+    """
+    table_sql = connection.execute(text(
+        "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'tasks'"
+    )).scalar_one()
+
+    if "AUTOINCREMENT" in table_sql.upper():
+        return
+
+    triggers = connection.execute(text(
+        "SELECT sql FROM sqlite_master WHERE type = 'trigger' AND tbl_name = 'tasks'"
+    )).scalars().all()
+    rebuilt = Task.__table__.to_metadata(MetaData(), name="tasks_rebuilt")
+    existing = {column["name"] for column in inspect(connection).get_columns("tasks")}
+    columns = [c for c in Task.__table__.columns if c.name in existing]
+
+    # The oldest tables allowed NULL where the model now has a default.
+    values = [
+        func.coalesce(c, c.default.arg)
+        if not c.nullable and c.default is not None and c.default.is_scalar else c
+        for c in columns
+    ]
+
+    connection.execute(CreateTable(rebuilt))
+    connection.execute(insert(rebuilt).from_select(
+        [c.name for c in columns], select(*values)))
+    connection.execute(text("DROP TABLE tasks"))
+    connection.execute(text("ALTER TABLE tasks_rebuilt RENAME TO tasks"))
+
+    for index in Task.__table__.indexes:
+        index.create(connection)
+
+    for statement in triggers:
+        connection.execute(text(statement))
+
+    # Start past every ID already used, including archived and deleted ones.
+    connection.execute(text("DELETE FROM sqlite_sequence WHERE name = 'tasks'"))
+    connection.execute(text(
+        """
+        INSERT INTO sqlite_sequence (name, seq) VALUES ('tasks', max(
+            (SELECT coalesce(max(id), 0) FROM tasks),
+            (SELECT coalesce(max(id), 0) FROM tasks_archive),
+            (SELECT coalesce(max(task_id), 0) FROM task_changes)
+        ))
+        """
+    ))
+
+
+def _copy_task_text_to_rules(connection: Connection) -> None:
+    columns = {c["name"] for c in inspect(connection).get_columns("recurrence_rules")}
+
+    if "name" not in columns:
+        connection.execute(text(
+            "ALTER TABLE recurrence_rules ADD COLUMN name VARCHAR(50) NOT NULL DEFAULT ''"))
+
+    if "description" not in columns:
+        connection.execute(text(
+            "ALTER TABLE recurrence_rules ADD COLUMN description VARCHAR(100)"))
+
+    connection.execute(text(
+        """
+        UPDATE recurrence_rules SET (name, description) = (
+            SELECT name, description FROM tasks WHERE id = recurrence_rules.task_id
+        )
+        WHERE EXISTS (SELECT 1 FROM tasks WHERE id = recurrence_rules.task_id)
+        """
+    ))
+
+    for statement in RULE_TEXT_TRIGGERS:
+        connection.execute(text(statement))
+
+
+# Each step upgrades the schema by one version and must be safe to run on a
+# database freshly created by ``create_all`` (where the change already exists).
+MIGRATIONS: list[Callable[[Connection], None]] = [
+    _add_status_due_date_indexes,
+    create_search_index,
+    _create_recurrence_tables,
+    _add_name_index,
+    create_change_log,
+    create_archive,
+    create_sync_schema,
+    _autoincrement_task_ids,
+    _copy_task_text_to_rules,
+]
+
+SCHEMA_VERSION = len(MIGRATIONS)
+
+
+def get_schema_version(connection: Connection) -> int:
+    SCHEMA_VERSION_TABLE.create(connection, checkfirst=True)
+    version = connection.execute(select(SCHEMA_VERSION_TABLE.c.version)).scalar()
+
+    if version is None:
+        connection.execute(insert(SCHEMA_VERSION_TABLE).values(version=0))
+        return 0
+
+    return version
+
+
+def schema_is_current(engine: Engine) -> bool:
+    """Check the version ``migrate`` recorded, with one query and no writes.
+
+    The version lives in the database itself, so a replaced or recreated
+    database file is never mistaken for an up-to-date one.
+    """
+    try:
+        with engine.connect() as connection:
+            version = connection.execute(select(SCHEMA_VERSION_TABLE.c.version)).scalar()
+    except (OperationalError, ProgrammingError):
+        # No ``schema_version`` table yet: the database is new.
+        return False
+
+    return version is not None and version >= SCHEMA_VERSION
+
+
+def migrate(engine: Engine) -> int:
+    with engine.connect() as connection:
+        # Rebuilding a table drops it, which must not set off ON DELETE
+        # actions. The PRAGMA is ignored inside a transaction, so it is
+        # switched off before the migration's transaction starts.
+        foreign_keys = connection.exec_driver_sql("PRAGMA foreign_keys").scalar()
+        connection.exec_driver_sql("PRAGMA foreign_keys = OFF")
+        connection.commit()
+
+        try:
+            with connection.begin():
+                version = get_schema_version(connection)
+
+                for step in MIGRATIONS[version:]:
+                    step(connection)
+
+                if version < SCHEMA_VERSION:
+                    connection.execute(
+                        update(SCHEMA_VERSION_TABLE).values(version=SCHEMA_VERSION)
+                    )
+        finally:
+            connection.exec_driver_sql(f"PRAGMA foreign_keys = {foreign_keys}")
+            connection.commit()
+
+    return SCHEMA_VERSION
@@ -1,7 +1,7 @@
-from typing import Optional
-from datetime import datetime
+from typing import NamedTuple, Optional
+from datetime import date, datetime
 
-from sqlalchemy import String, Boolean, DateTime
+from sqlalchemy import String, Boolean, DateTime, ForeignKey, Index, Integer
 from sqlalchemy.orm import Mapped, mapped_column
 
 from .database import BASE
@@ -9,15 +9,166 @@ from .database import BASE
 
 class Task(BASE):
     __tablename__ = "tasks"
+    __table_args__ = (
+        Index("ix_tasks_completed_due_date", "completed", "due_date"),
+        Index("ix_tasks_due_date", "due_date"),
+        Index("ix_tasks_name", "name"),
+        Index("ix_tasks_completed_completed_at", "completed", "completed_at"),
+        Index("ux_tasks_uid", "uid", unique=True),
+        # IDs of archived and deleted tasks must never be handed out again.
+        {"sqlite_autoincrement": True},
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     name: Mapped[str] = mapped_column(String(50), nullable=False)
     description: Mapped[Optional[str]] = mapped_column(String(100))
     completed: Mapped[bool] = mapped_column(Boolean, default=False)
     due_date: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    # Set and cleared by triggers whenever ``completed`` changes.
+    completed_at: Mapped[Optional[datetime]] = mapped_column(DateTime)
+    # Identify a task across databases for ``sync``. Triggers fill in the
+    # ``uid`` and ``updated_at`` of new rows and bump ``version`` on edits.
+    uid: Mapped[Optional[str]] = mapped_column(String(32))
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=1, server_default="1")
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime)
 
     def __repr__(self) -> str:
         return (
             f"Task(id={self.id!r}, name={self.name!r}, completed={self.completed!r}, "
             f"due_date={self.due_date!r})"
         )
+
+
+class ArchivedTask(BASE):
+    """A completed task moved out of ``tasks`` by ``archive_completed``."""
+
+    __tablename__ = "tasks_archive"
+    __table_args__ = (
+        Index("ix_tasks_archive_due_date", "due_date"),
+        Index("ix_tasks_archive_name", "name"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=False)
+    name: Mapped[str] = mapped_column(String(50), nullable=False)
+    description: Mapped[Optional[str]] = mapped_column(String(100))
+    completed: Mapped[bool] = mapped_column(Boolean, default=True)
+    due_date: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    completed_at: Mapped[Optional[datetime]] = mapped_column(DateTime)
+    archived_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    uid: Mapped[Optional[str]] = mapped_column(String(32), index=True)
+
+
+class RecurrenceRule(BASE):
+    """Repeats a task; the task's own ``due_date`` is the first occurrence.
+
+    ``starts_at`` copies that due date, and ``name`` and ``description``
+    the task's text, so occurrences in a window can be worked out from this
+    table alone. Triggers keep the copies in step with the task.
+    """
+
+    __tablename__ = "recurrence_rules"
+    __table_args__ = (
+        Index("ix_recurrence_rules_starts_at", "starts_at"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    task_id: Mapped[int] = mapped_column(
+        ForeignKey("tasks.id", ondelete="CASCADE"), nullable=False, index=True)
+    frequency: Mapped[str] = mapped_column(String(10), nullable=False)
+    interval: Mapped[int] = mapped_column(Integer, nullable=False, default=1)
+    cron: Mapped[Optional[str]] = mapped_column(String(100))
+    starts_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    until: Mapped[Optional[datetime]] = mapped_column(DateTime)
+    name: Mapped[str] = mapped_column(String(50), nullable=False, server_default="")
+    description: Mapped[Optional[str]] = mapped_column(String(100))
+
+    def __repr__(self) -> str:
+        return (
+            f"RecurrenceRule(id={self.id!r}, task_id={self.task_id!r}, "
+            f"frequency={self.frequency!r}, interval={self.interval!r})"
+        )
+
+
+class RecurrenceException(BASE):
+    """Skips or completes one occurrence of a rule."""
+
+    __tablename__ = "recurrence_exceptions"
+    __table_args__ = (
+        Index("ix_recurrence_exceptions_occurs_at", "occurs_at"),
+        Index("ux_recurrence_exceptions_rule_occurs_at",
+              "rule_id", "occurs_at", unique=True),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    rule_id: Mapped[int] = mapped_column(
+        ForeignKey("recurrence_rules.id", ondelete="CASCADE"), nullable=False)
+    occurs_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    kind: Mapped[str] = mapped_column(String(10), nullable=False)
+
+
+class TaskChangeRecord(BASE):
+    """One insert, update or delete of a task, written by triggers on tasks.
+
+    ``seq`` never goes backwards or gets reused, so it serves as a cursor.
+    """
+
+    __tablename__ = "task_changes"
+    __table_args__ = {"sqlite_autoincrement": True}
+
+    seq: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    task_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    kind: Mapped[str] = mapped_column(String(6), nullable=False)
+    changed_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    # Only recorded for deletes, so ``sync`` can find the row elsewhere.
+    task_uid: Mapped[Optional[str]] = mapped_column(String(32))
+
+
+class SyncPeer(BASE):
+    """How far ``sync`` has got with another database, by its URL.
+
+    ``local_seq`` and ``remote_seq`` are the change log cursors of this
+    database and the peer after the last sync.
+    """
+
+    __tablename__ = "sync_peers"
+
+    peer: Mapped[str] = mapped_column(String(500), primary_key=True)
+    local_seq: Mapped[int] = mapped_column(Integer, nullable=False)
+    remote_seq: Mapped[int] = mapped_column(Integer, nullable=False)
+    synced_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+
+
+class TaskSummary(NamedTuple):
+    """Read-only row for listings, with the status worked out by the query."""
+
+    id: int
+    name: str
+    due_date: datetime
+    description: Optional[str]
+    status: str
+
+
+class DueDateBucket(NamedTuple):
+    """Task counts by status for the tasks due in one day or week."""
+
+    start: date
+    completed: int
+    pending: int
+    overdue: int
+
+    @property
+    def total(self) -> int:
+        return self.completed + self.pending + self.overdue
+
+
+class TaskChange(NamedTuple):
+    """A change log entry with the task as it is now (None once deleted)."""
+
+    seq: int
+    kind: str
+    task_id: int
+    changed_at: datetime
+    name: Optional[str]
+    description: Optional[str]
+    completed: Optional[bool]
+    due_date: Optional[datetime]
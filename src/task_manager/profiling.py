@@ -0,0 +1,287 @@
+"""Opt-in timing for ``--profile``.
+
+Nothing here runs unless ``enable`` has been called: ``phase`` hands back a
+shared no-op context manager, ``wrap_repository`` returns the repository
+untouched and no SQLAlchemy listeners are attached until then (and they
+are removed again by ``disable``). The package imports this module first,
+so ``STARTED_AT`` is as close to process start as the package can get.
+"""
+
+import sys
+import json
+from time import perf_counter
+from contextlib import contextmanager, nullcontext
+from functools import wraps
+from typing import Any, Callable, Iterator, Optional, TextIO
+
+STARTED_AT = perf_counter()
+
+SLOWEST_STATEMENTS = 5
+
+_NO_PHASE = nullcontext()
+_PROFILER: Optional["Profiler"] = None
+
+
+class Timing:
+    """Call count, total and worst time for one phase, method or statement."""
+
+    __slots__ = ("calls", "seconds", "max_seconds")
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.seconds = 0.0
+        self.max_seconds = 0.0
+
+    def add(self, seconds: float) -> None:
+        self.calls += 1
+        self.seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "ms": round(self.seconds * 1000, 3),
+            "max_ms": round(self.max_seconds * 1000, 3),
+        }
+
+
+class Profiler:
+    def __init__(self, clock: Callable[[], float] = perf_counter) -> None:
+        self._clock = clock
+        self._stack: list[str] = []
+        self.enabled_at = clock()
+        self.phases: dict[str, Timing] = {}
+        self.methods: dict[str, Timing] = {}
+        self.statements: dict[str, Timing] = {}
+        self.connections = 0
+        self.checkouts = 0
+        self.listeners: list[tuple[Any, str, Callable]] = []
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time a block; nested phases are recorded as ``outer > inner``."""
+        self._stack.append(name)
+        timing = self.phases.setdefault(" > ".join(self._stack), Timing())
+        start = self._clock()
+
+        try:
+            yield
+        finally:
+            timing.add(self._clock() - start)
+            self._stack.pop()
+
+    def record_method(self, name: str, seconds: float) -> None:
+        self.methods.setdefault(name, Timing()).add(seconds)
+
+    def record_statement(self, statement: str, seconds: float) -> None:
+        self.statements.setdefault(statement, Timing()).add(seconds)
+
+    def report(self) -> dict[str, Any]:
+        now = self._clock()
+        sql = Timing()
+
+        for timing in self.statements.values():
+            sql.calls += timing.calls
+            sql.seconds += timing.seconds
+            sql.max_seconds = max(sql.max_seconds, timing.max_seconds)
+
+        slowest = sorted(
+            self.statements.items(), key=lambda item: item[1].seconds, reverse=True)
+
+        return {
+            "total_ms": round((now - STARTED_AT) * 1000, 3),
+            "startup_ms": round((self.enabled_at - STARTED_AT) * 1000, 3),
+            "phases": {name: t.as_dict() for name, t in self.phases.items()},
+            "repository": {name: t.as_dict() for name, t in self.methods.items()},
+            "sql": {
+                **sql.as_dict(),
+                "connections": self.connections,
+                "checkouts": self.checkouts,
+                "slowest": [
+                    {"statement": statement, **timing.as_dict()}
+                    for statement, timing in slowest[:SLOWEST_STATEMENTS]
+                ],
+            },
+        }
+
+
+def enable() -> Profiler:
+    global _PROFILER  # pylint: disable=global-statement
+    disable()
+    _PROFILER = Profiler()
+
+    # Importing SQLAlchemy here would move its cost out of the phase that
+    # really pays it; ``bootstrap.initialize`` instruments it after import.
+    if "sqlalchemy" in sys.modules:
+        instrument_sqlalchemy()
+
+    return _PROFILER
+
+
+def disable() -> None:
+    global _PROFILER  # pylint: disable=global-statement
+
+    if _PROFILER is not None and _PROFILER.listeners:
+        from sqlalchemy import event
+
+        for target, name, listener in _PROFILER.listeners:
+            event.remove(target, name, listener)
+
+    _PROFILER = None
+
+
+def active() -> Optional[Profiler]:
+    return _PROFILER
+
+
+def phase(name: str):
+    return _NO_PHASE if _PROFILER is None else _PROFILER.phase(name)
+
+
+def instrument_sqlalchemy() -> None:
+    """Count and time SQL statements and pool checkouts on every engine."""
+    profiler = _PROFILER
+
+    if profiler is None or profiler.listeners:
+        return
+
+    from sqlalchemy import event
+    from sqlalchemy.engine import Engine
+    from sqlalchemy.pool import Pool
+
+    def before_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("profiling_started", []).append(perf_counter())
+
+    def after_execute(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info["profiling_started"].pop()
+        profiler.record_statement(" ".join(statement.split()), perf_counter() - started)
+
+    def on_connect(dbapi_connection, connection_record):
+        profiler.connections += 1
+
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        profiler.checkouts += 1
+
+    profiler.listeners = [
+        (Engine, "before_cursor_execute", before_execute),
+        (Engine, "after_cursor_execute", after_execute),
+        (Pool, "connect", on_connect),
+        (Pool, "checkout", on_checkout),
+    ]
+
+    for target, name, listener in profiler.listeners:
+        event.listen(target, name, listener)
+
+
+def wrap_repository(repository: Any) -> Any:
+    """Put a latency-recording proxy in front of ``repository`` if enabled."""
+    if _PROFILER is None:
+        return repository
+
+    return ProfiledRepository(repository, _PROFILER)
+
+
+class ProfiledRepository:
+    """Forwards to a repository and records how long each method takes.
+
+    Lazy iterators (``iter_tasks`` and friends) are timed until exhausted,
+    which includes whatever the caller does between rows.
+    """
+
+    def __init__(self, repository: Any, profiler: Profiler) -> None:
+        self._repository = repository
+        self._profiler = profiler
+
+    def __getattr__(self, name: str) -> Any:
+        attribute = getattr(self._repository, name)
+
+        if not callable(attribute) or name.startswith("_"):
+            return attribute
+
+        profiler = self._profiler
+        method_name = f"{type(self._repository).__name__}.{name}"
+
+        @wraps(attribute)
+        def timed(*args, **kwargs):
+            start = perf_counter()
+
+            try:
+                result = attribute(*args, **kwargs)
+            except BaseException:
+                profiler.record_method(method_name, perf_counter() - start)
+                raise
+
+            if isinstance(result, Iterator):
+                return _timed_iterator(result, profiler, method_name, start)
+
+            profiler.record_method(method_name, perf_counter() - start)
+            return result
+
+        return timed
+
+
+def _timed_iterator(
+    iterator: Iterator,
+    profiler: Profiler,
+    name: str,
+    start: float,
+) -> Iterator:
+    try:
+        yield from iterator
+    finally:
+        profiler.record_method(name, perf_counter() - start)
+
+
+def format_report(report: dict[str, Any]) -> str:
+    lines = [
+        f"Profile: {report['total_ms']:.1f} ms total, "
+        f"{report['startup_ms']:.1f} ms imports and argument parsing",
+        "",
+        "Phases",
+    ]
+
+    for name, timing in report["phases"].items():
+        lines.append(f"  {name:<44} {timing['ms']:>10.2f} ms  x{timing['calls']}")
+
+    lines += ["", "Repository"]
+
+    for name, timing in report["repository"].items():
+        lines.append(
+            f"  {name:<44} {timing['ms']:>10.2f} ms  x{timing['calls']}"
+            f"  max {timing['max_ms']:.2f} ms"
+        )
+
+    sql = report["sql"]
+    lines += [
+        "",
+        f"SQL: {sql['calls']} statements, {sql['ms']:.2f} ms, "
+        f"{sql['connections']} connections opened, {sql['checkouts']} checkouts",
+    ]
+
+    for item in sql["slowest"]:
+        statement = item["statement"]
+        statement = statement if len(statement) <= 60 else statement[:57] + "..."
+        lines.append(f"  {item['ms']:>8.2f} ms  x{item['calls']:<4} {statement}")
+
+    return "\n".join(lines) + "\n"
+
+
+def write_report(
+    profiler: Profiler,
+    json_path: Optional[str] = None,
+    stream: Optional[TextIO] = None,
+) -> None:
+    """Print the breakdown to stderr, or write it as JSON (``-`` for stdout)."""
+    report = profiler.report()
+
+    if json_path is None:
+        (stream or sys.stderr).write(format_report(report))
+        return
+
+    if json_path == "-":
+        (stream or sys.stdout).write(json.dumps(report) + "\n")
+        return
+
+    with open(json_path, "w", encoding="utf-8") as output:
+        json.dump(report, output, indent=2)
+        output.write("\n")
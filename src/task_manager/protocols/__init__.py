@@ -1 +1,3 @@
-from .task_repository import TaskRepository
\ No newline at end of file
+from .task_repository import TaskRepository, IdRange
+from .async_task_repository import AsyncTaskRepository
+from .recurrence_repository import RecurrenceRepository
@@ -0,0 +1,125 @@
+from typing import Any, Literal, AsyncIterator, Iterable, Mapping, Optional, Protocol, Sequence
+from datetime import datetime
+from ..models import DueDateBucket, Task, TaskChange, TaskSummary
+from .task_repository import IdRange
+
+
+class AsyncTaskRepository(Protocol):
+    async def get(self, task_id: int) -> Optional[Task]:
+        ...
+
+    async def list(self) -> Sequence[Task]:
+        ...
+
+    async def add(self, task: Task) -> int | None:
+        ...
+
+    async def add_many(
+        self,
+        rows: Iterable[Mapping[str, Any]],
+        batch_size: int = 10_000,
+    ) -> int:
+        ...
+
+    def export_rows(self, batch_size: int = 1_000) -> AsyncIterator[dict[str, Any]]:
+        ...
+
+    async def delete(self, task: Task) -> None:
+        ...
+
+    async def delete_by_id(self, task_id: int) -> int:
+        ...
+
+    async def delete_many(
+        self,
+        task_ids: Iterable[int] = (),
+        id_ranges: Iterable[IdRange] = (),
+        completed: Optional[bool] = None,
+        due_before: Optional[datetime] = None,
+        due_after: Optional[datetime] = None,
+    ) -> int:
+        ...
+
+    async def update(self, task: Task) -> None:
+        ...
+
+    async def update_many(
+        self,
+        values: Mapping[str, Any],
+        task_ids: Iterable[int] = (),
+        id_ranges: Iterable[IdRange] = (),
+        completed: Optional[bool] = None,
+        due_before: Optional[datetime] = None,
+        due_after: Optional[datetime] = None,
+    ) -> int:
+        ...
+
+    async def complete(self, task_id: int) -> int:
+        ...
+
+    async def complete_many(
+        self,
+        task_ids: Iterable[int] = (),
+        id_ranges: Iterable[IdRange] = (),
+        completed: Optional[bool] = None,
+        due_before: Optional[datetime] = None,
+        due_after: Optional[datetime] = None,
+    ) -> int:
+        ...
+
+    async def filter_by_status(
+        self,
+        completed: Optional[bool] = None,
+        due_before: Optional[datetime] = None,
+        due_after: Optional[datetime] = None,
+    ) -> Sequence[Task]:
+        ...
+
+    def iter_tasks(
+        self,
+        after_id: int = 0,
+        page_size: int = 100,
+        completed: Optional[bool] = None,
+        due_before: Optional[datetime] = None,
+        due_after: Optional[datetime] = None,
+    ) -> AsyncIterator[Task]:
+        ...
+
+    def iter_summaries(
+        self,
+        now: Optional[datetime] = None,
+        after_id: int = 0,
+        page_size: int = 100,
+        completed: Optional[bool] = None,
+        due_before: Optional[datetime] = None,
+        due_after: Optional[datetime] = None,
+        sort: str = "id",
+    ) -> AsyncIterator[TaskSummary]:
+        ...
+
+    async def count_by_status(self, now: Optional[datetime] = None) -> dict[str, int]:
+        ...
+
+    async def histogram_by_due_date(
+        self,
+        bucket: Literal["day", "week"] = "day",
+        now: Optional[datetime] = None,
+        due_before: Optional[datetime] = None,
+        due_after: Optional[datetime] = None,
+    ) -> Sequence[DueDateBucket]:
+        ...
+
+    async def search(
+        self,
+        query: str,
+        limit: int = 20,
+        prefix: bool = True,
+        now: Optional[datetime] = None,
+    ) -> Sequence[TaskSummary]:
+        ...
+
+    async def changes_since(self, seq: int = 0, limit: int = 1_000) -> Sequence[TaskChange]:
+        ...
+
+    async def change_cursor(self) -> int:
+        ...
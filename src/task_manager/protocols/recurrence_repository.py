@@ -0,0 +1,38 @@
+from typing import Iterator, Optional, Protocol, Sequence
+from datetime import datetime
+
+from ..models import RecurrenceRule
+from ..recurrence import Occurrence
+
+
+class RecurrenceRepository(Protocol):
+    def add_rule(
+        self,
+        task_id: int,
+        frequency: str,
+        interval: int = 1,
+        cron: Optional[str] = None,
+        until: Optional[datetime] = None,
+    ) -> Optional[int]:
+        ...
+
+    def get_rule(self, rule_id: int) -> Optional[RecurrenceRule]:
+        ...
+
+    def list_rules(self) -> Sequence[RecurrenceRule]:
+        ...
+
+    def delete_rule(self, rule_id: int) -> int:
+        ...
+
+    def mark_occurrence(self, rule_id: int, occurs_at: datetime, kind: str) -> int:
+        ...
+
+    def iter_occurrences(
+        self,
+        due_after: datetime,
+        due_before: datetime,
+        completed: Optional[bool] = None,
+        now: Optional[datetime] = None,
+    ) -> Iterator[Occurrence]:
+        ...
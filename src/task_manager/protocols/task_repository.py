@@ -1,6 +1,9 @@
-from typing import Protocol, Sequence, Optional
+from typing import Any, Literal, Protocol, Sequence, Optional, Iterable, Iterator, Mapping
 from datetime import datetime
-from ..models import Task
+from ..models import DueDateBucket, Task, TaskChange, TaskSummary
+
+# An inclusive ``(start, end)`` ID range; an end of None leaves it open.
+IdRange = tuple[int, Optional[int]]
 
 
 class TaskRepository(Protocol):
@@ -10,16 +13,60 @@ class TaskRepository(Protocol):
     def list(self) -> Sequence[Task]:
         ...
 
-    def add(self, task: Task) -> None:
+    def add(self, task: Task) -> Optional[int]:
+        ...
+
+    def add_many(
+        self,
+        rows: Iterable[Mapping[str, Any]],
+        batch_size: int = 10_000,
+    ) -> int:
+        ...
+
+    def export_rows(self, batch_size: int = 1_000) -> Iterator[dict[str, Any]]:
         ...
 
     def delete(self, task: Task) -> None:
         ...
 
+    def delete_by_id(self, task_id: int) -> int:
+        ...
+
+    def delete_many(
+        self,
+        task_ids: Iterable[int] = (),
+        id_ranges: Iterable[IdRange] = (),
+        completed: Optional[bool] = None,
+        due_before: Optional[datetime] = None,
+        due_after: Optional[datetime] = None,
+    ) -> int:
+        ...
+
     def update(self, task: Task) -> None:
         ...
 
-    def complete(self, task_id: int) -> None:
+    def update_many(
+        self,
+        values: Mapping[str, Any],
+        task_ids: Iterable[int] = (),
+        id_ranges: Iterable[IdRange] = (),
+        completed: Optional[bool] = None,
+        due_before: Optional[datetime] = None,
+        due_after: Optional[datetime] = None,
+    ) -> int:
+        ...
+
+    def complete(self, task_id: int) -> int:
+        ...
+
+    def complete_many(
+        self,
+        task_ids: Iterable[int] = (),
+        id_ranges: Iterable[IdRange] = (),
+        completed: Optional[bool] = None,
+        due_before: Optional[datetime] = None,
+        due_after: Optional[datetime] = None,
+    ) -> int:
         ...
 
     def filter_by_status(
@@ -29,3 +76,60 @@ class TaskRepository(Protocol):
         due_after: Optional[datetime] = None,
     ) -> Sequence[Task]:
         ...
+
+    def iter_tasks(
+        self,
+        after_id: int = 0,
+        page_size: int = 100,
+        completed: Optional[bool] = None,
+        due_before: Optional[datetime] = None,
+        due_after: Optional[datetime] = None,
+    ) -> Iterator[Task]:
+        ...
+
+    def iter_summaries(
+        self,
+        now: Optional[datetime] = None,
+        after_id: int = 0,
+        page_size: int = 100,
+        completed: Optional[bool] = None,
+        due_before: Optional[datetime] = None,
+        due_after: Optional[datetime] = None,
+        sort: str = "id",
+        include_archived: bool = False,
+    ) -> Iterator[TaskSummary]:
+        ...
+
+    def count_by_status(self, now: Optional[datetime] = None) -> dict[str, int]:
+        ...
+
+    def histogram_by_due_date(
+        self,
+        bucket: Literal["day", "week"] = "day",
+        now: Optional[datetime] = None,
+        due_before: Optional[datetime] = None,
+        due_after: Optional[datetime] = None,
+    ) -> Sequence[DueDateBucket]:
+        ...
+
+    def search(
+        self,
+        query: str,
+        limit: int = 20,
+        prefix: bool = True,
+        now: Optional[datetime] = None,
+    ) -> Sequence[TaskSummary]:
+        ...
+
+    def changes_since(self, seq: int = 0, limit: int = 1_000) -> Sequence[TaskChange]:
+        ...
+
+    def change_cursor(self) -> int:
+        ...
+
+    def archive_completed(
+        self,
+        completed_before: datetime,
+        batch_size: int = 1_000,
+    ) -> int:
+        ...
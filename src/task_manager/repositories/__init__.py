@@ -1 +1,6 @@
-from .sql_alchemy_task_repo import SQLAlchemyTaskRepository
\ No newline at end of file
+from .sql_alchemy_task_repo import SQLAlchemyTaskRepository
+from .async_sql_alchemy_task_repo import AsyncSQLAlchemyTaskRepository
+from .caching_task_repo import CachingTaskRepository, CacheStats
+from .in_memory_task_repo import InMemoryTaskRepository
+from .log_task_repo import LogTaskRepository
+from .sql_alchemy_recurrence_repo import SQLAlchemyRecurrenceRepository
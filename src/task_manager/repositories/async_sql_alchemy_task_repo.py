@@ -0,0 +1,333 @@
+from typing import Any, AsyncIterator, Literal, Callable, Iterable, Mapping, Optional, Sequence
+from datetime import date, datetime
+from itertools import islice
+from contextlib import AbstractAsyncContextManager
+
+from sqlalchemy import insert, select, update, delete
+from sqlalchemy.ext.asyncio import AsyncSession
+from kink import inject
+
+from ..models import DueDateBucket, Task, TaskChange, TaskSummary
+from ..protocols import AsyncTaskRepository, IdRange
+from .task_criteria import SORT_ID, TaskCriteria
+
+
+@inject(alias=AsyncTaskRepository)
+class AsyncSQLAlchemyTaskRepository(TaskCriteria):
+    """Asyncio counterpart of ``SQLAlchemyTaskRepository``.
+
+    Every call opens its own ``AsyncSession`` so many calls can be awaited
+    concurrently on one event loop.
+    """
+
+    def __init__(self, async_db_session_context: Callable[[
+    ], AbstractAsyncContextManager[AsyncSession]]) -> None:
+        self._db_context = async_db_session_context
+
+    async def _execute_rowcount(self, statement) -> int:
+        async with self._db_context() as db:
+            result = await db.execute(
+                statement.execution_options(synchronize_session=False))
+            await db.commit()
+            return result.rowcount
+
+    async def get(self, task_id: int) -> Optional[Task]:
+        self._task_id_check(task_id)
+
+        async with self._db_context() as db:
+            return await db.get(Task, task_id)
+
+    async def complete(self, task_id: int) -> int:
+        self._task_id_check(task_id)
+
+        return await self._execute_rowcount(
+            update(Task).where(Task.id == task_id).values(completed=True))
+
+    async def complete_many(
+        self,
+        task_ids: Iterable[int] = (),
+        id_ranges: Iterable[IdRange] = (),
+        completed: Optional[bool] = None,
+        due_before: Optional[datetime] = None,
+        due_after: Optional[datetime] = None,
+    ) -> int:
+        criteria = self._selection_criteria(
+            task_ids, id_ranges, completed, due_before, due_after)
+
+        return await self._execute_rowcount(
+            update(Task).where(*criteria).values(completed=True))
+
+    async def list(self) -> Sequence[Task]:
+        async with self._db_context() as db:
+            result = await db.scalars(select(Task))
+            return result.all()
+
+    async def add(self, task: Task) -> int | None:
+        self._task_type_check(task)
+
+        async with self._db_context() as db:
+            db.add(task)
+            await db.commit()
+            return task.id
+
+    async def add_many(
+        self,
+        rows: Iterable[Mapping[str, Any]],
+        batch_size: int = 10_000,
+    ) -> int:
+        self._batch_size_check(batch_size)
+        count = 0
+        iterator = iter(rows)
+
+        async with self._db_context() as db:
+            while batch := list(islice(iterator, batch_size)):
+                await db.execute(insert(Task.__table__), batch)
+                count += len(batch)
+
+            await db.commit()
+
+        return count
+
+    def export_rows(self, batch_size: int = 1_000) -> AsyncIterator[dict[str, Any]]:
+        self._batch_size_check(batch_size)
+        return self._iter_export_rows(batch_size)
+
+    async def _iter_export_rows(self, batch_size: int) -> AsyncIterator[dict[str, Any]]:
+        query = (
+            select(
+                Task.id,
+                Task.name,
+                Task.description,
+                Task.completed,
+                Task.due_date,
+            )
+            .order_by(Task.id)
+            .execution_options(yield_per=batch_size)
+        )
+
+        async with self._db_context() as db:
+            result = await db.stream(query)
+
+            async for row in result:
+                yield row._asdict()
+
+    async def delete(self, task: Task) -> None:
+        self._task_type_check(task)
+
+        async with self._db_context() as db:
+            await db.delete(task)
+            await db.commit()
+
+    async def delete_by_id(self, task_id: int) -> int:
+        self._task_id_check(task_id)
+
+        return await self._execute_rowcount(delete(Task).where(Task.id == task_id))
+
+    async def delete_many(
+        self,
+        task_ids: Iterable[int] = (),
+        id_ranges: Iterable[IdRange] = (),
+        completed: Optional[bool] = None,
+        due_before: Optional[datetime] = None,
+        due_after: Optional[datetime] = None,
+    ) -> int:
+        criteria = self._selection_criteria(
+            task_ids, id_ranges, completed, due_before, due_after)
+
+        return await self._execute_rowcount(delete(Task).where(*criteria))
+
+    async def update(self, task: Task) -> None:
+        self._task_type_check(task)
+
+        async with self._db_context() as db:
+            existing_task = await db.get(Task, task.id)
+
+            if existing_task is not None:
+                existing_task.name = task.name
+                existing_task.completed = task.completed
+                existing_task.due_date = task.due_date
+                existing_task.description = task.description
+
+            await db.commit()
+
+    async def update_many(
+        self,
+        values: Mapping[str, Any],
+        task_ids: Iterable[int] = (),
+        id_ranges: Iterable[IdRange] = (),
+        completed: Optional[bool] = None,
+        due_before: Optional[datetime] = None,
+        due_after: Optional[datetime] = None,
+    ) -> int:
+        self._values_check(values)
+        criteria = self._selection_criteria(
+            task_ids, id_ranges, completed, due_before, due_after)
+
+        return await self._execute_rowcount(
+            update(Task).where(*criteria).values(**values))
+
+    async def filter_by_status(
+        self,
+        completed: Optional[bool] = None,
+        due_before: Optional[datetime] = None,
+        due_after: Optional[datetime] = None,
+    ) -> Sequence[Task]:
+        self._filter_type_check(completed, due_before, due_after)
+        criteria = self._filter_criteria(completed, due_before, due_after)
+
+        async with self._db_context() as db:
+            result = await db.scalars(select(Task).where(*criteria))
+            return result.all()
+
+    def iter_tasks(
+        self,
+        after_id: int = 0,
+        page_size: int = 100,
+        completed: Optional[bool] = None,
+        due_before: Optional[datetime] = None,
+        due_after: Optional[datetime] = None,
+    ) -> AsyncIterator[Task]:
+        """Yield tasks ordered by ID, fetching one keyset page per session."""
+        self._page_check(after_id, page_size)
+        self._filter_type_check(completed, due_before, due_after)
+
+        return self._iter_pages(
+            after_id, page_size, completed, due_before, due_after)
+
+    async def _iter_pages(
+        self,
+        after_id: int,
+        page_size: int,
+        completed: Optional[bool],
+        due_before: Optional[datetime],
+        due_after: Optional[datetime],
+    ) -> AsyncIterator[Task]:
+        criteria = self._filter_criteria(completed, due_before, due_after)
+
+        while True:
+            async with self._db_context() as db:
+                result = await db.scalars(
+                    select(Task)
+                    .where(*criteria, Task.id > after_id)
+                    .order_by(Task.id)
+                    .limit(page_size)
+                )
+                page = result.all()
+
+            for task in page:
+                yield task
+
+            if len(page) < page_size:
+                return
+
+            after_id = page[-1].id
+
+    def iter_summaries(
+        self,
+        now: Optional[datetime] = None,
+        after_id: int = 0,
+        page_size: int = 100,
+        completed: Optional[bool] = None,
+        due_before: Optional[datetime] = None,
+        due_after: Optional[datetime] = None,
+        sort: str = SORT_ID,
+    ) -> AsyncIterator[TaskSummary]:
+        """Yield listing rows in ``sort`` order, with status computed in SQL."""
+        now = datetime.now() if now is None else now
+        self._now_check(now)
+        self._page_check(after_id, page_size)
+        self._filter_type_check(completed, due_before, due_after)
+        self._sort_check(sort, after_id)
+
+        return self._iter_summary_pages(
+            now, after_id, page_size, completed, due_before, due_after, sort)
+
+    async def _iter_summary_pages(
+        self,
+        now: datetime,
+        after_id: int,
+        page_size: int,
+        completed: Optional[bool],
+        due_before: Optional[datetime],
+        due_after: Optional[datetime],
+        sort: str,
+    ) -> AsyncIterator[TaskSummary]:
+        criteria = self._filter_criteria(completed, due_before, due_after)
+        after = (after_id, after_id) if after_id else None
+
+        while True:
+            async with self._db_context() as db:
+                result = await db.execute(
+                    self._summary_page(now, page_size, criteria, sort, after))
+                page = [TaskSummary._make(row) for row in result]
+
+            for summary in page:
+                yield summary
+
+            if len(page) < page_size:
+                return
+
+            after = self._keyset(sort, page[-1])
+
+    async def count_by_status(self, now: Optional[datetime] = None) -> dict[str, int]:
+        """Count completed, pending and overdue tasks in one query."""
+        now = datetime.now() if now is None else now
+        self._now_check(now)
+
+        async with self._db_context() as db:
+            result = await db.execute(self._count_by_status_query(now))
+            return result.one()._asdict()
+
+    async def histogram_by_due_date(
+        self,
+        bucket: Literal["day", "week"] = "day",
+        now: Optional[datetime] = None,
+        due_before: Optional[datetime] = None,
+        due_after: Optional[datetime] = None,
+    ) -> Sequence[DueDateBucket]:
+        """Count tasks by status per due day or week with one GROUP BY."""
+        now = datetime.now() if now is None else now
+        self._bucket_check(bucket)
+        self._now_check(now)
+        self._filter_type_check(None, due_before, due_after)
+        query = self._histogram_query(bucket, now, due_before, due_after)
+
+        async with self._db_context() as db:
+            result = await db.execute(query)
+            return [
+                DueDateBucket(date.fromisoformat(start), *counts)
+                for start, *counts in result
+            ]
+
+    async def search(
+        self,
+        query: str,
+        limit: int = 20,
+        prefix: bool = True,
+        now: Optional[datetime] = None,
+    ) -> Sequence[TaskSummary]:
+        """Full-text search names and descriptions, best matches first."""
+        now = datetime.now() if now is None else now
+        self._now_check(now)
+        statement = self._search_query(query, limit, prefix, now)
+
+        async with self._db_context() as db:
+            result = await db.execute(statement)
+            return [TaskSummary._make(row) for row in result]
+
+    async def changes_since(
+        self,
+        seq: int = 0,
+        limit: int = 1_000,
+    ) -> Sequence[TaskChange]:
+        """Up to ``limit`` changes logged after ``seq``, oldest first."""
+        statement = self._changes_query(seq, limit)
+
+        async with self._db_context() as db:
+            result = await db.execute(statement)
+            return [TaskChange._make(row) for row in result]
+
+    async def change_cursor(self) -> int:
+        async with self._db_context() as db:
+            result = await db.execute(self._change_cursor_query())
+            return result.scalar_one()
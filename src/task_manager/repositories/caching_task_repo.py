@@ -0,0 +1,386 @@
+from typing import Any, Literal, Callable, Hashable, Iterable, Iterator, Mapping, Optional, Sequence
+from datetime import datetime
+from threading import RLock
+from collections import OrderedDict
+from dataclasses import dataclass
+from time import monotonic
+
+from ..models import DueDateBucket, Task, TaskChange, TaskSummary
+from ..protocols import TaskRepository, IdRange
+
+FilterKey = tuple[Optional[bool], Optional[datetime], Optional[datetime]]
+
+_MISSING = object()
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+
+
+class LRUCache:
+    """Size-bounded LRU mapping whose entries also expire after ``ttl``."""
+
+    def __init__(
+        self,
+        max_size: int,
+        ttl: Optional[float],
+        stats: CacheStats,
+        clock: Callable[[], float] = monotonic,
+    ) -> None:
+        if max_size < 1:
+            raise ValueError("`max_size` must be a positive integer.")
+
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._max_size = max_size
+        self._ttl = ttl
+        self._stats = stats
+        self._clock = clock
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def items(self) -> list[tuple[Hashable, Any]]:
+        return [(key, value) for key, (_, value) in self._entries.items()]
+
+    def peek(self, key: Hashable) -> Any:
+        """Return a live entry without touching recency or the counters."""
+        entry = self._entries.get(key)
+
+        if entry is None:
+            return _MISSING
+
+        stored_at, value = entry
+
+        if self._ttl is not None and self._clock() - stored_at >= self._ttl:
+            return _MISSING
+
+        return value
+
+    def get(self, key: Hashable) -> Any:
+        entry = self._entries.get(key)
+
+        if entry is None:
+            self._stats.misses += 1
+            return _MISSING
+
+        stored_at, value = entry
+
+        if self._ttl is not None and self._clock() - stored_at >= self._ttl:
+            del self._entries[key]
+            self._stats.evictions += 1
+            self._stats.misses += 1
+            return _MISSING
+
+        self._entries.move_to_end(key)
+        self._stats.hits += 1
+        return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        self._entries[key] = (self._clock(), value)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+            self._stats.evictions += 1
+
+    def discard(self, key: Hashable) -> None:
+        if self._entries.pop(key, None) is not None:
+            self._stats.invalidations += 1
+
+    def discard_where(self, predicate: Callable[[Hashable, Any], bool]) -> None:
+        for key, value in self.items():
+            if predicate(key, value):
+                self.discard(key)
+
+    def clear(self) -> None:
+        self._stats.invalidations += len(self._entries)
+        self._entries.clear()
+
+
+def _matches(key: FilterKey, task: Task) -> bool:
+    completed, due_before, due_after = key
+
+    if completed is not None and task.completed is not completed:
+        return False
+
+    if due_before is not None and not task.due_date < due_before:
+        return False
+
+    if due_after is not None and not task.due_date >= due_after:
+        return False
+
+    return True
+
+
+def _contains(tasks: Sequence[Task], task_id: int) -> bool:
+    return any(task.id == task_id for task in tasks)
+
+
+class CachingTaskRepository:
+    """Read-through cache in front of any ``TaskRepository``.
+
+    ``get`` results are cached by ID and ``filter_by_status`` results by
+    their ``(completed, due_before, due_after)`` arguments. Writes through
+    this wrapper invalidate only the entries they can affect; set-based
+    writes clear the cache. Cached tasks are shared objects and must not be
+    mutated by callers. Writes made around the wrapper are only picked up
+    once entries expire after ``ttl`` seconds.
+
+    Reads fetch outside the lock. Every invalidation bumps a generation
+    counter, and a fetched result is only cached if no invalidation
+    happened while it was being read, since it may be stale.
+    """
+
+    def __init__(
+        self,
+        repository: TaskRepository,
+        max_size: int = 1024,
+        ttl: Optional[float] = 30.0,
+        clock: Callable[[], float] = monotonic,
+    ) -> None:
+        self._repository = repository
+        self._lock = RLock()
+        self.stats = CacheStats()
+        self._tasks = LRUCache(max_size, ttl, self.stats, clock)
+        self._filters = LRUCache(max_size, ttl, self.stats, clock)
+        self._generation = 0
+
+    def _invalidate(self, task_id: int, stale: Callable[[Hashable, Any], bool]) -> None:
+        """Drop the task and every filter ``stale`` picks out."""
+        with self._lock:
+            self._generation += 1
+            self._tasks.discard(task_id)
+            self._filters.discard_where(stale)
+
+    def _invalidate_task(self, task_id: int, *states: Task) -> None:
+        """Drop the task and every filter it was in or now belongs to."""
+        self._invalidate(
+            task_id,
+            lambda key, tasks: _contains(tasks, task_id)
+            or any(_matches(key, state) for state in states),
+        )
+
+    def _invalidate_all(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._tasks.clear()
+            self._filters.clear()
+
+    def get(self, task_id: int) -> Optional[Task]:
+        with self._lock:
+            task = self._tasks.get(task_id)
+            generation = self._generation
+
+        if task is not _MISSING:
+            return task
+
+        task = self._repository.get(task_id)
+
+        with self._lock:
+            if generation == self._generation:
+                self._tasks.put(task_id, task)
+
+        return task
+
+    def filter_by_status(
+        self,
+        completed: Optional[bool] = None,
+        due_before: Optional[datetime] = None,
+        due_after: Optional[datetime] = None,
+    ) -> Sequence[Task]:
+        key = (completed, due_before, due_after)
+
+        with self._lock:
+            tasks = self._filters.get(key)
+            generation = self._generation
+
+        if tasks is _MISSING:
+            tasks = tuple(self._repository.filter_by_status(
+                completed=completed, due_before=due_before, due_after=due_after))
+
+            with self._lock:
+                if generation == self._generation:
+                    self._filters.put(key, tasks)
+
+        return list(tasks)
+
+    def list(self) -> Sequence[Task]:
+        return self._repository.list()
+
+    def iter_tasks(
+        self,
+        after_id: int = 0,
+        page_size: int = 100,
+        completed: Optional[bool] = None,
+        due_before: Optional[datetime] = None,
+        due_after: Optional[datetime] = None,
+    ) -> Iterator[Task]:
+        return self._repository.iter_tasks(
+            after_id=after_id,
+            page_size=page_size,
+            completed=completed,
+            due_before=due_before,
+            due_after=due_after,
+        )
+
+    def iter_summaries(
+        self,
+        now: Optional[datetime] = None,
+        after_id: int = 0,
+        page_size: int = 100,
+        completed: Optional[bool] = None,
+        due_before: Optional[datetime] = None,
+        due_after: Optional[datetime] = None,
+        sort: str = "id",
+        include_archived: bool = False,
+    ) -> Iterator[TaskSummary]:
+        return self._repository.iter_summaries(
+            now=now,
+            after_id=after_id,
+            page_size=page_size,
+            completed=completed,
+            due_before=due_before,
+            due_after=due_after,
+            sort=sort,
+            include_archived=include_archived,
+        )
+
+    def export_rows(self, batch_size: int = 1_000) -> Iterator[dict[str, Any]]:
+        return self._repository.export_rows(batch_size=batch_size)
+
+    def search(
+        self,
+        query: str,
+        limit: int = 20,
+        prefix: bool = True,
+        now: Optional[datetime] = None,
+    ) -> Sequence[TaskSummary]:
+        return self._repository.search(query, limit=limit, prefix=prefix, now=now)
+
+    def count_by_status(self, now: Optional[datetime] = None) -> dict[str, int]:
+        return self._repository.count_by_status(now=now)
+
+    def changes_since(self, seq: int = 0, limit: int = 1_000) -> Sequence[TaskChange]:
+        return self._repository.changes_since(seq, limit=limit)
+
+    def change_cursor(self) -> int:
+        return self._repository.change_cursor()
+
+    def histogram_by_due_date(
+        self,
+        bucket: Literal["day", "week"] = "day",
+        now: Optional[datetime] = None,
+        due_before: Optional[datetime] = None,
+        due_after: Optional[datetime] = None,
+    ) -> Sequence[DueDateBucket]:
+        return self._repository.histogram_by_due_date(
+            bucket=bucket, now=now, due_before=due_before, due_after=due_after)
+
+    def add(self, task: Task) -> int | None:
+        task_id = self._repository.add(task)
+        self._invalidate_task(task_id, task)
+        return task_id
+
+    def add_many(
+        self,
+        rows: Iterable[Mapping[str, Any]],
+        batch_size: int = 10_000,
+    ) -> int:
+        try:
+            return self._repository.add_many(rows, batch_size=batch_size)
+        finally:
+            self._invalidate_all()
+
+    def update(self, task: Task) -> None:
+        self._repository.update(task)
+        self._invalidate_task(task.id, task)
+
+    def complete(self, task_id: int) -> int:
+        with self._lock:
+            cached = self._tasks.peek(task_id)
+
+        count = self._repository.complete(task_id)
+
+        if cached is _MISSING or cached is None:
+            # Without the old row, any filter that admits completed tasks
+            # may now include it.
+            self._invalidate(
+                task_id,
+                lambda key, tasks: key[0] is not False or _contains(tasks, task_id),
+            )
+        else:
+            state = Task(
+                id=task_id,
+                name=cached.name,
+                completed=True,
+                due_date=cached.due_date,
+            )
+            self._invalidate_task(task_id, state)
+
+        return count
+
+    def delete(self, task: Task) -> None:
+        self._repository.delete(task)
+        self._invalidate_task(task.id)
+
+    def delete_by_id(self, task_id: int) -> int:
+        count = self._repository.delete_by_id(task_id)
+        self._invalidate_task(task_id)
+        return count
+
+    def complete_many(
+        self,
+        task_ids: Iterable[int] = (),
+        id_ranges: Iterable[IdRange] = (),
+        completed: Optional[bool] = None,
+        due_before: Optional[datetime] = None,
+        due_after: Optional[datetime] = None,
+    ) -> int:
+        try:
+            return self._repository.complete_many(
+                task_ids, id_ranges, completed, due_before, due_after)
+        finally:
+            self._invalidate_all()
+
+    def delete_many(
+        self,
+        task_ids: Iterable[int] = (),
+        id_ranges: Iterable[IdRange] = (),
+        completed: Optional[bool] = None,
+        due_before: Optional[datetime] = None,
+        due_after: Optional[datetime] = None,
+    ) -> int:
+        try:
+            return self._repository.delete_many(
+                task_ids, id_ranges, completed, due_before, due_after)
+        finally:
+            self._invalidate_all()
+
+    def update_many(
+        self,
+        values: Mapping[str, Any],
+        task_ids: Iterable[int] = (),
+        id_ranges: Iterable[IdRange] = (),
+        completed: Optional[bool] = None,
+        due_before: Optional[datetime] = None,
+        due_after: Optional[datetime] = None,
+    ) -> int:
+        try:
+            return self._repository.update_many(
+                values, task_ids, id_ranges, completed, due_before, due_after)
+        finally:
+            self._invalidate_all()
+
+    def archive_completed(
+        self,
+        completed_before: datetime,
+        batch_size: int = 1_000,
+    ) -> int:
+        try:
+            return self._repository.archive_completed(completed_before, batch_size)
+        finally:
+            self._invalidate_all()
@@ -0,0 +1,581 @@
+from typing import Any, Iterable, Iterator, Literal, Mapping, Optional, Sequence
+from bisect import bisect_left, bisect_right, insort
+from datetime import date, datetime, timedelta
+from itertools import islice
+from threading import RLock
+
+from ..changes import CHANGE_DELETE, CHANGE_INSERT, CHANGE_UPDATE
+from ..models import DueDateBucket, Task, TaskChange, TaskSummary
+from ..protocols import IdRange
+from ..search import search_terms, search_words
+from ..serialization import TASK_FIELDS
+
+from .task_criteria import (
+    SORT_DUE,
+    SORT_ID,
+    SORT_NAME,
+    STATUS_COMPLETED,
+    STATUS_OVERDUE,
+    STATUS_PENDING,
+    TaskCriteria,
+)
+
+Row = dict[str, Any]
+
+# ``(kind, task_id, changed_at)``; an entry's seq is its position plus one.
+ChangeEntry = tuple[str, int, datetime]
+
+
+class InMemoryTaskRepository(TaskCriteria):
+    """A ``TaskRepository`` that keeps every task in process memory.
+
+    Rows live in a dict keyed by ID next to a sorted ID list for keyset
+    paging and a sorted ``(due_date, id)`` index for due-date ranges.
+    Nothing is persisted, which suits tests and scratch runs. Tasks handed
+    out are copies, so edits only take effect through ``update``.
+
+    Every write goes through ``_apply`` so subclasses can persist changes.
+    ``_apply`` also keeps the change log, which starts empty whenever the
+    repository is created.
+    """
+
+    def __init__(self) -> None:
+        self._rows: dict[int, Row] = {}
+        self._ids: list[int] = []
+        self._due_index: list[tuple[datetime, int]] = []
+        self._changes: list[ChangeEntry] = []
+        # The largest ID ever stored; it never goes down, even on deletes.
+        self._max_id_ever = 0
+        self._lock = RLock()
+
+    # Storage primitives. Callers hold the lock.
+
+    def _next_id(self, offset: int = 0) -> int:
+        # Like SQLite AUTOINCREMENT: IDs of deleted tasks are never reused.
+        return self._max_id_ever + 1 + offset
+
+    def _insert(self, row: Row) -> None:
+        task_id = row["id"]
+        self._rows[task_id] = row
+        self._max_id_ever = max(self._max_id_ever, task_id)
+        insort(self._ids, task_id)
+        insort(self._due_index, (row["due_date"], task_id))
+
+    def _remove(self, task_id: int) -> None:
+        row = self._rows.pop(task_id)
+        del self._ids[bisect_left(self._ids, task_id)]
+        del self._due_index[bisect_left(self._due_index, (row["due_date"], task_id))]
+
+    def _apply(self, puts: Sequence[Row] = (), deletes: Sequence[int] = ()) -> None:
+        """Store whole rows and drop IDs; the single path for every write."""
+        now = datetime.now()
+
+        for task_id in deletes:
+            if task_id in self._rows:
+                self._remove(task_id)
+                self._changes.append((CHANGE_DELETE, task_id, now))
+
+        for row in puts:
+            existing = self._rows.get(row["id"])
+
+            # Like the SQL triggers, rewriting identical values logs nothing.
+            if existing == row:
+                continue
+
+            if existing is not None:
+                self._remove(row["id"])
+
+            self._insert(row)
+            self._changes.append(
+                (CHANGE_INSERT if existing is None else CHANGE_UPDATE, row["id"], now))
+
+    # Conversions and predicates.
+
+    def _new_row(self, task_id: int, values: Mapping[str, Any]) -> Row:
+        name = values.get("name")
+        due_date = values.get("due_date")
+
+        if not isinstance(name, str) or not isinstance(due_date, datetime):
+            raise ValueError("Tasks need a `name` string and a `due_date` datetime.")
+
+        return {
+            "id": task_id,
+            "name": name,
+            "description": values.get("description"),
+            "completed": bool(values.get("completed") or False),
+            "due_date": due_date,
+        }
+
+    def _task_values(self, task: Task) -> Row:
+        return {field: getattr(task, field) for field in TASK_FIELDS}
+
+    def _to_task(self, row: Row) -> Task:
+        return Task(**row)
+
+    def _status(self, row: Row, now: datetime) -> str:
+        if row["completed"]:
+            return STATUS_COMPLETED
+
+        return STATUS_PENDING if row["due_date"] >= now else STATUS_OVERDUE
+
+    def _to_summary(self, row: Row, now: datetime) -> TaskSummary:
+        return TaskSummary(
+            row["id"],
+            row["name"],
+            row["due_date"],
+            row["description"],
+            self._status(row, now),
+        )
+
+    def _matches(
+        self,
+        row: Row,
+        completed: Optional[bool],
+        due_before: Optional[datetime],
+        due_after: Optional[datetime],
+    ) -> bool:
+        return (
+            (completed is None or row["completed"] is completed)
+            and (due_before is None or row["due_date"] < due_before)
+            and (due_after is None or row["due_date"] >= due_after)
+        )
+
+    def _filtered(
+        self,
+        completed: Optional[bool],
+        due_before: Optional[datetime],
+        due_after: Optional[datetime],
+    ) -> list[Row]:
+        """Rows passing the filters in ID order, using the due-date index."""
+        if due_before is None and due_after is None:
+            rows = (self._rows[task_id] for task_id in self._ids)
+        else:
+            start = 0 if due_after is None else bisect_left(
+                self._due_index, (due_after,))
+            end = len(self._due_index) if due_before is None else bisect_left(
+                self._due_index, (due_before,))
+            rows = (
+                self._rows[task_id]
+                for task_id in sorted(i for _, i in self._due_index[start:end])
+            )
+
+        return [row for row in rows if completed is None or row["completed"] is completed]
+
+    def _selected(
+        self,
+        task_ids: Iterable[int],
+        id_ranges: Iterable[IdRange],
+        completed: Optional[bool],
+        due_before: Optional[datetime],
+        due_after: Optional[datetime],
+    ) -> list[Row]:
+        task_ids, id_ranges = self._selection_check(
+            task_ids, id_ranges, completed, due_before, due_after)
+        wanted = set(task_ids)
+
+        def in_selection(task_id: int) -> bool:
+            if not (wanted or id_ranges):
+                return True
+
+            return task_id in wanted or any(
+                task_id >= start and (end is None or task_id <= end)
+                for start, end in id_ranges
+            )
+
+        return [
+            row for row in self._filtered(completed, due_before, due_after)
+            if in_selection(row["id"])
+        ]
+
+    def _page_after(
+        self,
+        after_id: int,
+        page_size: int,
+        completed: Optional[bool],
+        due_before: Optional[datetime],
+        due_after: Optional[datetime],
+    ) -> list[Row]:
+        with self._lock:
+            start = bisect_right(self._ids, after_id)
+            rows = (self._rows[task_id] for task_id in self._ids[start:])
+            return list(islice(
+                (r for r in rows if self._matches(r, completed, due_before, due_after)),
+                page_size,
+            ))
+
+    # TaskRepository.
+
+    def get(self, task_id: int) -> Optional[Task]:
+        self._task_id_check(task_id)
+
+        with self._lock:
+            row = self._rows.get(task_id)
+            return None if row is None else self._to_task(row)
+
+    def list(self) -> Sequence[Task]:
+        with self._lock:
+            return [self._to_task(self._rows[task_id]) for task_id in self._ids]
+
+    def add(self, task: Task) -> int | None:
+        self._task_type_check(task)
+
+        with self._lock:
+            row = self._new_row(self._next_id(), self._task_values(task))
+            self._apply(puts=[row])
+
+        task.id = row["id"]
+        return task.id
+
+    def add_many(
+        self,
+        rows: Iterable[Mapping[str, Any]],
+        batch_size: int = 10_000,
+    ) -> int:
+        """Add task rows all together, or none if any row is invalid.
+
+        IDs in ``rows`` are ignored; every task gets a new one.
+        """
+        self._batch_size_check(batch_size)
+        values = list(rows)
+
+        with self._lock:
+            new_rows = [
+                self._new_row(self._next_id(offset), row)
+                for offset, row in enumerate(values)
+            ]
+            self._apply(puts=new_rows)
+
+        return len(new_rows)
+
+    def export_rows(self, batch_size: int = 1_000) -> Iterator[dict[str, Any]]:
+        self._batch_size_check(batch_size)
+        return self._iter_export_rows(batch_size)
+
+    def _iter_export_rows(self, batch_size: int) -> Iterator[dict[str, Any]]:
+        after_id = 0
+
+        while page := self._page_after(after_id, batch_size, None, None, None):
+            for row in page:
+                yield dict(row)
+
+            after_id = page[-1]["id"]
+
+    def delete(self, task: Task) -> None:
+        self._task_type_check(task)
+
+        with self._lock:
+            self._apply(deletes=[task.id])
+
+    def delete_by_id(self, task_id: int) -> int:
+        self._task_id_check(task_id)
+
+        with self._lock:
+            if task_id not in self._rows:
+                return 0
+
+            self._apply(deletes=[task_id])
+            return 1
+
+    def delete_many(
+        self,
+        task_ids: Iterable[int] = (),
+        id_ranges: Iterable[IdRange] = (),
+        completed: Optional[bool] = None,
+        due_before: Optional[datetime] = None,
+        due_after: Optional[datetime] = None,
+    ) -> int:
+        with self._lock:
+            selected = self._selected(
+                task_ids, id_ranges, completed, due_before, due_after)
+            self._apply(deletes=[row["id"] for row in selected])
+            return len(selected)
+
+    def update(self, task: Task) -> None:
+        self._task_type_check(task)
+
+        with self._lock:
+            if task.id in self._rows:
+                self._apply(puts=[self._new_row(task.id, self._task_values(task))])
+
+    def update_many(
+        self,
+        values: Mapping[str, Any],
+        task_ids: Iterable[int] = (),
+        id_ranges: Iterable[IdRange] = (),
+        completed: Optional[bool] = None,
+        due_before: Optional[datetime] = None,
+        due_after: Optional[datetime] = None,
+    ) -> int:
+        self._values_check(values)
+
+        with self._lock:
+            selected = self._selected(
+                task_ids, id_ranges, completed, due_before, due_after)
+            self._apply(puts=[
+                self._new_row(row["id"], {**row, **values}) for row in selected
+            ])
+            return len(selected)
+
+    def complete(self, task_id: int) -> int:
+        self._task_id_check(task_id)
+
+        with self._lock:
+            row = self._rows.get(task_id)
+
+            if row is None:
+                return 0
+
+            self._apply(puts=[{**row, "completed": True}])
+            return 1
+
+    def complete_many(
+        self,
+        task_ids: Iterable[int] = (),
+        id_ranges: Iterable[IdRange] = (),
+        completed: Optional[bool] = None,
+        due_before: Optional[datetime] = None,
+        due_after: Optional[datetime] = None,
+    ) -> int:
+        with self._lock:
+            selected = self._selected(
+                task_ids, id_ranges, completed, due_before, due_after)
+            self._apply(puts=[{**row, "completed": True} for row in selected])
+            return len(selected)
+
+    def filter_by_status(
+        self,
+        completed: Optional[bool] = None,
+        due_before: Optional[datetime] = None,
+        due_after: Optional[datetime] = None,
+    ) -> Sequence[Task]:
+        self._filter_type_check(completed, due_before, due_after)
+
+        with self._lock:
+            return [
+                self._to_task(row)
+                for row in self._filtered(completed, due_before, due_after)
+            ]
+
+    def iter_tasks(
+        self,
+        after_id: int = 0,
+        page_size: int = 100,
+        completed: Optional[bool] = None,
+        due_before: Optional[datetime] = None,
+        due_after: Optional[datetime] = None,
+    ) -> Iterator[Task]:
+        self._page_check(after_id, page_size)
+        self._filter_type_check(completed, due_before, due_after)
+
+        return (
+            self._to_task(row) for row in self._iter_rows(
+                after_id, page_size, completed, due_before, due_after)
+        )
+
+    def iter_summaries(
+        self,
+        now: Optional[datetime] = None,
+        after_id: int = 0,
+        page_size: int = 100,
+        completed: Optional[bool] = None,
+        due_before: Optional[datetime] = None,
+        due_after: Optional[datetime] = None,
+        sort: str = SORT_ID,
+        include_archived: bool = False,
+    ) -> Iterator[TaskSummary]:
+        # Nothing is archived in memory, so ``include_archived`` changes nothing.
+        now = datetime.now() if now is None else now
+        self._now_check(now)
+        self._page_check(after_id, page_size)
+        self._filter_type_check(completed, due_before, due_after)
+        self._sort_check(sort, after_id)
+
+        if sort == SORT_DUE:
+            rows = self._iter_rows_by_due(page_size, completed, due_before, due_after)
+        elif sort == SORT_NAME:
+            rows = self._iter_rows_by_name(page_size, completed, due_before, due_after)
+        else:
+            rows = self._iter_rows(after_id, page_size, completed, due_before, due_after)
+
+        return (self._to_summary(row, now) for row in rows)
+
+    def _iter_rows_by_due(
+        self,
+        page_size: int,
+        completed: Optional[bool],
+        due_before: Optional[datetime],
+        due_after: Optional[datetime],
+    ) -> Iterator[Row]:
+        """Walk the ``(due_date, id)`` index one page per lock hold."""
+        after: Optional[tuple[datetime, int]] = None
+
+        while True:
+            with self._lock:
+                if after is not None:
+                    start = bisect_right(self._due_index, after)
+                else:
+                    start = 0 if due_after is None else bisect_left(
+                        self._due_index, (due_after,))
+
+                page = []
+
+                for index in range(start, len(self._due_index)):
+                    due_date, task_id = self._due_index[index]
+
+                    if due_before is not None and due_date >= due_before:
+                        break
+
+                    row = self._rows[task_id]
+
+                    if completed is None or row["completed"] is completed:
+                        page.append(row)
+
+                        if len(page) == page_size:
+                            break
+
+            yield from page
+
+            if len(page) < page_size:
+                return
+
+            after = (page[-1]["due_date"], page[-1]["id"])
+
+    def _iter_rows_by_name(
+        self,
+        page_size: int,
+        completed: Optional[bool],
+        due_before: Optional[datetime],
+        due_after: Optional[datetime],
+    ) -> Iterator[Row]:
+        # There is no name index: sort the matching IDs once, then hand out
+        # pages of whichever of them still exist.
+        with self._lock:
+            keys = sorted(
+                (row["name"], row["id"])
+                for row in self._filtered(completed, due_before, due_after)
+            )
+
+        for offset in range(0, len(keys), page_size):
+            with self._lock:
+                page = [
+                    self._rows[task_id]
+                    for _, task_id in keys[offset:offset + page_size]
+                    if task_id in self._rows
+                ]
+
+            yield from page
+
+    def _iter_rows(
+        self,
+        after_id: int,
+        page_size: int,
+        completed: Optional[bool],
+        due_before: Optional[datetime],
+        due_after: Optional[datetime],
+    ) -> Iterator[Row]:
+        while True:
+            page = self._page_after(
+                after_id, page_size, completed, due_before, due_after)
+
+            yield from page
+
+            if len(page) < page_size:
+                return
+
+            after_id = page[-1]["id"]
+
+    def count_by_status(self, now: Optional[datetime] = None) -> dict[str, int]:
+        now = datetime.now() if now is None else now
+        self._now_check(now)
+        counts = dict.fromkeys((STATUS_COMPLETED, STATUS_PENDING, STATUS_OVERDUE), 0)
+
+        with self._lock:
+            for row in self._rows.values():
+                counts[self._status(row, now)] += 1
+
+        return counts
+
+    def histogram_by_due_date(
+        self,
+        bucket: Literal["day", "week"] = "day",
+        now: Optional[datetime] = None,
+        due_before: Optional[datetime] = None,
+        due_after: Optional[datetime] = None,
+    ) -> Sequence[DueDateBucket]:
+        now = datetime.now() if now is None else now
+        self._bucket_check(bucket)
+        self._now_check(now)
+        self._filter_type_check(None, due_before, due_after)
+        counts: dict[date, dict[str, int]] = {}
+
+        with self._lock:
+            for row in self._filtered(None, due_before, due_after):
+                start = row["due_date"].date()
+
+                if bucket == "week":
+                    start -= timedelta(days=start.weekday())
+
+                statuses = counts.setdefault(start, dict.fromkeys(
+                    (STATUS_COMPLETED, STATUS_PENDING, STATUS_OVERDUE), 0))
+                statuses[self._status(row, now)] += 1
+
+        return [DueDateBucket(start, **counts[start]) for start in sorted(counts)]
+
+    def search(
+        self,
+        query: str,
+        limit: int = 20,
+        prefix: bool = True,
+        now: Optional[datetime] = None,
+    ) -> Sequence[TaskSummary]:
+        """Scan every task; ranks by how many words match, then by ID."""
+        now = datetime.now() if now is None else now
+        self._now_check(now)
+        self._search_check(query, limit)
+        terms = search_terms(query)
+        scored = []
+
+        def hits(term: str, words: list[str]) -> int:
+            if prefix:
+                return sum(word.startswith(term) for word in words)
+
+            return words.count(term)
+
+        with self._lock:
+            for task_id in self._ids:
+                row = self._rows[task_id]
+                words = search_words(f"{row['name']} {row['description'] or ''}")
+                counts = [hits(term, words) for term in terms]
+
+                if all(counts):
+                    scored.append((-sum(counts), task_id, row))
+
+        scored.sort(key=lambda item: item[:2])
+        return [self._to_summary(row, now) for _, _, row in scored[:limit]]
+
+    def changes_since(self, seq: int = 0, limit: int = 1_000) -> Sequence[TaskChange]:
+        self._cursor_check(seq, limit)
+
+        with self._lock:
+            changes = []
+
+            for offset, (kind, task_id, changed_at) in enumerate(
+                    self._changes[seq:seq + limit], start=seq + 1):
+                row = None if kind == CHANGE_DELETE else self._rows.get(task_id)
+                values = (None, None, None, None) if row is None else (
+                    row["name"], row["description"], row["completed"], row["due_date"])
+                changes.append(TaskChange(offset, kind, task_id, changed_at, *values))
+
+            return changes
+
+    def change_cursor(self) -> int:
+        with self._lock:
+            return len(self._changes)
+
+    def archive_completed(
+        self,
+        completed_before: datetime,
+        batch_size: int = 1_000,
+    ) -> int:
+        """Not supported: there is no archive table, and no ``completed_at``."""
+        raise NotImplementedError("Archiving needs the sqlalchemy backend.")
@@ -0,0 +1,261 @@
+import os
+import json
+import weakref
+from pathlib import Path
+from datetime import datetime
+from threading import RLock
+from typing import Any, Callable, Iterable, Optional, Sequence
+
+try:
+    import fcntl
+except ImportError:  # Windows: no other process is kept out.
+    fcntl = None
+
+from .in_memory_task_repo import InMemoryTaskRepository, Row
+
+
+class _LogLock:
+    """A re-entrant thread lock that also holds an exclusive ``flock``.
+
+    The ``flock`` is on a sidecar file, because compaction replaces the log
+    itself. ``on_acquire`` runs once the outermost ``with`` has the lock.
+    The sidecar stays open until ``close``, or until the lock is garbage
+    collected or the process exits.
+    """
+
+    def __init__(self, path: Path, on_acquire: Callable[[], None]) -> None:
+        self._lock = RLock()
+        self._depth = 0
+        self._on_acquire = on_acquire
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        self._finalizer = weakref.finalize(self, os.close, self._fd)
+
+    def close(self) -> None:
+        with self._lock:
+            self._finalizer()
+
+    def compactions(self) -> int:
+        """How many times the log was compacted, as counted in the lock file."""
+        os.lseek(self._fd, 0, os.SEEK_SET)
+        data = os.read(self._fd, 32).strip()
+        return int(data) if data else 0
+
+    def count_compaction(self) -> None:
+        data = str(self.compactions() + 1).encode()
+        os.lseek(self._fd, 0, os.SEEK_SET)
+        os.write(self._fd, data)
+        os.ftruncate(self._fd, len(data))
+
+    def __enter__(self) -> "_LogLock":
+        self._lock.acquire()
+
+        if not self._finalizer.alive:
+            self._lock.release()
+            raise ValueError("The task log is closed.")
+
+        self._depth += 1
+
+        if self._depth == 1:
+            try:
+                if fcntl is not None:
+                    fcntl.flock(self._fd, fcntl.LOCK_EX)
+
+                self._on_acquire()
+            except BaseException:
+                self.__exit__(None, None, None)
+                raise
+
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._depth -= 1
+
+        # Closing the file already dropped the ``flock``.
+        if self._depth == 0 and fcntl is not None and self._finalizer.alive:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+        self._lock.release()
+
+
+class LogTaskRepository(InMemoryTaskRepository):
+    """An in-memory repository made durable by an append-only JSONL log.
+
+    Each write appends one ``put`` (whole row) or ``delete`` record per
+    affected task before it is applied in memory. Opening the repository
+    replays the log to rebuild the in-memory indexes. Once the log holds
+    more than ``compact_ratio`` records per live task (and at least
+    ``compact_min_records``), it is rewritten with one ``put`` per task.
+
+    Several processes can share the log. Every call holds an exclusive
+    ``flock`` on ``<log>.lock`` and first applies whatever other processes
+    have written since. Replaying the log on open is not a change, so the
+    change log covers writes made since opening, including other processes'.
+
+    ``close`` (or leaving a ``with`` block) releases the lock file; the
+    repository cannot be used afterwards.
+    """
+
+    def __init__(
+        self,
+        path: Path | str,
+        compact_ratio: float = 2.0,
+        compact_min_records: int = 1_000,
+        fsync: bool = False,
+    ) -> None:
+        super().__init__()
+        self._path = Path(path)
+        self._compact_ratio = compact_ratio
+        self._compact_min_records = compact_min_records
+        self._fsync = fsync
+        self._records = 0
+        # Where this process has read up to, in the file with this identity.
+        self._offset = 0
+        self._identity: Optional[tuple[int, int, int]] = None
+        self._lock = _LogLock(
+            self._path.with_name(self._path.name + ".lock"), self._catch_up)
+
+        with self._lock:
+            self._changes.clear()
+
+    def __enter__(self) -> "LogTaskRepository":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._lock.close()
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def _encode(self, record: dict[str, Any]) -> str:
+        if "due_date" in record:
+            record = {**record, "due_date": record["due_date"].isoformat()}
+
+        return json.dumps(record, separators=(",", ":")) + "\n"
+
+    def _decode(self, line_number: int, line: str) -> dict[str, Any]:
+        try:
+            record = json.loads(line)
+
+            if record["op"] == "put":
+                record["due_date"] = datetime.fromisoformat(record["due_date"])
+            elif record["op"] not in ("delete", "max_id"):
+                raise ValueError(f"unknown op {record['op']!r}")
+        except (KeyError, TypeError, ValueError) as exc:
+            raise ValueError(
+                f"{self._path}, line {line_number}: bad log record ({exc}).") from exc
+
+        return record
+
+    def _file_identity(self, stat: os.stat_result) -> tuple[int, int, int]:
+        # A compacted-away file's inode can be reused by a later compaction,
+        # so the compaction count tells two files with one inode apart.
+        return stat.st_dev, stat.st_ino, self._lock.compactions()
+
+    def _catch_up(self) -> None:
+        """Apply the records other processes added since this one last looked."""
+        try:
+            stat = os.stat(self._path)
+        except FileNotFoundError:
+            return
+
+        identity = self._file_identity(stat)
+
+        if identity != self._identity:
+            # New, or compacted by another process: read the whole file.
+            self._identity = identity
+            self._offset = self._records = 0
+            seen = self._replay()
+            super()._apply(deletes=[i for i in list(self._ids) if i not in seen])
+        elif stat.st_size != self._offset:
+            self._replay()
+
+    def _replay(self) -> set[int]:
+        """Apply records from ``self._offset`` on; returns the IDs they put."""
+        seen = set()
+
+        with self._path.open("r+b") as log:
+            log.seek(self._offset)
+            end = self._offset
+
+            for line_number, raw in enumerate(log, start=self._records + 1):
+                if not raw.endswith(b"\n"):
+                    break
+
+                record = self._decode(line_number, raw.decode("utf-8"))
+                op = record.pop("op")
+
+                if op == "put":
+                    super()._apply(puts=[record])
+                    seen.add(record["id"])
+                elif op == "max_id":
+                    self._max_id_ever = max(self._max_id_ever, record["id"])
+                else:
+                    super()._apply(deletes=[record["id"]])
+                    seen.discard(record["id"])
+
+                self._records += 1
+                end += len(raw)
+
+            # A crash mid-append can leave a partial last line; drop it so
+            # the next record starts on a fresh line.
+            log.truncate(end)
+            self._offset = end
+
+        return seen
+
+    def _append(self, lines: Iterable[str]) -> None:
+        data = "".join(lines)
+
+        with self._path.open("a", encoding="utf-8", newline="") as log:
+            log.write(data)
+            log.flush()
+
+            if self._fsync:
+                os.fsync(log.fileno())
+
+        if self._identity is None:
+            self._identity = self._file_identity(os.stat(self._path))
+
+        self._offset += len(data.encode("utf-8"))
+
+    def _apply(self, puts: Sequence[Row] = (), deletes: Sequence[int] = ()) -> None:
+        deletes = [task_id for task_id in deletes if task_id in self._rows]
+
+        if not (puts or deletes):
+            return
+
+        self._append([
+            *(self._encode({"op": "delete", "id": task_id}) for task_id in deletes),
+            *(self._encode({"op": "put", **row}) for row in puts),
+        ])
+        super()._apply(puts, deletes)
+        self._records += len(puts) + len(deletes)
+
+        if self._records >= max(
+                self._compact_min_records, self._compact_ratio * len(self._rows)):
+            self.compact()
+
+    def compact(self) -> None:
+        """Rewrite the log as one ``put`` per live task, replacing it atomically."""
+        with self._lock:
+            temporary = self._path.with_name(self._path.name + ".compact")
+
+            with temporary.open("w", encoding="utf-8", newline="") as log:
+                log.write(self._encode({"op": "max_id", "id": self._max_id_ever}))
+
+                for task_id in self._ids:
+                    log.write(self._encode({"op": "put", **self._rows[task_id]}))
+
+                log.flush()
+                os.fsync(log.fileno())
+
+            os.replace(temporary, self._path)
+            self._lock.count_compaction()
+            stat = os.stat(self._path)
+            self._identity = self._file_identity(stat)
+            self._offset = stat.st_size
+            self._records = len(self._rows) + 1
@@ -0,0 +1,186 @@
+from typing import Callable, Iterator, Optional, Sequence
+from datetime import datetime
+from contextlib import AbstractContextManager
+
+from sqlalchemy import delete, or_, select
+from sqlalchemy.orm import Session
+from kink import inject
+
+from ..models import RecurrenceException, RecurrenceRule, Task
+from ..protocols import RecurrenceRepository
+from ..recurrence import (
+    EXCEPTION_KINDS,
+    Occurrence,
+    Rule,
+    expand,
+    is_occurrence,
+    rule_check,
+)
+from ..unit_of_work import commit, session_scope
+
+from .task_criteria import TaskCriteria
+
+
+@inject(alias=RecurrenceRepository)
+class SQLAlchemyRecurrenceRepository(TaskCriteria):
+    """Recurrence rules for tasks, expanded into occurrences on demand."""
+
+    def __init__(self, db_session_context: Callable[[
+    ], AbstractContextManager[Session]]) -> None:
+        self._db_context = db_session_context
+
+    def _rule_id_check(self, rule_id: int) -> None:
+        if not isinstance(rule_id, int) or rule_id < 1:
+            raise ValueError("Rule ID must be a positive integer.")
+
+    def _window_check(self, due_after: datetime, due_before: datetime) -> None:
+        if not (isinstance(due_after, datetime) and isinstance(due_before, datetime)):
+            raise TypeError("`due_after` and `due_before` must be datetimes.")
+
+        if due_before <= due_after:
+            raise ValueError("`due_before` must be later than `due_after`.")
+
+    def _rule_query(self):
+        return select(
+            RecurrenceRule.id,
+            RecurrenceRule.task_id,
+            RecurrenceRule.name,
+            RecurrenceRule.description,
+            RecurrenceRule.frequency,
+            RecurrenceRule.interval,
+            RecurrenceRule.cron,
+            RecurrenceRule.starts_at,
+            RecurrenceRule.until,
+        )
+
+    def add_rule(
+        self,
+        task_id: int,
+        frequency: str,
+        interval: int = 1,
+        cron: Optional[str] = None,
+        until: Optional[datetime] = None,
+    ) -> Optional[int]:
+        """Repeat a task from its due date; None if the task does not exist."""
+        self._task_id_check(task_id)
+
+        with session_scope(self._db_context) as db:
+            task = db.get(Task, task_id)
+
+            if task is None:
+                return None
+
+            rule_check(frequency, interval, cron, task.due_date, until)
+            rule = RecurrenceRule(
+                task_id=task_id,
+                frequency=frequency,
+                interval=interval,
+                cron=cron,
+                starts_at=task.due_date,
+                until=until,
+            )
+            db.add(rule)
+            commit(self._db_context, db)
+            return rule.id
+
+    def get_rule(self, rule_id: int) -> Optional[RecurrenceRule]:
+        self._rule_id_check(rule_id)
+
+        with session_scope(self._db_context) as db:
+            return db.get(RecurrenceRule, rule_id)
+
+    def list_rules(self) -> Sequence[RecurrenceRule]:
+        with session_scope(self._db_context) as db:
+            return db.scalars(
+                select(RecurrenceRule).order_by(RecurrenceRule.id)).all()
+
+    def delete_rule(self, rule_id: int) -> int:
+        """Delete a rule and, by trigger, its exceptions; return the row count."""
+        self._rule_id_check(rule_id)
+
+        with session_scope(self._db_context) as db:
+            result = db.execute(
+                delete(RecurrenceRule).where(RecurrenceRule.id == rule_id))
+            commit(self._db_context, db)
+            return result.rowcount
+
+    def mark_occurrence(self, rule_id: int, occurs_at: datetime, kind: str) -> int:
+        """Skip or complete one occurrence; 0 if the rule does not exist.
+
+        Raises ValueError if ``occurs_at`` is not one of the rule's
+        occurrences. Marking the same occurrence again replaces the mark.
+        """
+        self._rule_id_check(rule_id)
+
+        if kind not in EXCEPTION_KINDS:
+            raise ValueError(f"Kind must be one of {', '.join(EXCEPTION_KINDS)}.")
+
+        with session_scope(self._db_context) as db:
+            row = db.execute(
+                self._rule_query().where(RecurrenceRule.id == rule_id)).first()
+
+            if row is None:
+                return 0
+
+            if not is_occurrence(Rule._make(row), occurs_at):
+                raise ValueError(
+                    f"Rule {rule_id} has no occurrence at {occurs_at:%Y-%m-%d %H:%M}.")
+
+            db.execute(delete(RecurrenceException).where(
+                RecurrenceException.rule_id == rule_id,
+                RecurrenceException.occurs_at == occurs_at,
+            ))
+            db.add(RecurrenceException(
+                rule_id=rule_id, occurs_at=occurs_at, kind=kind))
+            commit(self._db_context, db)
+            return 1
+
+    def iter_occurrences(
+        self,
+        due_after: datetime,
+        due_before: datetime,
+        completed: Optional[bool] = None,
+        now: Optional[datetime] = None,
+    ) -> Iterator[Occurrence]:
+        """Yield occurrences due in ``[due_after, due_before)`` by due date.
+
+        Two queries: the rules active in the window (each with a copy of
+        its task's name) and the exceptions inside the window; ``tasks``
+        is not read. Nothing is expanded
+        before the caller asks for it.
+        """
+        now = datetime.now() if now is None else now
+        self._now_check(now)
+        self._window_check(due_after, due_before)
+        self._filter_type_check(completed, None, None)
+
+        return self._iter_occurrences(due_after, due_before, completed, now)
+
+    def _iter_occurrences(
+        self,
+        due_after: datetime,
+        due_before: datetime,
+        completed: Optional[bool],
+        now: datetime,
+    ) -> Iterator[Occurrence]:
+        rules_query = self._rule_query().where(
+            RecurrenceRule.starts_at < due_before,
+            or_(RecurrenceRule.until.is_(None), RecurrenceRule.until >= due_after),
+        ).order_by(RecurrenceRule.id)
+        exceptions_query = select(
+            RecurrenceException.rule_id,
+            RecurrenceException.occurs_at,
+            RecurrenceException.kind,
+        ).where(
+            RecurrenceException.occurs_at >= due_after,
+            RecurrenceException.occurs_at < due_before,
+        )
+
+        with session_scope(self._db_context) as db:
+            rules = [Rule._make(row) for row in db.execute(rules_query)]
+            exceptions = {
+                (rule_id, occurs_at): kind
+                for rule_id, occurs_at, kind in db.execute(exceptions_query)
+            }
+
+        yield from expand(rules, exceptions, due_after, due_before, now, completed)
@@ -1,69 +1,150 @@
-from typing import Sequence, Optional, Callable
-from datetime import datetime
+import heapq
+from typing import Any, Literal, Sequence, Optional, Callable, Iterable, Iterator, Mapping
+from datetime import date, datetime
+from itertools import islice
 from contextlib import AbstractContextManager
 
+from sqlalchemy import insert, literal, select, update, delete
 from sqlalchemy.orm import Session
 from kink import inject
 
-from ..models import Task
-from ..protocols import TaskRepository
+from ..models import ArchivedTask, DueDateBucket, Task, TaskChange, TaskSummary
+from ..protocols import TaskRepository, IdRange
+from ..unit_of_work import commit, session_scope
+
+from .task_criteria import SORT_ID, TaskCriteria, TaskTable
 
 
 @inject(alias=TaskRepository)
-class SQLAlchemyTaskRepository:
+class SQLAlchemyTaskRepository(TaskCriteria):
     def __init__(self, db_session_context: Callable[[
     ], AbstractContextManager[Session]]) -> None:
         self._db_context = db_session_context
 
-    def _task_id_check(self, task_id: int) -> None:
-        if not isinstance(task_id, int):
-            raise ValueError("Task ID must be an integer.")
+    def _session(self) -> AbstractContextManager[Session]:
+        """Use the open unit of work's session, or a fresh one per call."""
+        return session_scope(self._db_context)
 
-        if task_id < 1:
-            raise ValueError("Task ID must be greater than 0.")
+    def _commit(self, db: Session) -> None:
+        commit(self._db_context, db)
 
-    def _task_type_check(self, task: Task) -> None:
-        if not isinstance(task, Task):
-            raise TypeError("`task` must be of type Task.")
+    def _execute_rowcount(self, statement) -> int:
+        with self._session() as db:
+            result = db.execute(
+                statement.execution_options(synchronize_session=False))
+            self._commit(db)
+            return result.rowcount
 
     def get(self, task_id: int) -> Optional[Task]:
         self._task_id_check(task_id)
 
-        with self._db_context() as db:
+        with self._session() as db:
             return db.get(Task, task_id)
 
-    def complete(self, task_id: int) -> None:
+    def complete(self, task_id: int) -> int:
+        """Mark a task complete with one UPDATE and return the row count."""
         self._task_id_check(task_id)
 
-        with self._db_context() as db:
-            task = db.get(Task, task_id)
-            if task:
-                task.completed = True
-                db.commit()
+        return self._execute_rowcount(
+            update(Task).where(Task.id == task_id).values(completed=True))
+
+    def complete_many(
+        self,
+        task_ids: Iterable[int] = (),
+        id_ranges: Iterable[IdRange] = (),
+        completed: Optional[bool] = None,
+        due_before: Optional[datetime] = None,
+        due_after: Optional[datetime] = None,
+    ) -> int:
+        criteria = self._selection_criteria(
+            task_ids, id_ranges, completed, due_before, due_after)
+
+        return self._execute_rowcount(
+            update(Task).where(*criteria).values(completed=True))
 
     def list(self) -> Sequence[Task]:
-        with self._db_context() as db:
+        with self._session() as db:
             return db.query(Task).all()
 
     def add(self, task: Task) -> int | None:
         self._task_type_check(task)
 
-        with self._db_context() as db:
+        with self._session() as db:
             db.add(task)
-            db.commit()
+            self._commit(db)
             return task.id
 
+    def add_many(
+        self,
+        rows: Iterable[Mapping[str, Any]],
+        batch_size: int = 10_000,
+    ) -> int:
+        """Insert task rows with executemany batches in one transaction."""
+        self._batch_size_check(batch_size)
+        count = 0
+        iterator = iter(rows)
+
+        with self._session() as db:
+            while batch := list(islice(iterator, batch_size)):
+                db.execute(insert(Task.__table__), batch)
+                count += len(batch)
+
+            self._commit(db)
+
+        return count
+
+    def export_rows(self, batch_size: int = 1_000) -> Iterator[dict[str, Any]]:
+        """Stream every task as a plain dict, ``batch_size`` rows at a time."""
+        self._batch_size_check(batch_size)
+        return self._iter_export_rows(batch_size)
+
+    def _iter_export_rows(self, batch_size: int) -> Iterator[dict[str, Any]]:
+        query = (
+            select(
+                Task.id,
+                Task.name,
+                Task.description,
+                Task.completed,
+                Task.due_date,
+            )
+            .order_by(Task.id)
+            .execution_options(yield_per=batch_size)
+        )
+
+        with self._session() as db:
+            for row in db.execute(query):
+                yield row._asdict()
+
     def delete(self, task: Task) -> None:
         self._task_type_check(task)
 
-        with self._db_context() as db:
+        with self._session() as db:
             db.delete(task)
-            db.commit()
+            self._commit(db)
+
+    def delete_by_id(self, task_id: int) -> int:
+        """Delete a task with one DELETE and return the row count."""
+        self._task_id_check(task_id)
+
+        return self._execute_rowcount(delete(Task).where(Task.id == task_id))
+
+    def delete_many(
+        self,
+        task_ids: Iterable[int] = (),
+        id_ranges: Iterable[IdRange] = (),
+        completed: Optional[bool] = None,
+        due_before: Optional[datetime] = None,
+        due_after: Optional[datetime] = None,
+    ) -> int:
+        criteria = self._selection_criteria(
+            task_ids, id_ranges, completed, due_before, due_after)
+
+        return self._execute_rowcount(delete(Task).where(*criteria))
 
     def update(self, task: Task) -> None:
         self._task_type_check(task)
 
-        with self._db_context() as db:
+        with self._session() as db:
             existing_task = db.get(Task, task.id)
 
             if existing_task is not None:
@@ -72,7 +153,23 @@ class SQLAlchemyTaskRepository:
                 existing_task.due_date = task.due_date
                 existing_task.description = task.description
 
-            db.commit()
+            self._commit(db)
+
+    def update_many(
+        self,
+        values: Mapping[str, Any],
+        task_ids: Iterable[int] = (),
+        id_ranges: Iterable[IdRange] = (),
+        completed: Optional[bool] = None,
+        due_before: Optional[datetime] = None,
+        due_after: Optional[datetime] = None,
+    ) -> int:
+        self._values_check(values)
+        criteria = self._selection_criteria(
+            task_ids, id_ranges, completed, due_before, due_after)
+
+        return self._execute_rowcount(
+            update(Task).where(*criteria).values(**values))
 
     def filter_by_status(
         self,
@@ -80,25 +177,208 @@ class SQLAlchemyTaskRepository:
         due_before: Optional[datetime] = None,
         due_after: Optional[datetime] = None,
     ) -> Sequence[Task]:
-        if completed is not None and not isinstance(completed, bool):
-            raise TypeError("`completed` must be a boolean or None.")
+        self._filter_type_check(completed, due_before, due_after)
 
-        if due_before is not None and not isinstance(due_before, datetime):
-            raise TypeError("`due_before` must be a datetime or None.")
+        with self._session() as db:
+            query = self._apply_filters(
+                db.query(Task), completed, due_before, due_after)
 
-        if due_after is not None and not isinstance(due_after, datetime):
-            raise TypeError("`due_after` must be a datetime or None.")
+            return query.all()
 
-        with self._db_context() as db:
-            query = db.query(Task)
+    def iter_tasks(
+        self,
+        after_id: int = 0,
+        page_size: int = 100,
+        completed: Optional[bool] = None,
+        due_before: Optional[datetime] = None,
+        due_after: Optional[datetime] = None,
+    ) -> Iterator[Task]:
+        """Yield tasks ordered by ID, fetching one keyset page per session."""
+        self._page_check(after_id, page_size)
+        self._filter_type_check(completed, due_before, due_after)
+
+        return self._iter_pages(
+            after_id, page_size, completed, due_before, due_after)
 
-            if completed is not None:
-                query = query.filter(Task.completed.is_(completed))
+    def _iter_pages(
+        self,
+        after_id: int,
+        page_size: int,
+        completed: Optional[bool],
+        due_before: Optional[datetime],
+        due_after: Optional[datetime],
+    ) -> Iterator[Task]:
+        while True:
+            with self._session() as db:
+                query = self._apply_filters(
+                    db.query(Task), completed, due_before, due_after)
 
-            if due_before is not None:
-                query = query.filter(Task.due_date < due_before)
+                page = (
+                    query.filter(Task.id > after_id)
+                    .order_by(Task.id)
+                    .limit(page_size)
+                    .all()
+                )
 
-            if due_after is not None:
-                query = query.filter(Task.due_date >= due_after)
+            yield from page
 
-            return query.all()
+            if len(page) < page_size:
+                return
+
+            after_id = page[-1].id
+
+    def iter_summaries(
+        self,
+        now: Optional[datetime] = None,
+        after_id: int = 0,
+        page_size: int = 100,
+        completed: Optional[bool] = None,
+        due_before: Optional[datetime] = None,
+        due_after: Optional[datetime] = None,
+        sort: str = SORT_ID,
+        include_archived: bool = False,
+    ) -> Iterator[TaskSummary]:
+        """Yield listing rows in ``sort`` order, with status computed in SQL.
+
+        ``include_archived`` merges in archived tasks, paged from their own
+        table in the same order.
+        """
+        now = datetime.now() if now is None else now
+        self._now_check(now)
+        self._page_check(after_id, page_size)
+        self._filter_type_check(completed, due_before, due_after)
+        self._sort_check(sort, after_id)
+
+        summaries = self._iter_summary_pages(
+            now, after_id, page_size, completed, due_before, due_after, sort)
+
+        # Archived tasks are all completed.
+        if include_archived and completed is not False:
+            archived = self._iter_summary_pages(
+                now, after_id, page_size, completed, due_before, due_after, sort,
+                ArchivedTask)
+            summaries = heapq.merge(
+                summaries, archived, key=lambda summary: self._keyset(sort, summary))
+
+        return summaries
+
+    def _iter_summary_pages(
+        self,
+        now: datetime,
+        after_id: int,
+        page_size: int,
+        completed: Optional[bool],
+        due_before: Optional[datetime],
+        due_after: Optional[datetime],
+        sort: str,
+        table: TaskTable = Task,
+    ) -> Iterator[TaskSummary]:
+        criteria = self._filter_criteria(completed, due_before, due_after, table)
+        after = (after_id, after_id) if after_id else None
+
+        while True:
+            with self._session() as db:
+                page = [
+                    TaskSummary._make(row) for row in db.execute(self._summary_page(
+                        now, page_size, criteria, sort, after, table))
+                ]
+
+            yield from page
+
+            if len(page) < page_size:
+                return
+
+            after = self._keyset(sort, page[-1])
+
+    def count_by_status(self, now: Optional[datetime] = None) -> dict[str, int]:
+        """Count completed, pending and overdue tasks in one query."""
+        now = datetime.now() if now is None else now
+        self._now_check(now)
+
+        with self._session() as db:
+            return db.execute(self._count_by_status_query(now)).one()._asdict()
+
+    def histogram_by_due_date(
+        self,
+        bucket: Literal["day", "week"] = "day",
+        now: Optional[datetime] = None,
+        due_before: Optional[datetime] = None,
+        due_after: Optional[datetime] = None,
+    ) -> Sequence[DueDateBucket]:
+        """Count tasks by status per due day or week with one GROUP BY."""
+        now = datetime.now() if now is None else now
+        self._bucket_check(bucket)
+        self._now_check(now)
+        self._filter_type_check(None, due_before, due_after)
+        query = self._histogram_query(bucket, now, due_before, due_after)
+
+        with self._session() as db:
+            return [
+                DueDateBucket(date.fromisoformat(start), *counts)
+                for start, *counts in db.execute(query)
+            ]
+
+    def search(
+        self,
+        query: str,
+        limit: int = 20,
+        prefix: bool = True,
+        now: Optional[datetime] = None,
+    ) -> Sequence[TaskSummary]:
+        """Full-text search names and descriptions, best matches first."""
+        now = datetime.now() if now is None else now
+        self._now_check(now)
+        statement = self._search_query(query, limit, prefix, now)
+
+        with self._session() as db:
+            return [TaskSummary._make(row) for row in db.execute(statement)]
+
+    def changes_since(self, seq: int = 0, limit: int = 1_000) -> Sequence[TaskChange]:
+        """Up to ``limit`` changes logged after ``seq``, oldest first."""
+        statement = self._changes_query(seq, limit)
+
+        with self._session() as db:
+            return [TaskChange._make(row) for row in db.execute(statement)]
+
+    def change_cursor(self) -> int:
+        """The ``seq`` of the latest change, or 0 if nothing has changed."""
+        with self._session() as db:
+            return db.execute(self._change_cursor_query()).scalar_one()
+
+    def archive_completed(
+        self,
+        completed_before: datetime,
+        batch_size: int = 1_000,
+    ) -> int:
+        """Move tasks completed before the cutoff into ``tasks_archive``.
+
+        Each batch is copied and deleted in its own transaction, so writers
+        are never locked out for long. Returns the number of tasks moved.
+        """
+        if not isinstance(completed_before, datetime):
+            raise TypeError("`completed_before` must be a datetime.")
+
+        self._batch_size_check(batch_size)
+        columns = [
+            "id", "name", "description", "completed", "due_date", "completed_at", "uid"]
+        archived = 0
+
+        while True:
+            with self._session() as db:
+                task_ids = db.scalars(
+                    self._archivable_ids(completed_before, batch_size)).all()
+
+                if task_ids:
+                    rows = select(
+                        *(getattr(Task, column) for column in columns),
+                        literal(datetime.now()),
+                    ).where(Task.id.in_(task_ids))
+                    db.execute(insert(ArchivedTask).from_select(
+                        [*columns, "archived_at"], rows))
+                    db.execute(delete(Task).where(Task.id.in_(task_ids)))
+                    self._commit(db)
+
+            archived += len(task_ids)
+
+            if len(task_ids) < batch_size:
+                return archived
@@ -0,0 +1,362 @@
+from typing import Any, Iterable, Mapping, Optional, Union
+from datetime import datetime
+
+from sqlalchemy import ColumnElement, and_, case, func, or_, select
+from sqlalchemy.orm import Query
+from sqlalchemy.sql import Select
+
+from ..changes import CHANGE_DELETE
+from ..models import ArchivedTask, RecurrenceRule, Task, TaskChangeRecord, TaskSummary
+from ..protocols import IdRange
+from ..search import TASK_SEARCH_TABLE, match_expression
+
+UPDATABLE_FIELDS = frozenset({"name", "description", "completed", "due_date"})
+
+STATUS_COMPLETED = "completed"
+STATUS_PENDING = "pending"
+STATUS_OVERDUE = "overdue"
+STATUSES = (STATUS_COMPLETED, STATUS_PENDING, STATUS_OVERDUE)
+
+HISTOGRAM_BUCKETS = ("day", "week")
+
+SORT_ID = "id"
+SORT_DUE = "due"
+SORT_NAME = "name"
+
+# The summary field each listing sort orders by; ties are broken by ID.
+SORT_FIELDS = {SORT_ID: "id", SORT_DUE: "due_date", SORT_NAME: "name"}
+
+# ``(sort value, id)`` of the last row of the previous page.
+Keyset = tuple[Any, int]
+
+# Listings read the same columns from live and archived tasks.
+TaskTable = Union[type[Task], type[ArchivedTask]]
+
+
+class TaskCriteria:
+    """Argument checks and WHERE clauses shared by the SQLAlchemy repositories."""
+
+    def _task_id_check(self, task_id: int) -> None:
+        if not isinstance(task_id, int):
+            raise ValueError("Task ID must be an integer.")
+
+        if task_id < 1:
+            raise ValueError("Task ID must be greater than 0.")
+
+    def _task_type_check(self, task: Task) -> None:
+        if not isinstance(task, Task):
+            raise TypeError("`task` must be of type Task.")
+
+    def _filter_type_check(
+        self,
+        completed: Optional[bool],
+        due_before: Optional[datetime],
+        due_after: Optional[datetime],
+    ) -> None:
+        if completed is not None and not isinstance(completed, bool):
+            raise TypeError("`completed` must be a boolean or None.")
+
+        if due_before is not None and not isinstance(due_before, datetime):
+            raise TypeError("`due_before` must be a datetime or None.")
+
+        if due_after is not None and not isinstance(due_after, datetime):
+            raise TypeError("`due_after` must be a datetime or None.")
+
+    def _page_check(self, after_id: int, page_size: int) -> None:
+        if not isinstance(after_id, int) or after_id < 0:
+            raise ValueError("`after_id` must be a non-negative integer.")
+
+        if not isinstance(page_size, int) or page_size < 1:
+            raise ValueError("`page_size` must be a positive integer.")
+
+    def _batch_size_check(self, batch_size: int) -> None:
+        if not isinstance(batch_size, int) or batch_size < 1:
+            raise ValueError("`batch_size` must be a positive integer.")
+
+    def _id_range_check(self, id_range: IdRange) -> None:
+        start, end = id_range
+        self._task_id_check(start)
+
+        if end is not None:
+            self._task_id_check(end)
+
+            if end < start:
+                raise ValueError("ID range end must not be before its start.")
+
+    def _filter_criteria(
+        self,
+        completed: Optional[bool],
+        due_before: Optional[datetime],
+        due_after: Optional[datetime],
+        table: TaskTable = Task,
+    ) -> list[ColumnElement[bool]]:
+        criteria = []
+
+        if completed is not None:
+            criteria.append(table.completed.is_(completed))
+
+        if due_before is not None:
+            criteria.append(table.due_date < due_before)
+
+        if due_after is not None:
+            criteria.append(table.due_date >= due_after)
+
+        return criteria
+
+    def _now_check(self, now: datetime) -> None:
+        if not isinstance(now, datetime):
+            raise TypeError("`now` must be a datetime.")
+
+    def _status_expression(
+        self,
+        now: datetime,
+        table: TaskTable = Task,
+    ) -> ColumnElement[str]:
+        """Label each row completed, pending or overdue relative to ``now``."""
+        return case(
+            (table.completed.is_(True), STATUS_COMPLETED),
+            (table.due_date >= now, STATUS_PENDING),
+            else_=STATUS_OVERDUE,
+        )
+
+    def _bucket_check(self, bucket: str) -> None:
+        if bucket not in HISTOGRAM_BUCKETS:
+            raise ValueError(
+                f"`bucket` must be one of: {', '.join(HISTOGRAM_BUCKETS)}.")
+
+    def _status_counts(self, now: datetime) -> list[ColumnElement[int]]:
+        """One COUNT column per status, so a single scan fills them all."""
+        status = self._status_expression(now)
+        return [
+            func.count(case((status == name, 1))).label(name)
+            for name in STATUSES
+        ]
+
+    def _count_by_status_query(self, now: datetime) -> Select:
+        return select(*self._status_counts(now))
+
+    def _histogram_query(
+        self,
+        bucket: str,
+        now: datetime,
+        due_before: Optional[datetime],
+        due_after: Optional[datetime],
+    ) -> Select:
+        # SQLite date modifiers: 'weekday 0' moves to the coming Sunday, so
+        # stepping back six days lands on the Monday that starts the week.
+        start = (
+            func.date(Task.due_date) if bucket == "day"
+            else func.date(Task.due_date, "weekday 0", "-6 days")
+        ).label("start")
+
+        return (
+            select(start, *self._status_counts(now))
+            .where(*self._filter_criteria(None, due_before, due_after))
+            .group_by(start)
+            .order_by(start)
+        )
+
+    def _sort_check(self, sort: str, after_id: int) -> None:
+        if sort not in SORT_FIELDS:
+            raise ValueError(f"`sort` must be one of: {', '.join(SORT_FIELDS)}.")
+
+        if after_id and sort != SORT_ID:
+            raise ValueError("`after_id` only applies when sorting by id.")
+
+    def _keyset(self, sort: str, summary: TaskSummary) -> Keyset:
+        return getattr(summary, SORT_FIELDS[sort]), summary.id
+
+    def _summary_page(
+        self,
+        now: datetime,
+        page_size: int,
+        criteria: list[ColumnElement[bool]],
+        sort: str = SORT_ID,
+        after: Optional[Keyset] = None,
+        table: TaskTable = Task,
+    ) -> Select:
+        """One page in ``(sort column, id)`` order, starting after ``after``.
+
+        The sort column is indexed, so ORDER BY walks the index and LIMIT
+        stops the scan after one page instead of sorting every match.
+        """
+        column = getattr(table, SORT_FIELDS[sort])
+        order = [table.id] if sort == SORT_ID else [column, table.id]
+        keyset = []
+
+        if after is not None and sort == SORT_ID:
+            keyset = [table.id > after[1]]
+        elif after is not None:
+            value, last_id = after
+            # The >= bound lets SQLite start the index scan at ``value``.
+            keyset = [column >= value, or_(column > value, table.id > last_id)]
+
+        return (
+            select(
+                table.id,
+                table.name,
+                table.due_date,
+                table.description,
+                self._status_expression(now, table).label("status"),
+            )
+            .where(*criteria, *keyset)
+            .order_by(*order)
+            .limit(page_size)
+        )
+
+    def _limit_check(self, limit: int) -> None:
+        if not isinstance(limit, int) or limit < 1:
+            raise ValueError("`limit` must be a positive integer.")
+
+    def _search_check(self, query: str, limit: int) -> None:
+        if not isinstance(query, str):
+            raise TypeError("`query` must be a string.")
+
+        self._limit_check(limit)
+
+    def _search_query(
+        self,
+        query: str,
+        limit: int,
+        prefix: bool,
+        now: datetime,
+    ) -> Select:
+        """Best-ranked tasks whose name or description match every word."""
+        self._search_check(query, limit)
+        search = TASK_SEARCH_TABLE
+
+        return (
+            select(
+                Task.id,
+                Task.name,
+                Task.due_date,
+                Task.description,
+                self._status_expression(now).label("status"),
+            )
+            .join_from(search, Task, Task.id == search.c.rowid)
+            .where(search.c.tasks_fts.op("MATCH")(match_expression(query, prefix)))
+            .order_by(search.c.rank)
+            .limit(limit)
+        )
+
+    def _archivable_ids(self, completed_before: datetime, batch_size: int) -> Select:
+        """Up to ``batch_size`` IDs of tasks completed before the cutoff.
+
+        Tasks with recurrence rules stay, since they anchor the rules.
+        """
+        has_rule = select(RecurrenceRule.id).where(RecurrenceRule.task_id == Task.id)
+
+        return (
+            select(Task.id)
+            .where(
+                Task.completed.is_(True),
+                Task.completed_at < completed_before,
+                ~has_rule.exists(),
+            )
+            .limit(batch_size)
+        )
+
+    def _cursor_check(self, seq: int, limit: int) -> None:
+        if not isinstance(seq, int) or seq < 0:
+            raise ValueError("`seq` must be a non-negative integer.")
+
+        self._limit_check(limit)
+
+    def _changes_query(self, seq: int, limit: int) -> Select:
+        """Changes after ``seq``, oldest first, each with its task's row.
+
+        A range scan of the ``seq`` primary key, so the cost depends on the
+        number of changes rather than the number of tasks.
+        """
+        self._cursor_check(seq, limit)
+        change = TaskChangeRecord
+
+        return (
+            select(
+                change.seq,
+                change.kind,
+                change.task_id,
+                change.changed_at,
+                Task.name,
+                Task.description,
+                Task.completed,
+                Task.due_date,
+            )
+            .outerjoin(Task, and_(
+                Task.id == change.task_id, change.kind != CHANGE_DELETE))
+            .where(change.seq > seq)
+            .order_by(change.seq)
+            .limit(limit)
+        )
+
+    def _change_cursor_query(self) -> Select:
+        return select(func.coalesce(func.max(TaskChangeRecord.seq), 0))
+
+    def _apply_filters(
+        self,
+        query: Query,
+        completed: Optional[bool],
+        due_before: Optional[datetime],
+        due_after: Optional[datetime],
+    ) -> Query:
+        return query.filter(
+            *self._filter_criteria(completed, due_before, due_after))
+
+    def _selection_check(
+        self,
+        task_ids: Iterable[int],
+        id_ranges: Iterable[IdRange],
+        completed: Optional[bool],
+        due_before: Optional[datetime],
+        due_after: Optional[datetime],
+    ) -> tuple[list[int], list[IdRange]]:
+        task_ids = list(task_ids)
+        id_ranges = list(id_ranges)
+
+        for task_id in task_ids:
+            self._task_id_check(task_id)
+
+        for id_range in id_ranges:
+            self._id_range_check(id_range)
+
+        self._filter_type_check(completed, due_before, due_after)
+
+        if not (task_ids or id_ranges) and (
+                completed, due_before, due_after) == (None, None, None):
+            raise ValueError("Select tasks by ID, ID range or filter.")
+
+        return task_ids, id_ranges
+
+    def _selection_criteria(
+        self,
+        task_ids: Iterable[int],
+        id_ranges: Iterable[IdRange],
+        completed: Optional[bool],
+        due_before: Optional[datetime],
+        due_after: Optional[datetime],
+    ) -> list[ColumnElement[bool]]:
+        """Build a WHERE clause: any of the IDs/ranges, and all filters."""
+        task_ids, id_ranges = self._selection_check(
+            task_ids, id_ranges, completed, due_before, due_after)
+        criteria = self._filter_criteria(completed, due_before, due_after)
+        id_criteria = []
+
+        if task_ids:
+            id_criteria.append(Task.id.in_(task_ids))
+
+        for start, end in id_ranges:
+            id_criteria.append(
+                Task.id >= start if end is None else Task.id.between(start, end))
+
+        if id_criteria:
+            criteria.append(or_(*id_criteria))
+
+        return criteria
+
+    def _values_check(self, values: Mapping[str, Any]) -> None:
+        if not values:
+            raise ValueError("`values` must name at least one field.")
+
+        unknown = set(values) - UPDATABLE_FIELDS
+        if unknown:
+            raise ValueError(f"Cannot update fields: {', '.join(sorted(unknown))}.")
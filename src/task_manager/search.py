@@ -0,0 +1,90 @@
+import re
+
+from sqlalchemy import Column, Integer, MetaData, Table, Text, text
+from sqlalchemy.engine import Connection
+
+SEARCH_METADATA = MetaData()
+
+# External-content FTS5 index over tasks.name and tasks.description. Only the
+# index lives here; the text itself stays in ``tasks``. It is never created
+# from this Table object: see ``create_search_index``.
+TASK_SEARCH_TABLE = Table(
+    "tasks_fts",
+    SEARCH_METADATA,
+    Column("rowid", Integer),
+    Column("name", Text),
+    Column("description", Text),
+    Column("tasks_fts", Text),
+    Column("rank", Text),
+)
+
+SEARCH_DDL = (
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5(
+        name, description,
+        content='tasks', content_rowid='id', prefix='2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_fts_insert AFTER INSERT ON tasks BEGIN
+        INSERT INTO tasks_fts(rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_fts_delete AFTER DELETE ON tasks BEGIN
+        INSERT INTO tasks_fts(tasks_fts, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_fts_update
+    AFTER UPDATE OF name, description ON tasks BEGIN
+        INSERT INTO tasks_fts(tasks_fts, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+        INSERT INTO tasks_fts(rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END
+    """,
+)
+
+_WORD = re.compile(r"\w+")
+
+
+def create_search_index(connection: Connection) -> None:
+    """Create the FTS5 table and its triggers, then index existing rows."""
+    exists = connection.execute(text(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'tasks_fts'"
+    )).first()
+
+    for statement in SEARCH_DDL:
+        connection.execute(text(statement))
+
+    if exists is None:
+        connection.execute(
+            text("INSERT INTO tasks_fts(tasks_fts) VALUES ('rebuild')"))
+
+
+def search_words(value: str) -> list[str]:
+    """Split text into case-folded words, roughly as FTS5's tokenizer does."""
+    return _WORD.findall(value.casefold())
+
+
+def search_terms(query: str) -> list[str]:
+    words = search_words(query)
+
+    if not words:
+        raise ValueError("Search query must contain at least one word.")
+
+    return words
+
+
+def match_expression(query: str, prefix: bool = True) -> str:
+    """Turn free text into an FTS5 query that matches every word.
+
+    Words are quoted so FTS5 operators and punctuation in user input are
+    searched for literally instead of being parsed.
+    """
+    words = search_terms(query)
+    suffix = "*" if prefix else ""
+    return " ".join(f'"{word}"{suffix}' for word in words)
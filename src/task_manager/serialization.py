@@ -0,0 +1,194 @@
+import csv
+import json
+from enum import Enum
+from pathlib import Path
+from datetime import datetime
+from typing import Any, Iterable, Iterator, Mapping, Sequence, TextIO
+
+TASK_FIELDS = ("id", "name", "description", "completed", "due_date")
+
+TRUE_VALUES = {"1", "true", "yes", "y", "t"}
+FALSE_VALUES = {"", "0", "false", "no", "n", "f"}
+
+
+class TaskFormat(str, Enum):
+    csv = "csv"
+    jsonl = "jsonl"
+
+
+class OutputFormat(str, Enum):
+    table = "table"
+    json = "json"
+    jsonl = "jsonl"
+    csv = "csv"
+    tsv = "tsv"
+
+
+def detect_format(path: Path, default: TaskFormat = TaskFormat.jsonl) -> TaskFormat:
+    try:
+        return TaskFormat(path.suffix.lstrip(".").lower())
+    except ValueError:
+        return default
+
+
+def _parse_bool(value: Any) -> bool:
+    if isinstance(value, bool):
+        return value
+
+    text = str(value).strip().lower()
+
+    if text in TRUE_VALUES:
+        return True
+
+    if text in FALSE_VALUES:
+        return False
+
+    raise ValueError(f"`completed` must be a boolean, got {value!r}.")
+
+
+def _parse_datetime(value: Any) -> datetime:
+    if isinstance(value, datetime):
+        return value
+
+    if not isinstance(value, str) or not value.strip():
+        raise ValueError("`due_date` is required.")
+
+    return datetime.fromisoformat(value.strip())
+
+
+def parse_task_row(raw: Mapping[str, Any]) -> dict[str, Any]:
+    """Turn a decoded CSV or JSON record into insertable task values.
+
+    IDs in the input are ignored so imported tasks never collide with
+    existing ones.
+    """
+    if not isinstance(raw, Mapping):
+        raise TypeError("each record must be an object.")
+
+    name = raw.get("name")
+
+    if not isinstance(name, str) or not name.strip():
+        raise ValueError("`name` is required.")
+
+    return {
+        "name": name,
+        "description": raw.get("description") or None,
+        "completed": _parse_bool(raw.get("completed", False)),
+        "due_date": _parse_datetime(raw.get("due_date")),
+    }
+
+
+def _decode(stream: TextIO, fmt: TaskFormat) -> Iterator[tuple[int, Mapping[str, Any]]]:
+    if fmt == TaskFormat.csv:
+        reader = csv.DictReader(stream)
+
+        for record in reader:
+            yield reader.line_num, record
+        return
+
+    for line_number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as exc:
+            raise ValueError(
+                f"Line {line_number}: invalid JSON ({exc.msg}).") from exc
+
+        yield line_number, record
+
+
+def read_tasks(stream: TextIO, fmt: TaskFormat) -> Iterator[dict[str, Any]]:
+    """Lazily decode and validate task rows from ``stream``."""
+    for line_number, record in _decode(stream, fmt):
+        try:
+            yield parse_task_row(record)
+        except (TypeError, ValueError) as exc:
+            raise ValueError(f"Line {line_number}: {exc}") from exc
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+
+    return value
+
+
+def write_tasks(
+    rows: Iterable[Mapping[str, Any]],
+    stream: TextIO,
+    fmt: TaskFormat,
+) -> int:
+    """Write rows one at a time and return how many were written."""
+    count = 0
+
+    if fmt == TaskFormat.csv:
+        writer = csv.DictWriter(stream, fieldnames=TASK_FIELDS)
+        writer.writeheader()
+
+        for row in rows:
+            writer.writerow({
+                field: _encode_value(row[field]) for field in TASK_FIELDS
+            })
+            count += 1
+
+        return count
+
+    for row in rows:
+        stream.write(json.dumps({
+            field: _encode_value(row[field]) for field in TASK_FIELDS
+        }))
+        stream.write("\n")
+        count += 1
+
+    return count
+
+
+def write_records(
+    records: Iterable[Sequence[Any]],
+    fields: Sequence[str],
+    stream: TextIO,
+    fmt: OutputFormat,
+) -> int:
+    """Encode tuples in ``fields`` order one at a time; return the count.
+
+    Nothing is buffered beyond the current record, so output starts with
+    the first row and memory stays flat however many rows there are.
+    """
+    if fmt == OutputFormat.table:
+        raise ValueError("Tables are rendered by the CLI, not encoded here.")
+
+    count = 0
+
+    if fmt in (OutputFormat.csv, OutputFormat.tsv):
+        writer = csv.writer(
+            stream, dialect="excel-tab" if fmt == OutputFormat.tsv else "excel")
+        writer.writerow(fields)
+
+        for record in records:
+            writer.writerow([_encode_value(value) for value in record])
+            count += 1
+
+        return count
+
+    separator = "\n"
+
+    if fmt == OutputFormat.json:
+        stream.write("[")
+        separator = ",\n"
+
+    for record in records:
+        if count:
+            stream.write(separator)
+
+        stream.write(json.dumps(
+            dict(zip(fields, map(_encode_value, record)))))
+        count += 1
+
+    if fmt == OutputFormat.json:
+        stream.write("]\n")
+    elif count:
+        stream.write("\n")
+
+    return count
@@ -0,0 +1,355 @@
+"""Two-way sync of tasks between SQLite databases.
+
+Task IDs are local to each database. A task is identified across databases
+by its ``uid`` instead. Triggers bump its ``version`` and ``updated_at`` on
+every edit. Each database also keeps a change log (see ``changes``).
+
+``sync`` reads both change logs from where the last sync with that peer
+left off, so it only looks at tasks changed since then. Those are copied
+over in batches. A task changed on both sides is a conflict, settled by
+the policy:
+
+- ``newer``: the later edit wins. This compares ``updated_at`` across
+  machines, so it relies on their clocks.
+- ``local``: this database always wins.
+- ``remote``: the peer always wins.
+"""
+
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Iterable, Iterator, Mapping, NamedTuple, Optional
+
+from sqlalchemy import bindparam, delete, func, inspect, insert, select, text, update
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session, sessionmaker
+
+from .archive import ARCHIVED_DELETE_CONDITION
+from .changes import CHANGE_DELETE, CHANGE_INSERT, CHANGE_UPDATE, LOCAL_NOW
+from .config import SYNC_POLICIES
+from .models import ArchivedTask, SyncPeer, Task, TaskChangeRecord
+from .unit_of_work import SessionContext, commit, session_scope
+
+DATA_COLUMNS = ("name", "description", "completed", "due_date")
+
+SYNC_TRIGGERS = (
+    f"""
+    CREATE TRIGGER IF NOT EXISTS tasks_sync_insert AFTER INSERT ON tasks
+    WHEN new.uid IS NULL OR new.updated_at IS NULL BEGIN
+        UPDATE tasks SET
+            uid = coalesce(new.uid, lower(hex(randomblob(16)))),
+            updated_at = coalesce(new.updated_at, {LOCAL_NOW})
+        WHERE id = new.id;
+    END
+    """,
+    # ``sync`` sets the version it copies, which leaves it alone here.
+    f"""
+    CREATE TRIGGER IF NOT EXISTS tasks_sync_update
+    AFTER UPDATE OF name, description, completed, due_date ON tasks
+    WHEN new.version IS old.version AND (
+        old.name IS NOT new.name
+        OR old.description IS NOT new.description
+        OR old.completed IS NOT new.completed
+        OR old.due_date IS NOT new.due_date
+    ) BEGIN
+        UPDATE tasks SET version = old.version + 1, updated_at = {LOCAL_NOW}
+        WHERE id = new.id;
+    END
+    """,
+    # Deletes now record the uid, the only trace of the task that is left.
+    "DROP TRIGGER IF EXISTS task_changes_delete",
+    f"""
+    CREATE TRIGGER task_changes_delete AFTER DELETE ON tasks
+    WHEN {ARCHIVED_DELETE_CONDITION} BEGIN
+        INSERT INTO task_changes (task_id, kind, changed_at, task_uid)
+        VALUES (old.id, '{CHANGE_DELETE}', {LOCAL_NOW}, old.uid);
+    END
+    """,
+)
+
+
+def _add_columns(connection: Connection, table: str, columns: dict[str, str]) -> None:
+    existing = {column["name"] for column in inspect(connection).get_columns(table)}
+
+    for name, definition in columns.items():
+        if name not in existing:
+            connection.execute(text(f"ALTER TABLE {table} ADD COLUMN {name} {definition}"))
+
+
+def create_sync_schema(connection: Connection) -> None:
+    """Add task uids and versions, the sync peer table and their triggers."""
+    _add_columns(connection, "tasks", {
+        "uid": "VARCHAR(32)",
+        "version": "INTEGER NOT NULL DEFAULT 1",
+        "updated_at": "DATETIME",
+    })
+    _add_columns(connection, "task_changes", {"task_uid": "VARCHAR(32)"})
+    _add_columns(connection, "tasks_archive", {"uid": "VARCHAR(32)"})
+
+    connection.execute(text(
+        "UPDATE tasks SET uid = lower(hex(randomblob(16))) WHERE uid IS NULL"))
+    connection.execute(text(
+        f"UPDATE tasks SET updated_at = {LOCAL_NOW} WHERE updated_at IS NULL"))
+
+    for table in (Task.__table__, ArchivedTask.__table__):
+        for index in table.indexes:
+            if "uid" in index.columns:
+                index.create(connection, checkfirst=True)
+
+    SyncPeer.__table__.create(connection, checkfirst=True)
+
+    for statement in SYNC_TRIGGERS:
+        connection.execute(text(statement))
+
+
+class TaskVersion(NamedTuple):
+    """A task as one database has it, or a tombstone if it was deleted."""
+
+    uid: str
+    name: Optional[str]
+    description: Optional[str]
+    completed: Optional[bool]
+    due_date: Optional[datetime]
+    version: int
+    updated_at: datetime
+    deleted: bool = False
+
+    def same_as(self, other: "TaskVersion") -> bool:
+        if self.deleted or other.deleted:
+            return self.deleted and other.deleted
+
+        return all(getattr(self, c) == getattr(other, c) for c in DATA_COLUMNS)
+
+
+@dataclass
+class SyncStats:
+    pushed: int = 0
+    pulled: int = 0
+    conflicts: int = 0
+
+
+def _batches(items: list, size: int) -> Iterable[list]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _change_cursor(db: Session) -> int:
+    return db.scalar(select(func.coalesce(func.max(TaskChangeRecord.seq), 0)))
+
+
+def _changed_tasks(
+    db: Session,
+    since: Optional[int],
+    batch_size: int,
+) -> dict[str, TaskVersion]:
+    """The current version of each task changed after change ``since``.
+
+    With no cursor (a first sync with this peer), every task counts.
+    Archiving is local housekeeping and is not passed on.
+    """
+    tombstones: dict[str, TaskVersion] = {}
+
+    if since is None:
+        task_ids = list(db.scalars(select(Task.id)))
+    else:
+        after = TaskChangeRecord.seq > since
+        task_ids = list(db.scalars(
+            select(TaskChangeRecord.task_id).distinct().where(
+                after, TaskChangeRecord.kind.in_((CHANGE_INSERT, CHANGE_UPDATE)))))
+
+        for uid, deleted_at in db.execute(
+            select(TaskChangeRecord.task_uid, func.max(TaskChangeRecord.changed_at))
+            .where(after, TaskChangeRecord.kind == CHANGE_DELETE,
+                   TaskChangeRecord.task_uid.is_not(None))
+            .group_by(TaskChangeRecord.task_uid)
+        ):
+            tombstones[uid] = TaskVersion(
+                uid, None, None, None, None, 0, deleted_at, deleted=True)
+
+    changed = dict(tombstones)
+    columns = [getattr(Task, field) for field in TaskVersion._fields[:-1]]
+
+    # Tasks deleted since they changed have no row; their tombstone stays.
+    for batch in _batches(task_ids, batch_size):
+        for row in db.execute(select(*columns).where(Task.id.in_(batch))):
+            changed[row.uid] = TaskVersion(*row)
+
+    return changed
+
+
+def _pick(local: TaskVersion, remote: TaskVersion, policy: str) -> TaskVersion:
+    if policy == "local":
+        return local
+
+    if policy == "remote":
+        return remote
+
+    # A tie goes to the higher version, then to this database.
+    if (remote.updated_at, remote.version) > (local.updated_at, local.version):
+        return remote
+
+    return local
+
+
+def _apply(db: Session, versions: list[TaskVersion], batch_size: int) -> int:
+    """Write ``versions`` into a database; returns the number of tasks changed."""
+    changed = 0
+
+    for batch in _batches(versions, batch_size):
+        uids = [version.uid for version in batch]
+        existing = set(db.scalars(select(Task.uid).where(Task.uid.in_(uids))))
+        # A task archived here stays archived.
+        archived = set(db.scalars(
+            select(ArchivedTask.uid).where(ArchivedTask.uid.in_(uids))))
+
+        deletes = [v.uid for v in batch if v.deleted and v.uid in existing]
+        updates = [
+            {f"b_{field}": getattr(v, field) for field in TaskVersion._fields[:-1]}
+            for v in batch if not v.deleted and v.uid in existing
+        ]
+        inserts = [
+            {field: getattr(v, field) for field in TaskVersion._fields[:-1]}
+            for v in batch
+            if not v.deleted and v.uid not in existing and v.uid not in archived
+        ]
+
+        if deletes:
+            db.execute(delete(Task).where(Task.uid.in_(deletes)))
+
+        if updates:
+            db.execute(
+                update(Task.__table__)
+                .where(Task.uid == bindparam("b_uid"))
+                .values({
+                    field: bindparam(f"b_{field}")
+                    for field in (*DATA_COLUMNS, "version", "updated_at")
+                }),
+                updates,
+            )
+
+        if inserts:
+            db.execute(insert(Task.__table__), inserts)
+
+        changed += len(deletes) + len(updates) + len(inserts)
+
+    return changed
+
+
+def _set_versions(db: Session, versions: list[TaskVersion]) -> None:
+    """Give the winning side of a conflict the version both sides now share."""
+    rows = [{"b_uid": v.uid, "b_version": v.version} for v in versions if not v.deleted]
+
+    if rows:
+        db.execute(
+            update(Task.__table__)
+            .where(Task.uid == bindparam("b_uid"))
+            .values(version=bindparam("b_version")),
+            rows,
+        )
+
+
+def sync(
+    local_context: SessionContext,
+    remote_context: SessionContext,
+    peer: str,
+    policy: str = "newer",
+    batch_size: int = 500,
+) -> SyncStats:
+    """Bring two task databases up to date with each other.
+
+    ``peer`` names the remote database (its URL, say); the local database
+    remembers how far it has synced with each peer. The remote commits
+    first. If the local commit then fails, the next sync finds the same
+    changes again and copying them a second time changes nothing.
+    """
+    if policy not in SYNC_POLICIES:
+        choices = ", ".join(SYNC_POLICIES)
+        raise ValueError(f"Unknown conflict policy {policy!r}; use one of {choices}.")
+
+    if not isinstance(batch_size, int) or batch_size < 1:
+        raise ValueError("`batch_size` must be a positive integer.")
+
+    stats = SyncStats()
+
+    with session_scope(local_context) as local_db, \
+            session_scope(remote_context) as remote_db:
+        state = local_db.get(SyncPeer, peer)
+        local_since = remote_since = None
+
+        # A peer whose change log went backwards was recreated: start over.
+        if state is not None and state.remote_seq <= _change_cursor(remote_db):
+            local_since, remote_since = state.local_seq, state.remote_seq
+
+        ours = _changed_tasks(local_db, local_since, batch_size)
+        theirs = _changed_tasks(remote_db, remote_since, batch_size)
+        push: list[TaskVersion] = []
+        pull: list[TaskVersion] = []
+        local_wins: list[TaskVersion] = []
+        remote_wins: list[TaskVersion] = []
+
+        for uid in sorted(ours.keys() | theirs.keys()):
+            local, remote = ours.get(uid), theirs.get(uid)
+
+            if remote is None:
+                push.append(local)
+            elif local is None:
+                pull.append(remote)
+            elif not local.same_as(remote):
+                stats.conflicts += 1
+                chosen = _pick(local, remote, policy)
+                winner = chosen._replace(version=max(local.version, remote.version) + 1)
+
+                if chosen is local:
+                    push.append(winner)
+                    local_wins.append(winner)
+                else:
+                    pull.append(winner)
+                    remote_wins.append(winner)
+
+        stats.pushed = _apply(remote_db, push, batch_size)
+        stats.pulled = _apply(local_db, pull, batch_size)
+        _set_versions(local_db, local_wins)
+        _set_versions(remote_db, remote_wins)
+
+        # Our own writes are already in sync, so the cursors skip past them.
+        local_db.merge(SyncPeer(
+            peer=peer,
+            local_seq=_change_cursor(local_db),
+            remote_seq=_change_cursor(remote_db),
+            synced_at=datetime.now(),
+        ))
+        commit(remote_context, remote_db)
+        commit(local_context, local_db)
+
+    return stats
+
+
+@contextmanager
+def open_peer(
+    db_url: str,
+    pragmas: Optional[Mapping[str, str]] = None,
+) -> Iterator[SessionContext]:
+    """Connect to the database at ``db_url``, creating its schema if needed."""
+    # Imported here: migrations import this module for ``create_sync_schema``.
+    from .database import BASE, create_database_engine
+    from .migrations import migrate
+
+    engine = create_database_engine(db_url, pragmas)
+
+    try:
+        BASE.metadata.create_all(bind=engine)
+        migrate(engine)
+        session_local = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+        @contextmanager
+        def get_db():
+            db = session_local()
+
+            try:
+                yield db
+            finally:
+                db.close()
+
+        yield get_db
+    finally:
+        engine.dispose()
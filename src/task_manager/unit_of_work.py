@@ -0,0 +1,90 @@
+"""Session-per-block units of work for the SQLAlchemy repository.
+
+By default every ``SQLAlchemyTaskRepository`` method opens, commits and
+closes its own session. Inside ``unit_of_work()`` they all share one
+session and one transaction instead: repository writes only flush, and the
+block commits once on the way out (or rolls back if it raises). Objects
+returned by ``get`` stay attached, so changes made to them are saved too.
+
+The ambient session lives in a ``ContextVar``, so threads (such as the
+daemon's request handlers) each see their own.
+"""
+
+from contextvars import ContextVar
+from contextlib import contextmanager
+from typing import Callable, ContextManager, Iterator, Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from sqlalchemy.orm import Session
+
+SessionContext = Callable[[], ContextManager["Session"]]
+
+# (session factory, session) for the innermost open unit of work.
+_AMBIENT: ContextVar[Optional[tuple[SessionContext, "Session"]]] = ContextVar(
+    "task_manager_unit_of_work", default=None)
+
+
+def ambient_session(db_session_context: SessionContext) -> Optional["Session"]:
+    """Return the open unit of work's session if it came from this factory."""
+    ambient = _AMBIENT.get()
+
+    if ambient is None or ambient[0] is not db_session_context:
+        return None
+
+    return ambient[1]
+
+
+@contextmanager
+def session_scope(db_session_context: SessionContext) -> Iterator["Session"]:
+    """Use the open unit of work's session, or a fresh one for this call."""
+    session = ambient_session(db_session_context)
+
+    if session is not None:
+        yield session
+        return
+
+    with db_session_context() as session:
+        yield session
+
+
+def commit(db_session_context: SessionContext, session: "Session") -> None:
+    # A unit of work commits once at the end; until then just flush so
+    # generated IDs and later queries see the changes.
+    if session is ambient_session(db_session_context):
+        session.flush()
+    else:
+        session.commit()
+
+
+@contextmanager
+def unit_of_work(
+    db_session_context: Optional[SessionContext] = None,
+) -> Iterator["Session"]:
+    """Run every repository call in the block in one session and transaction.
+
+    ``db_session_context`` defaults to the one registered in ``di``. Nested
+    blocks on the same factory join the outer unit of work.
+    """
+    if db_session_context is None:
+        from kink import di
+        db_session_context = di["db_session_context"]
+
+    session = ambient_session(db_session_context)
+
+    if session is not None:
+        yield session
+        return
+
+    with db_session_context() as session:
+        # Keep returned objects readable after the block has committed.
+        session.expire_on_commit = False
+        token = _AMBIENT.set((db_session_context, session))
+
+        try:
+            yield session
+            session.commit()
+        except BaseException:
+            session.rollback()
+            raise
+        finally:
+            _AMBIENT.reset(token)
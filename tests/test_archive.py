@@ -0,0 +1,159 @@
+# pylint: disable=redefined-outer-name
+# pylint: disable=unused-argument
+# pylint: disable=unused-import
+# pylint: disable=wrong-import-order
+
+from datetime import datetime, timedelta
+
+from kink import di
+from pytest import fixture, mark, raises
+from sqlalchemy import text
+from typer.testing import CliRunner
+
+from .utils import engine, test_task, override_get_db
+
+from src.task_manager.cli import app
+from src.task_manager.models import Task
+from src.task_manager.protocols import TaskRepository
+from src.task_manager.repositories import (
+    InMemoryTaskRepository,
+    LogTaskRepository,
+    SQLAlchemyRecurrenceRepository,
+    SQLAlchemyTaskRepository,
+)
+
+runner = CliRunner()
+
+LONG_AGO = datetime(2020, 1, 1)
+
+
+@fixture
+def repo():
+    repository = SQLAlchemyTaskRepository(override_get_db)
+    yield repository
+
+    with engine.connect() as connection:
+        connection.execute(text("DELETE FROM tasks_archive"))
+        connection.commit()
+
+
+def age(*task_ids: int) -> None:
+    with engine.connect() as connection:
+        for task_id in task_ids:
+            connection.execute(
+                text("UPDATE tasks SET completed_at = :at WHERE id = :id"),
+                {"at": LONG_AGO, "id": task_id})
+
+        connection.commit()
+
+
+def add_old_tasks(repo, count: int) -> list[int]:
+    task_ids = [
+        repo.add(Task(name=f"Old {number}", due_date=LONG_AGO + timedelta(days=number),
+                      completed=True))
+        for number in range(count)
+    ]
+    age(*task_ids)
+    return task_ids
+
+
+def test_completion_sets_and_clears_completed_at(test_task: Task, repo):
+    assert repo.get(test_task.id).completed_at is None
+
+    repo.complete(test_task.id)
+    assert repo.get(test_task.id).completed_at is not None
+
+    repo.update_many({"completed": False}, task_ids=[test_task.id])
+    assert repo.get(test_task.id).completed_at is None
+
+
+def test_archive_moves_old_completed_tasks_in_batches(test_task: Task, repo):
+    old_ids = add_old_tasks(repo, 5)
+    recurring = repo.add(Task(name="Old chore", due_date=LONG_AGO, completed=True))
+    SQLAlchemyRecurrenceRepository(override_get_db).add_rule(recurring, "weekly")
+    age(recurring)
+    cursor = repo.change_cursor()
+
+    # The completed seed task was completed today, so it stays.
+    assert repo.archive_completed(datetime.now() - timedelta(days=30), batch_size=2) == 5
+    assert all(repo.get(task_id) is None for task_id in old_ids)
+    assert repo.get(recurring) is not None
+
+    live = [s.id for s in repo.iter_summaries()]
+    everything = [s.id for s in repo.iter_summaries(include_archived=True, page_size=2)]
+
+    assert old_ids[0] not in live
+    assert everything == sorted(live + old_ids)
+    assert [s.name for s in repo.iter_summaries(
+        include_archived=True, sort="due", completed=True)][:4] == [
+            "Old 0", "Old chore", "Old 1", "Old 2"]
+    assert [s.id for s in repo.iter_summaries(include_archived=True, completed=False)] \
+        == [s.id for s in repo.iter_summaries(completed=False)]
+
+    changes = repo.changes_since(cursor)
+    assert [(c.kind, c.task_id) for c in changes] == [("archive", i) for i in old_ids]
+
+
+def test_archived_and_deleted_ids_are_never_reused(test_task: Task, repo):
+    add_old_tasks(repo, 2)
+    newest = repo.add(Task(name="Newest", due_date=LONG_AGO))
+    assert repo.archive_completed(datetime.now() - timedelta(days=30)) == 2
+
+    repo.delete_by_id(newest)
+    cursor = repo.change_cursor()
+    task_id = repo.add(Task(name="After the archive", due_date=LONG_AGO))
+    repo.delete_by_id(task_id)
+
+    assert task_id > newest
+    assert [(c.kind, c.task_id) for c in repo.changes_since(cursor)] == [
+        ("insert", task_id), ("delete", task_id)]
+
+    everything = [s.id for s in repo.iter_summaries(include_archived=True)]
+    assert len(everything) == len(set(everything))
+
+
+def test_archive_rejects_bad_arguments(repo):
+    with raises(TypeError):
+        repo.archive_completed("2020-01-01")
+
+    with raises(ValueError):
+        repo.archive_completed(datetime.now(), batch_size=0)
+
+
+def test_archive_command(test_task: Task, repo):
+    add_old_tasks(repo, 2)
+
+    result = runner.invoke(app, ["archive", "--older-than", "7"])
+    assert result.exit_code == 0
+    assert "Archived 2 tasks" in result.stdout
+
+    result = runner.invoke(app, ["archive"])
+    assert "No tasks completed more than 30 days ago" in result.stdout
+
+    result = runner.invoke(app, ["list", "--format", "jsonl", "--include-archived"])
+    assert result.exit_code == 0
+    assert '"name": "Old 1"' in result.stdout
+
+    result = runner.invoke(app, ["list", "--format", "jsonl"])
+    assert '"name": "Old 1"' not in result.stdout
+
+
+@mark.parametrize("backend", ["memory", "log"])
+def test_archive_needs_the_sqlalchemy_backend(backend, tmp_path):
+    repository = (InMemoryTaskRepository() if backend == "memory"
+                  else LogTaskRepository(tmp_path / "tasks.jsonl"))
+    original = di[TaskRepository], di["task_backend"]
+    di[TaskRepository], di["task_backend"] = repository, backend
+
+    try:
+        with raises(NotImplementedError):
+            repository.archive_completed(LONG_AGO)
+
+        result = runner.invoke(app, ["archive"])
+        assert result.exit_code == 1
+        assert "Archiving needs the sqlalchemy backend" in result.stdout
+    finally:
+        di[TaskRepository], di["task_backend"] = original
+
+        if backend == "log":
+            repository.close()
@@ -0,0 +1,115 @@
+# pylint: disable=redefined-outer-name
+# pylint: disable=unused-argument
+# pylint: disable=unused-import
+# pylint: disable=wrong-import-order
+
+import asyncio
+from datetime import datetime
+
+from pytest import fixture, importorskip, raises
+
+from .utils import test_task, override_get_db, SQLALCHEMY_DATABASE_URL
+
+from src.task_manager.database import async_database_url
+from src.task_manager.models import Task
+from src.task_manager.repositories import AsyncSQLAlchemyTaskRepository
+
+importorskip("aiosqlite")
+
+
+@fixture
+def repository():
+    # pylint: disable=import-outside-toplevel
+    from contextlib import asynccontextmanager
+    from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+    engine = create_async_engine(async_database_url(SQLALCHEMY_DATABASE_URL))
+
+    @asynccontextmanager
+    async def get_async_db():
+        async with AsyncSession(engine, expire_on_commit=False) as db:
+            yield db
+
+    yield AsyncSQLAlchemyTaskRepository(get_async_db)
+    asyncio.run(engine.dispose())
+
+
+def test_async_database_url():
+    assert async_database_url("sqlite:///tasks.db") == "sqlite+aiosqlite:///tasks.db"
+    assert async_database_url("postgresql+asyncpg://h/db") == "postgresql+asyncpg://h/db"
+
+
+def test_concurrent_reads(test_task: Task, repository):
+    async def scenario():
+        return await asyncio.gather(
+            repository.get(test_task.id),
+            repository.list(),
+            repository.filter_by_status(completed=True),
+            *(repository.get(test_task.id) for _ in range(10)),
+        )
+
+    task, tasks, completed, *lookups = asyncio.run(scenario())
+
+    assert task.name == "Water the baguettes"
+    assert len(tasks) == 3
+    assert [t.name for t in completed] == ["Take the cat for a walk"]
+    assert all(lookup.id == test_task.id for lookup in lookups)
+
+
+def test_iter_summaries(test_task: Task, repository):
+    async def scenario():
+        return [s async for s in repository.iter_summaries(page_size=1)]
+
+    summaries = asyncio.run(scenario())
+
+    assert [s.status for s in summaries] == ["overdue", "completed", "pending"]
+
+
+def test_writes_and_pagination(test_task: Task, repository):
+    async def scenario():
+        task_id = await repository.add(
+            Task(name="Async", due_date=datetime.now(), completed=False))
+        completed = await repository.complete(task_id)
+        missing = await repository.complete(999)
+        updated = await repository.update_many(
+            {"description": "Async edit"}, id_ranges=[(1, None)])
+        paged = [t.name async for t in repository.iter_tasks(page_size=2)]
+        exported = [row async for row in repository.export_rows(batch_size=2)]
+        deleted = await repository.delete_many(completed=True)
+        return task_id, completed, missing, updated, paged, exported, deleted
+
+    task_id, completed, missing, updated, paged, exported, deleted = asyncio.run(
+        scenario())
+
+    assert task_id is not None
+    assert (completed, missing, updated, deleted) == (1, 0, 4, 2)
+    assert paged[-1] == "Async"
+    assert len(exported) == 4
+    assert {row["description"] for row in exported} == {"Async edit"}
+
+    with override_get_db() as db:
+        assert db.query(Task).count() == 2
+
+
+def test_changes_since(test_task: Task, repository):
+    async def scenario():
+        cursor = await repository.change_cursor()
+        await repository.complete(test_task.id)
+        return cursor, await repository.changes_since(cursor)
+
+    cursor, changes = asyncio.run(scenario())
+
+    assert [(c.seq, c.kind, c.task_id) for c in changes] == [
+        (cursor + 1, "update", test_task.id)]
+    assert changes[0].completed is True
+
+
+def test_argument_checks(repository):
+    with raises(ValueError):
+        asyncio.run(repository.get(0))
+
+    with raises(ValueError):
+        repository.iter_tasks(page_size=0)
+
+    with raises(ValueError):
+        asyncio.run(repository.delete_many())
@@ -0,0 +1,178 @@
+# pylint: disable=redefined-outer-name
+# pylint: disable=unused-argument
+# pylint: disable=unused-import
+# pylint: disable=wrong-import-order
+
+from datetime import datetime, timedelta
+
+from pytest import fixture, mark, raises
+from kink import di
+
+from .utils import test_task, override_get_db
+
+from src.task_manager.models import Task
+from src.task_manager.protocols import TaskRepository
+from src.task_manager.repositories import CachingTaskRepository
+
+DUE_DATE = datetime(2030, 1, 1)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class CountingRepository:
+    """Forward to the real repository while counting read calls."""
+
+    def __init__(self, repository) -> None:
+        self._repository = repository
+        self.reads = 0
+
+    def get(self, task_id):
+        self.reads += 1
+        return self._repository.get(task_id)
+
+    def filter_by_status(self, **kwargs):
+        self.reads += 1
+        return self._repository.filter_by_status(**kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._repository, name)
+
+
+class RacingRepository:
+    """Let a write land through the cache while the first read is in flight."""
+
+    def __init__(self, write) -> None:
+        self.cache = None
+        self.write = write
+        self.task = Task(id=1, name="Old name", completed=False, due_date=DUE_DATE)
+        self.reads = 0
+
+    def _read(self) -> Task:
+        self.reads += 1
+        stale = Task(id=1, name=self.task.name, completed=self.task.completed,
+                     due_date=DUE_DATE)
+
+        if self.reads == 1:
+            self.write(self.cache)
+
+        return stale
+
+    def get(self, task_id):
+        return self._read()
+
+    def filter_by_status(self, **kwargs):
+        return [self._read()]
+
+    def update(self, task):
+        self.task = task
+
+    def complete(self, task_id):
+        self.task = Task(id=task_id, name=self.task.name, completed=True, due_date=DUE_DATE)
+        return 1
+
+
+@fixture
+def clock():
+    return FakeClock()
+
+
+@fixture
+def backing():
+    return CountingRepository(di[TaskRepository])
+
+
+@fixture
+def cache(backing, clock):
+    return CachingTaskRepository(backing, max_size=2, ttl=10, clock=clock)
+
+
+def test_get_is_read_through(test_task: Task, cache, backing):
+    first = cache.get(test_task.id)
+    second = cache.get(test_task.id)
+
+    assert first is second
+    assert backing.reads == 1
+    assert (cache.stats.hits, cache.stats.misses) == (1, 1)
+
+
+def test_entries_expire_and_are_evicted(test_task: Task, cache, backing, clock):
+    cache.get(test_task.id)
+    clock.now = 11
+    cache.get(test_task.id)
+    assert backing.reads == 2
+
+    cache.get(test_task.id + 1)
+    cache.get(test_task.id + 2)
+    assert cache.stats.evictions == 2
+
+    cache.get(test_task.id)
+    assert backing.reads == 5
+
+
+def test_filter_results_are_invalidated_precisely(test_task: Task, cache, backing):
+    assert len(cache.filter_by_status(completed=True)) == 1
+    assert len(cache.filter_by_status(completed=False)) == 2
+    assert backing.reads == 2
+
+    cache.complete(test_task.id)
+
+    assert len(cache.filter_by_status(completed=True)) == 2
+    assert len(cache.filter_by_status(completed=False)) == 1
+    assert backing.reads == 4
+
+    far_future = datetime.now() + timedelta(days=365)
+    cache.filter_by_status(due_after=far_future)
+    cache.add(Task(name="Soon", due_date=datetime.now(), completed=True))
+
+    cache.filter_by_status(due_after=far_future)
+    assert backing.reads == 5
+
+    assert len(cache.filter_by_status(completed=True)) == 3
+    assert backing.reads == 6
+
+
+def test_writes_invalidate_get(test_task: Task, cache):
+    assert cache.get(test_task.id).completed is False
+
+    cache.complete(test_task.id)
+    assert cache.get(test_task.id).completed is True
+
+    cache.delete_by_id(test_task.id)
+    assert cache.get(test_task.id) is None
+
+    cache.update_many({"name": "Renamed"}, id_ranges=[(1, None)])
+    assert all(t.name == "Renamed" for t in cache.filter_by_status())
+
+
+def test_max_size_must_be_positive():
+    with raises(ValueError):
+        CachingTaskRepository(di[TaskRepository], max_size=0)
+
+
+@mark.parametrize("write", [
+    lambda cache: cache.update(
+        Task(id=1, name="New name", completed=False, due_date=DUE_DATE)),
+    # Not cached yet, so ``complete`` cannot tell which filters it affects.
+    lambda cache: cache.complete(1),
+])
+@mark.parametrize("read", [
+    lambda cache: cache.get(1),
+    lambda cache: cache.filter_by_status()[0],
+])
+def test_results_fetched_across_an_invalidation_are_not_cached(read, write):
+    racing = RacingRepository(write)
+    cache = racing.cache = CachingTaskRepository(racing)
+
+    def state(task: Task) -> tuple:
+        return task.name, task.completed
+
+    assert state(read(cache)) == ("Old name", False)
+    assert state(read(cache)) == state(racing.task)
+    assert state(read(cache)) == state(racing.task)
+    assert racing.reads == 2
@@ -0,0 +1,182 @@
+# pylint: disable=unused-import
+# pylint: disable=wrong-import-order
+
+import os
+import sys
+import subprocess
+from os import path
+
+from pytest import mark, raises
+from sqlalchemy import create_engine, text
+from typer.testing import CliRunner
+
+from .utils import override_get_db
+
+from src.task_manager.cli import app
+from src.task_manager.config import (
+    SQLITE_PROFILES,
+    ArchivePolicy,
+    PoolOptions,
+    resolve_archive_policy,
+    resolve_backend,
+    resolve_log_path,
+    resolve_pool_options,
+    resolve_sqlite_pragmas,
+    resolve_sync_policy,
+)
+from src.task_manager.database import install_sqlite_pragmas
+
+
+def test_resolve_defaults_to_no_pragmas(monkeypatch):
+    monkeypatch.delenv("TASK_MANAGER_DB_PROFILE", raising=False)
+    monkeypatch.delenv("TASK_MANAGER_CONFIG", raising=False)
+
+    assert not resolve_sqlite_pragmas()
+
+
+def test_resolve_profile_from_env_with_config_overrides(monkeypatch, tmp_path):
+    config_file = tmp_path / "task-manager.ini"
+    config_file.write_text(
+        "[database]\nprofile = safe\n\n[pragmas]\ncache_size = -2000\n")
+
+    monkeypatch.setenv("TASK_MANAGER_CONFIG", str(config_file))
+    monkeypatch.delenv("TASK_MANAGER_DB_PROFILE", raising=False)
+
+    pragmas = resolve_sqlite_pragmas()
+    assert pragmas["synchronous"] == "FULL"
+    assert pragmas["cache_size"] == "-2000"
+
+    monkeypatch.setenv("TASK_MANAGER_DB_PROFILE", "performance")
+    pragmas = resolve_sqlite_pragmas()
+    assert pragmas["synchronous"] == "NORMAL"
+    assert pragmas["cache_size"] == "-2000"
+
+
+@mark.parametrize("pragmas", [
+    "[database]\nprofile = turbo\n",
+    "[pragmas]\nlocking_mode = EXCLUSIVE\n",
+    "[pragmas]\ncache_size = 1; DROP TABLE tasks\n",
+])
+def test_resolve_rejects_bad_config(monkeypatch, tmp_path, pragmas):
+    config_file = tmp_path / "task-manager.ini"
+    config_file.write_text(pragmas)
+    monkeypatch.delenv("TASK_MANAGER_DB_PROFILE", raising=False)
+
+    with raises(ValueError):
+        resolve_sqlite_pragmas(config_path=config_file)
+
+
+def test_performance_profile_is_applied_to_connections(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'tasks.db'}")
+    install_sqlite_pragmas(engine, SQLITE_PROFILES["performance"])
+
+    with engine.connect() as connection:
+        assert connection.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert connection.execute(text("PRAGMA synchronous")).scalar() == 1
+        assert connection.execute(text("PRAGMA temp_store")).scalar() == 2
+        assert connection.execute(text("PRAGMA busy_timeout")).scalar() == 5000
+
+    engine.dispose()
+
+
+def test_resolve_backend_and_log_path(monkeypatch, tmp_path):
+    monkeypatch.delenv("TASK_MANAGER_BACKEND", raising=False)
+    monkeypatch.delenv("TASK_MANAGER_LOG_PATH", raising=False)
+    monkeypatch.delenv("TASK_MANAGER_CONFIG", raising=False)
+
+    assert resolve_backend() == "sqlalchemy"
+    assert resolve_log_path(tmp_path / "default.jsonl") == tmp_path / "default.jsonl"
+
+    config_file = tmp_path / "task-manager.ini"
+    config_file.write_text("[storage]\nbackend = log\nlog_path = /data/tasks.jsonl\n")
+    monkeypatch.setenv("TASK_MANAGER_CONFIG", str(config_file))
+
+    assert resolve_backend() == "log"
+    assert str(resolve_log_path(tmp_path)) == "/data/tasks.jsonl"
+
+    monkeypatch.setenv("TASK_MANAGER_BACKEND", "memory")
+    assert resolve_backend() == "memory"
+
+    with raises(ValueError):
+        resolve_backend("redis")
+
+
+def test_resolve_pool_options(monkeypatch, tmp_path):
+    monkeypatch.delenv("TASK_MANAGER_CONFIG", raising=False)
+    assert resolve_pool_options() == PoolOptions()
+
+    config_file = tmp_path / "task-manager.ini"
+    config_file.write_text(
+        "[pool]\nsize = 2\npre_ping = yes\nrecycle = 600\nsqlite_pool = thread\n")
+    monkeypatch.setenv("TASK_MANAGER_CONFIG", str(config_file))
+
+    assert resolve_pool_options() == PoolOptions(
+        size=2, pre_ping=True, recycle=600, sqlite_pool="thread")
+
+
+@mark.parametrize("pool", [
+    "[pool]\nsize = many\n",
+    "[pool]\nsize = 0\n",
+    "[pool]\nsqlite_pool = lake\n",
+    "[pool]\necho = yes\n",
+])
+def test_resolve_pool_options_rejects_bad_config(tmp_path, pool):
+    config_file = tmp_path / "task-manager.ini"
+    config_file.write_text(pool)
+
+    with raises(ValueError):
+        resolve_pool_options(config_path=config_file)
+
+
+def test_resolve_archive_policy(monkeypatch, tmp_path):
+    monkeypatch.delenv("TASK_MANAGER_CONFIG", raising=False)
+    assert resolve_archive_policy() == ArchivePolicy()
+
+    config_file = tmp_path / "task-manager.ini"
+    config_file.write_text("[archive]\nolder_than_days = 7\nauto = yes\n")
+
+    assert resolve_archive_policy(config_path=config_file) == ArchivePolicy(
+        older_than_days=7, auto=True)
+
+    config_file.write_text("[archive]\nbatch_size = 0\n")
+
+    with raises(ValueError):
+        resolve_archive_policy(config_path=config_file)
+
+
+def test_resolve_sync_policy(monkeypatch, tmp_path):
+    monkeypatch.delenv("TASK_MANAGER_CONFIG", raising=False)
+    assert resolve_sync_policy() == "newer"
+
+    config_file = tmp_path / "task-manager.ini"
+    config_file.write_text("[sync]\nconflict = remote\n")
+
+    assert resolve_sync_policy(config_path=config_file) == "remote"
+    assert resolve_sync_policy("local", config_path=config_file) == "local"
+
+    with raises(ValueError):
+        resolve_sync_policy("coin-toss")
+
+
+def test_cli_reports_a_bad_profile_without_a_traceback():
+    root = path.dirname(path.dirname(path.abspath(__file__)))
+    env = {**os.environ, "TASK_MANAGER_DB_PROFILE": "bogus", "TASK_MANAGER_NO_DAEMON": "1"}
+    result = subprocess.run(
+        [sys.executable, "-m", "src.task_manager", "list"],
+        capture_output=True, text=True, cwd=root, env=env, check=False)
+
+    assert result.returncode == 1
+    assert "Unknown database profile 'bogus'" in result.stderr
+    assert "Traceback" not in result.stderr
+
+
+def test_cli_reports_a_bad_config_section(monkeypatch, tmp_path):
+    config_file = tmp_path / "task-manager.ini"
+    config_file.write_text("[archive]\nbatch_size = 0\n")
+    monkeypatch.setenv("TASK_MANAGER_CONFIG", str(config_file))
+
+    result = CliRunner().invoke(app, ["archive"])
+
+    assert result.exit_code == 1
+    assert "Archive batch_size must be at least 1." in result.output
+    assert not isinstance(result.exception, ValueError)
@@ -0,0 +1,107 @@
+# pylint: disable=redefined-outer-name
+# pylint: disable=unused-argument
+# pylint: disable=unused-import
+
+import socket
+from threading import Thread
+
+from pytest import fixture, mark, raises
+from kink import di
+from typer import Typer
+
+from src.task_manager.cli import app
+from src.task_manager import daemon
+from .utils import test_task, Task
+
+pytestmark = mark.skipif(
+    not hasattr(socket, "AF_UNIX"), reason="requires Unix domain sockets")
+
+
+def serve(app, path):
+    server = daemon.create_server(app, path, di["db_url"])
+    thread = Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    yield path
+
+    server.shutdown()
+    server.server_close()
+    thread.join()
+
+
+@fixture
+def server(tmp_path):
+    yield from serve(app, tmp_path / "tm.sock")
+
+
+@fixture
+def failing_server(tmp_path):
+    """A daemon whose create command writes, then crashes."""
+    crashing = Typer()
+    calls = []
+
+    @crashing.command("create")
+    def create(name: str):
+        calls.append(name)
+        raise RuntimeError("disk on fire")
+
+    @crashing.command("list")
+    def list_tasks():
+        pass
+
+    for path in serve(crashing, tmp_path / "tm.sock"):
+        yield path, calls
+
+
+def test_forward_runs_command_on_daemon(test_task: Task, server):
+    result = daemon.forward(["list"], path=server, store=di["db_url"])
+
+    assert result is not None
+    exit_code, output = result
+    assert exit_code == 0
+    assert "Water" in output
+
+    exit_code, output = daemon.forward(
+        ["complete", "999"], path=server, store=di["db_url"])
+    assert exit_code == 2
+    assert "Task 999 not found" in output
+
+
+def test_forward_falls_back_to_local_execution(server, tmp_path, monkeypatch):
+    db_url = di["db_url"]
+
+    assert daemon.forward(["export"], path=server, store=db_url) is None
+    assert daemon.forward(["list"], path=server, store="sqlite://") is None
+    assert daemon.forward(["list"], path=tmp_path / "missing.sock") is None
+
+    monkeypatch.setenv(daemon.DISABLE_ENV, "1")
+    assert daemon.forward(["list"], path=server, store=db_url) is None
+
+
+def test_second_daemon_refuses_live_socket(server):
+    with raises(RuntimeError, match="already listening"):
+        daemon.create_server(app, server, di["db_url"])
+
+
+def test_failed_command_is_not_rerun_locally(failing_server):
+    path, calls = failing_server
+    result = daemon.forward(["create", "Pay rent"], path=path, store=di["db_url"])
+
+    assert result is not None
+    exit_code, output = result
+    assert exit_code == 1
+    assert "disk on fire" in output
+    assert calls == ["Pay rent"]
+
+
+def test_unanswered_request_is_an_error_not_a_fallback(tmp_path, monkeypatch):
+    path = tmp_path / "stuck.sock"
+    monkeypatch.setattr(daemon, "REPLY_TIMEOUT", 0.2)
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as stuck:
+        stuck.bind(str(path))
+        stuck.listen()
+        exit_code, output = daemon.forward(["create", "x"], path=path, store=di["db_url"])
+
+    assert exit_code == 1
+    assert "timed out" in output
@@ -0,0 +1,153 @@
+# pylint: disable=redefined-outer-name
+# pylint: disable=unused-import
+# pylint: disable=wrong-import-order
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime
+
+from pytest import fixture, mark, raises
+from sqlalchemy import text
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool, SingletonThreadPool, StaticPool
+
+from .utils import override_get_db
+
+from src.task_manager import database
+from src.task_manager.config import PoolOptions
+from src.task_manager.database import (
+    BASE,
+    create_database_engine,
+    dispose_engine,
+    engine_options,
+    get_engine,
+)
+from src.task_manager.migrations import migrate
+from src.task_manager.models import Task
+from src.task_manager.repositories import SQLAlchemyTaskRepository
+
+
+@mark.parametrize("db_url, pool, poolclass", [
+    ("sqlite://", None, StaticPool),
+    ("sqlite:///tasks.db", None, QueuePool),
+    ("sqlite:///tasks.db", PoolOptions(sqlite_pool="thread"), SingletonThreadPool),
+    ("sqlite://", PoolOptions(sqlite_pool="thread"), SingletonThreadPool),
+])
+def test_sqlite_engine_options(db_url, pool, poolclass):
+    options = engine_options(db_url, pool)
+
+    assert options["poolclass"] is poolclass
+    assert options["connect_args"] == {"check_same_thread": False}
+
+
+def test_server_engine_options():
+    options = engine_options(
+        "postgresql://tasks@localhost/tasks",
+        PoolOptions(size=20, max_overflow=0, pre_ping=True, recycle=1800),
+    )
+
+    assert options == {
+        "pool_pre_ping": True,
+        "pool_recycle": 1800,
+        "pool_size": 20,
+        "max_overflow": 0,
+        "pool_timeout": 30.0,
+    }
+
+
+@mark.parametrize("db_url, pool", [
+    ("sqlite://", PoolOptions(sqlite_pool="queue")),
+    ("sqlite:///tasks.db", PoolOptions(sqlite_pool="lake")),
+    ("sqlite:///tasks.db", PoolOptions(size=0)),
+])
+def test_engine_options_reject_bad_pools(db_url, pool):
+    with raises(ValueError):
+        engine_options(db_url, pool)
+
+
+def file_repository(tmp_path, pool):
+    engine = create_database_engine(
+        f"sqlite:///{tmp_path / 'tasks.db'}", {"busy_timeout": "5000"}, pool)
+    BASE.metadata.create_all(bind=engine)
+    migrate(engine)
+    session_local = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    @contextmanager
+    def get_db():
+        db = session_local()
+
+        try:
+            yield db
+        finally:
+            db.close()
+
+    return engine, SQLAlchemyTaskRepository(get_db)
+
+
+@mark.parametrize("sqlite_pool", ["queue", "thread"])
+def test_repository_is_shared_by_worker_threads(tmp_path, sqlite_pool):
+    # Room for the eight workers plus this thread's schema connection.
+    engine, repo = file_repository(
+        tmp_path, PoolOptions(size=16, max_overflow=0, sqlite_pool=sqlite_pool))
+    due_date = datetime(2030, 1, 1)
+
+    def work(number):
+        task_id = repo.add(Task(name=f"Task {number}", due_date=due_date))
+        return repo.get(task_id).name
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        names = list(executor.map(work, range(200)))
+
+    assert names == [f"Task {number}" for number in range(200)]
+    assert len(repo.list()) == 200
+
+    if sqlite_pool == "queue":
+        assert engine.pool.checkedout() == 0
+
+    engine.dispose()
+
+
+@fixture
+def shared_engine():
+    dispose_engine()
+    yield
+    dispose_engine()
+
+
+def test_engine_is_created_lazily_and_disposable(shared_engine):
+    assert database._ENGINE is None
+
+    engine = get_engine()
+    assert database.ENGINE is engine
+    assert database.SESSION_LOCAL.kw["bind"] is engine
+
+    dispose_engine()
+    assert get_engine() is not engine
+
+
+@mark.skipif(not hasattr(os, "fork"), reason="needs fork")
+def test_forked_child_gets_fresh_connections(shared_engine):
+    engine = get_engine()
+
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+
+    assert engine.pool.checkedin() == 1
+    pid = os.fork()
+
+    if pid == 0:
+        status = 1
+
+        try:
+            if engine.pool.checkedin() == 0:
+                with get_engine().connect() as connection:
+                    status = 0 if connection.execute(text("SELECT 1")).scalar() == 1 else 1
+        finally:
+            os._exit(status)
+
+    _, status = os.waitpid(pid, 0)
+    assert os.waitstatus_to_exitcode(status) == 0
+
+    with engine.connect() as connection:
+        assert connection.execute(text("SELECT 1")).scalar() == 1
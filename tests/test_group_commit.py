@@ -0,0 +1,81 @@
+# pylint: disable=redefined-outer-name
+# pylint: disable=unused-argument
+# pylint: disable=unused-import
+# pylint: disable=wrong-import-order
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from pytest import fixture, raises
+from sqlalchemy.exc import IntegrityError
+
+from .utils import test_task, override_get_db
+
+from src.task_manager.group_commit import GroupCommitWriter
+from src.task_manager.models import Task
+from src.task_manager.repositories import SQLAlchemyTaskRepository
+
+DUE_DATE = datetime(2030, 1, 1)
+
+
+@fixture
+def repo():
+    return SQLAlchemyTaskRepository(override_get_db)
+
+
+def test_concurrent_adds_share_transactions(test_task: Task, repo):
+    with GroupCommitWriter(override_get_db, max_batch=16, max_delay=0.05) as writer:
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            futures = list(executor.map(
+                lambda number: writer.add(Task(name=f"Task {number}", due_date=DUE_DATE)),
+                range(64),
+            ))
+
+        task_ids = [future.result(timeout=10) for future in futures]
+
+    assert len(set(task_ids)) == 64
+    assert repo.get(task_ids[5]).name == "Task 5"
+    assert writer.stats.operations == 64
+    assert writer.stats.batches < 64
+
+
+def test_complete_and_update_resolve_after_commit(test_task: Task, repo):
+    with GroupCommitWriter(override_get_db) as writer:
+        test_task.name = "Water the sourdough"
+        assert writer.update(test_task).result(timeout=10) is None
+        assert writer.complete(test_task.id).result(timeout=10) == 1
+
+    stored = repo.get(test_task.id)
+    assert stored.completed
+    assert stored.name == "Water the sourdough"
+
+
+def test_failed_operation_does_not_sink_its_batch(test_task: Task, repo):
+    with GroupCommitWriter(override_get_db, max_delay=0.05) as writer:
+        good = writer.add(Task(name="Good", due_date=DUE_DATE))
+        bad = writer.add(Task(name=None, due_date=DUE_DATE))
+        invalid = writer.complete(-1)
+        completed = writer.complete(test_task.id)
+        writer.flush()
+
+    assert repo.get(good.result()).name == "Good"
+    assert completed.result() == 1
+
+    with raises(IntegrityError):
+        bad.result()
+
+    with raises(ValueError):
+        invalid.result()
+
+    assert writer.stats.retries == 1
+
+
+def test_closed_writer_rejects_writes(test_task: Task):
+    writer = GroupCommitWriter(override_get_db)
+    future = writer.complete(test_task.id)
+    writer.close()
+
+    assert future.result() == 1
+
+    with raises(RuntimeError):
+        writer.complete(test_task.id)
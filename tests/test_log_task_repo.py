@@ -0,0 +1,117 @@
+# pylint: disable=redefined-outer-name
+# pylint: disable=unused-import
+# pylint: disable=wrong-import-order
+
+import multiprocessing
+from datetime import datetime
+
+from pytest import fixture, mark, raises
+
+from .utils import override_get_db
+
+from src.task_manager.models import Task
+from src.task_manager.repositories import LogTaskRepository
+from src.task_manager.repositories import log_task_repo
+
+DUE = datetime(2030, 1, 1, 9, 0)
+
+
+@fixture
+def log_path(tmp_path):
+    return tmp_path / "tasks.jsonl"
+
+
+def test_reopening_replays_the_log(log_path):
+    repository = LogTaskRepository(log_path)
+    first = repository.add(Task(name="Keep", due_date=DUE))
+    second = repository.add(Task(name="Drop", due_date=DUE))
+    repository.complete(first)
+    repository.delete_by_id(second)
+
+    reopened = LogTaskRepository(log_path)
+
+    assert [(t.id, t.name, t.completed) for t in reopened.list()] == [
+        (first, "Keep", True)]
+    assert len(log_path.read_text().splitlines()) == 4
+
+
+def test_compaction_keeps_one_record_per_task(log_path):
+    repository = LogTaskRepository(log_path, compact_ratio=2, compact_min_records=10)
+    repository.add_many({"name": f"Task {n}", "due_date": DUE} for n in range(3))
+
+    for _ in range(3):
+        repository.complete_many(id_ranges=[(1, None)])
+
+    # The third round reached 12 records and compacted the log to 3 puts
+    # after the ``max_id`` record.
+    assert len(log_path.read_text().splitlines()) == 4
+
+    repository.compact()
+    assert len(log_path.read_text().splitlines()) == 4
+    assert all(t.completed for t in LogTaskRepository(log_path).list())
+
+
+def test_partial_last_line_is_discarded(log_path):
+    LogTaskRepository(log_path).add(Task(name="Saved", due_date=DUE))
+
+    with log_path.open("a") as log:
+        log.write('{"op":"put","id":2,"na')
+
+    repository = LogTaskRepository(log_path)
+    assert [t.name for t in repository.list()] == ["Saved"]
+
+    repository.add(Task(name="Next", due_date=DUE))
+    assert [t.name for t in LogTaskRepository(log_path).list()] == ["Saved", "Next"]
+
+
+def test_corrupt_record_is_reported(log_path):
+    log_path.write_text('{"op":"put","id":1}\n')
+
+    with raises(ValueError, match="line 1"):
+        LogTaskRepository(log_path)
+
+
+def test_close_releases_the_lock_file(log_path):
+    with LogTaskRepository(log_path) as repository:
+        repository.add(Task(name="Saved", due_date=DUE))
+
+    with raises(ValueError, match="closed"):
+        repository.add(Task(name="Too late", due_date=DUE))
+
+    repository.close()
+
+    with LogTaskRepository(log_path) as reopened:
+        assert [t.name for t in reopened.list()] == ["Saved"]
+
+
+def add_tasks(log_path, prefix: str, count: int) -> None:
+    with LogTaskRepository(log_path, compact_min_records=5) as repository:
+        for number in range(count):
+            repository.add(Task(name=f"{prefix} {number}", due_date=DUE))
+
+            if number % 3 == 0:
+                repository.complete_many(id_ranges=[(1, None)])
+
+
+@mark.skipif(log_task_repo.fcntl is None, reason="requires fcntl.flock")
+def test_processes_sharing_a_log_keep_each_others_writes(log_path):
+    opened_first = LogTaskRepository(log_path)
+    context = multiprocessing.get_context("fork")
+    workers = [
+        context.Process(target=add_tasks, args=(log_path, prefix, 40))
+        for prefix in ("A", "B")
+    ]
+
+    for worker in workers:
+        worker.start()
+
+    for worker in workers:
+        worker.join(timeout=30)
+        assert worker.exitcode == 0
+
+    names = sorted(t.name for t in LogTaskRepository(log_path).list())
+    assert names == sorted(f"{p} {n}" for p in "AB" for n in range(40))
+
+    # A repository opened before the other processes wrote catches up.
+    assert len(opened_first.list()) == 80
+    assert len({t.id for t in opened_first.list()}) == 80
@@ -0,0 +1,148 @@
+# pylint: disable=redefined-outer-name
+# pylint: disable=unused-import
+# pylint: disable=wrong-import-order
+
+from pytest import fixture
+from sqlalchemy import create_engine, inspect, text, select
+from sqlalchemy.pool import StaticPool
+
+from .utils import override_get_db
+
+from src.task_manager import migrations
+from src.task_manager.database import BASE
+from src.task_manager.migrations import (
+    migrate,
+    SCHEMA_VERSION,
+    SCHEMA_VERSION_TABLE,
+)
+
+LEGACY_TASKS_TABLE = """
+CREATE TABLE tasks (
+    id INTEGER NOT NULL PRIMARY KEY,
+    name VARCHAR(50) NOT NULL,
+    description VARCHAR(100),
+    completed BOOLEAN,
+    due_date DATETIME NOT NULL
+)
+"""
+
+
+@fixture
+def memory_engine():
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+
+    yield engine
+    engine.dispose()
+
+
+def index_names(engine) -> set[str]:
+    return {index["name"] for index in inspect(engine).get_indexes("tasks")}
+
+
+def stored_version(engine) -> int:
+    with engine.connect() as connection:
+        return connection.execute(select(SCHEMA_VERSION_TABLE.c.version)).scalar_one()
+
+
+def test_migrate_adds_indexes_to_legacy_database(memory_engine):
+    with memory_engine.begin() as connection:
+        connection.execute(text(LEGACY_TASKS_TABLE))
+
+    assert not index_names(memory_engine)
+
+    assert migrate(memory_engine) == SCHEMA_VERSION
+    assert stored_version(memory_engine) == SCHEMA_VERSION
+    assert {"ix_tasks_completed_due_date", "ix_tasks_due_date"} <= index_names(
+        memory_engine)
+
+
+def test_migrate_fresh_database_is_idempotent(memory_engine):
+    BASE.metadata.create_all(bind=memory_engine)
+
+    migrate(memory_engine)
+    migrate(memory_engine)
+
+    assert stored_version(memory_engine) == SCHEMA_VERSION
+    assert "ix_tasks_completed_due_date" in index_names(memory_engine)
+
+
+def test_status_filter_uses_index(memory_engine):
+    BASE.metadata.create_all(bind=memory_engine)
+
+    with memory_engine.connect() as connection:
+        plan = connection.execute(text(
+            "EXPLAIN QUERY PLAN SELECT id FROM tasks "
+            "WHERE completed = 0 AND due_date < '2025-01-01'"
+        )).all()
+
+    assert any("ix_tasks_completed_due_date" in row[-1] for row in plan)
+
+
+def test_migrate_indexes_existing_rows_for_search(memory_engine):
+    with memory_engine.begin() as connection:
+        connection.execute(text(LEGACY_TASKS_TABLE))
+        connection.execute(text(
+            "INSERT INTO tasks (name, description, completed, due_date) "
+            "VALUES ('Renew passport', 'Before the trip', 0, '2030-01-01')"
+        ))
+
+    migrate(memory_engine)
+
+    with memory_engine.connect() as connection:
+        matches = connection.execute(text(
+            "SELECT rowid FROM tasks_fts WHERE tasks_fts MATCH 'passport'"
+        )).all()
+
+    assert matches == [(1,)]
+
+
+def test_migrate_rebuilds_tasks_so_ids_are_not_reused(memory_engine, monkeypatch):
+    with memory_engine.begin() as connection:
+        connection.execute(text(LEGACY_TASKS_TABLE))
+        connection.execute(text(
+            "INSERT INTO tasks (name, due_date) VALUES "
+            "('Old', '2020-01-01'), ('Chore', '2030-01-01'), ('Archived', '2020-01-01')"
+        ))
+
+    # Stop one step short, then archive the task with the highest ID.
+    monkeypatch.setattr(migrations, "MIGRATIONS", migrations.MIGRATIONS[:-1])
+    monkeypatch.setattr(migrations, "SCHEMA_VERSION", SCHEMA_VERSION - 1)
+    migrate(memory_engine)
+    monkeypatch.undo()
+
+    with memory_engine.begin() as connection:
+        connection.execute(text(
+            "INSERT INTO recurrence_rules (task_id, frequency, interval, starts_at) "
+            "VALUES (2, 'weekly', 1, '2030-01-01')"
+        ))
+        connection.execute(text(
+            "INSERT INTO tasks_archive (id, name, completed, due_date, archived_at) "
+            "SELECT id, name, 1, due_date, '2030-01-01' FROM tasks WHERE id = 3"
+        ))
+        connection.execute(text("DELETE FROM tasks WHERE id = 3"))
+
+    with memory_engine.connect() as connection:
+        connection.exec_driver_sql("PRAGMA foreign_keys = ON")
+        connection.commit()
+
+    assert migrate(memory_engine) == SCHEMA_VERSION
+
+    with memory_engine.begin() as connection:
+        connection.execute(text(
+            "INSERT INTO tasks (name, completed, due_date) VALUES ('New', 0, '2030-01-01')"))
+
+        assert connection.execute(text(
+            "SELECT id FROM tasks WHERE name = 'New'")).scalar_one() == 4
+        assert connection.execute(text(
+            "SELECT name FROM recurrence_rules")).scalars().all() == ["Chore"]
+        assert connection.execute(text(
+            "SELECT rowid FROM tasks_fts WHERE tasks_fts MATCH 'chore'")).all() == [(2,)]
+        assert connection.execute(text(
+            "SELECT kind FROM task_changes WHERE task_id = 4")).scalars().all() == ["insert"]
+        assert connection.exec_driver_sql("PRAGMA foreign_keys").scalar() == 1
+
+    assert "ix_tasks_name" in index_names(memory_engine)
@@ -0,0 +1,67 @@
+# pylint: disable=redefined-outer-name
+# pylint: disable=unused-argument
+# pylint: disable=unused-import
+# pylint: disable=wrong-import-order
+
+import json
+
+from kink import di
+from typer.testing import CliRunner
+
+from .utils import test_task, Task
+
+from src.task_manager import profiling
+from src.task_manager.cli import app
+from src.task_manager.protocols import TaskRepository
+from src.task_manager.repositories import InMemoryTaskRepository
+
+runner = CliRunner()
+
+
+def test_profile_json_breaks_down_a_command(test_task: Task, tmp_path):
+    report_path = tmp_path / "profile.json"
+    result = runner.invoke(app, ["--profile-json", str(report_path), "list", "-f", "table"])
+
+    assert result.exit_code == 0
+    assert "Water" in result.output
+
+    report = json.loads(report_path.read_text())
+    assert report["phases"]["command"]["calls"] == 1
+    assert report["phases"]["command > render"]["calls"] == 3
+    assert report["repository"]["SQLAlchemyTaskRepository.iter_summaries"]["calls"] == 1
+    assert report["sql"]["calls"] >= 1
+    assert report["sql"]["slowest"][0]["statement"].startswith("SELECT tasks.id")
+    assert profiling.active() is None
+
+
+def test_profile_prints_to_stderr(test_task: Task):
+    result = runner.invoke(app, ["--profile", "stats", "--json"])
+
+    assert result.exit_code == 0
+    assert json.loads(result.stdout)["totals"]["total"] == 3
+    assert "Profile:" in result.stderr
+    assert "histogram_by_due_date" in result.stderr
+
+
+def test_disabled_profiling_adds_nothing():
+    repository = di[TaskRepository]
+
+    assert profiling.active() is None
+    assert profiling.wrap_repository(repository) is repository
+    assert profiling.phase("a") is profiling.phase("b")
+
+
+def test_lazy_iterators_are_timed_until_exhausted():
+    profiler = profiling.enable()
+
+    try:
+        repository = profiling.wrap_repository(InMemoryTaskRepository())
+        repository.add_many([])
+        rows = repository.iter_tasks()
+
+        assert "InMemoryTaskRepository.iter_tasks" not in profiler.methods
+        assert list(rows) == []
+        assert profiler.methods["InMemoryTaskRepository.iter_tasks"].calls == 1
+        assert profiler.methods["InMemoryTaskRepository.add_many"].calls == 1
+    finally:
+        profiling.disable()
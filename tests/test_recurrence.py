@@ -0,0 +1,193 @@
+# pylint: disable=redefined-outer-name
+# pylint: disable=unused-argument
+# pylint: disable=unused-import
+# pylint: disable=wrong-import-order
+
+import json
+from datetime import datetime, timedelta
+
+from pytest import fixture, mark, raises
+from typer.testing import CliRunner
+
+from .utils import test_task, sql_statements, override_get_db
+
+from src.task_manager.cli import app
+from src.task_manager.models import Task
+from src.task_manager.recurrence import (
+    Rule,
+    expand,
+    is_occurrence,
+    occurrence_times,
+    parse_cron,
+)
+from src.task_manager.repositories import (
+    SQLAlchemyRecurrenceRepository,
+    SQLAlchemyTaskRepository,
+)
+
+runner = CliRunner()
+
+OCTOBER = (datetime(2026, 10, 1), datetime(2026, 11, 1))
+
+
+def rule(frequency, starts_at, interval=1, cron=None, until=None, rule_id=1):
+    return Rule(rule_id, 1, "Chore", None, frequency, interval, cron, starts_at, until)
+
+
+@mark.parametrize("recurrence, expected", [
+    (rule("daily", datetime(2020, 1, 1, 9), interval=10),
+     [datetime(2026, 10, 6, 9), datetime(2026, 10, 16, 9), datetime(2026, 10, 26, 9)]),
+    (rule("weekly", datetime(2026, 9, 30), until=datetime(2026, 10, 14)),
+     [datetime(2026, 10, 7), datetime(2026, 10, 14)]),
+    (rule("monthly", datetime(2026, 1, 31, 8)), [datetime(2026, 10, 31, 8)]),
+    (rule("cron", datetime(2026, 10, 28, 12), cron="0 9,17 * * 1-5"),
+     [datetime(2026, 10, 28, 17), datetime(2026, 10, 29, 9), datetime(2026, 10, 29, 17),
+      datetime(2026, 10, 30, 9), datetime(2026, 10, 30, 17)]),
+    (rule("cron", datetime(2026, 1, 1), cron="0 0 31 2 *"), []),
+])
+def test_occurrences_in_window(recurrence, expected):
+    assert list(occurrence_times(recurrence, *OCTOBER)) == expected
+
+
+def test_monthly_keeps_the_original_day():
+    recurrence = rule("monthly", datetime(2026, 1, 31))
+    times = occurrence_times(recurrence, datetime(2026, 1, 1), datetime(2026, 5, 1))
+
+    assert [t.day for t in times] == [28, 31, 30]
+
+
+def test_first_occurrence_is_the_task_itself():
+    recurrence = rule("daily", datetime(2026, 10, 1))
+
+    assert next(occurrence_times(recurrence, *OCTOBER)) == datetime(2026, 10, 2)
+    assert not is_occurrence(recurrence, datetime(2026, 10, 1))
+    assert is_occurrence(recurrence, datetime(2026, 10, 3))
+
+
+@mark.parametrize("expression", [
+    "* * * *", "60 * * * *", "* * 0 * *", "5-1 * * * *", "*/0 * * * *", "a * * * *",
+])
+def test_parse_cron_rejects_bad_expressions(expression):
+    with raises(ValueError):
+        parse_cron(expression)
+
+
+def test_expand_merges_rules_and_applies_exceptions():
+    rules = [
+        rule("weekly", datetime(2026, 9, 28), rule_id=1),
+        rule("daily", datetime(2026, 10, 4), interval=3, rule_id=2),
+    ]
+    exceptions = {
+        (1, datetime(2026, 10, 5)): "skip",
+        (2, datetime(2026, 10, 7)): "done",
+    }
+    now = datetime(2026, 10, 9)
+
+    occurrences = list(expand(
+        rules, exceptions, datetime(2026, 10, 1), datetime(2026, 10, 15), now))
+
+    assert [(o.rule_id, o.due_date.day, o.status) for o in occurrences] == [
+        (2, 7, "completed"),
+        (2, 10, "pending"),
+        (1, 12, "pending"),
+        (2, 13, "pending"),
+    ]
+
+    completed = expand(rules, exceptions, *OCTOBER, now, completed=True)
+    assert [o.due_date.day for o in completed] == [7]
+
+
+@fixture
+def repo():
+    return SQLAlchemyRecurrenceRepository(override_get_db)
+
+
+def test_add_rule_starts_from_the_task_due_date(test_task: Task, repo):
+    rule_id = repo.add_rule(test_task.id, "weekly", interval=2)
+    stored = repo.get_rule(rule_id)
+
+    assert stored.starts_at == test_task.due_date
+    assert [r.id for r in repo.list_rules()] == [rule_id]
+    assert repo.add_rule(999_999, "daily") is None
+
+    with raises(ValueError):
+        repo.add_rule(test_task.id, "hourly")
+
+    with raises(ValueError):
+        repo.add_rule(test_task.id, "cron")
+
+
+def test_occurrence_window_reads_rules_and_exceptions_only(
+        test_task: Task, repo, sql_statements):
+    rule_id = repo.add_rule(test_task.id, "daily")
+    start = test_task.due_date + timedelta(days=1)
+    assert repo.mark_occurrence(rule_id, start + timedelta(days=1), "skip") == 1
+
+    sql_statements.clear()
+    occurrences = list(repo.iter_occurrences(start, start + timedelta(days=30)))
+
+    assert len(occurrences) == 29
+    assert occurrences[0].name == test_task.name
+    assert occurrences[1].due_date == start + timedelta(days=2)
+    assert len(sql_statements) == 2
+    assert "FROM recurrence_rules" in sql_statements[0]
+    assert "FROM recurrence_exceptions" in sql_statements[1]
+    assert not any("tasks" in s.replace("recurrence_", "") for s in sql_statements)
+
+
+def test_renaming_the_task_renames_its_occurrences(test_task: Task, repo):
+    repo.add_rule(test_task.id, "daily")
+    SQLAlchemyTaskRepository(override_get_db).update_many(
+        {"name": "Feed the sourdough"}, task_ids=[test_task.id])
+
+    start = test_task.due_date + timedelta(days=1)
+    occurrence = next(repo.iter_occurrences(start, start + timedelta(days=1)))
+
+    assert occurrence.name == "Feed the sourdough"
+
+
+def test_mark_occurrence_checks_the_schedule(test_task: Task, repo):
+    rule_id = repo.add_rule(test_task.id, "daily")
+
+    with raises(ValueError):
+        repo.mark_occurrence(rule_id, test_task.due_date + timedelta(hours=1), "done")
+
+    assert repo.mark_occurrence(rule_id + 1, test_task.due_date, "done") == 0
+
+
+def test_deleting_the_task_deletes_its_rules(test_task: Task, repo):
+    rule_id = repo.add_rule(test_task.id, "daily")
+
+    SQLAlchemyTaskRepository(override_get_db).delete_by_id(test_task.id)
+
+    assert repo.get_rule(rule_id) is None
+
+
+def test_recur_commands(test_task: Task):
+    result = runner.invoke(app, ["create", "Water plants", "2030-01-01T09:00:00"])
+    task_id = result.output.split("ID ")[1].split()[0]
+
+    result = runner.invoke(app, ["recur", "add", task_id, "--every", "daily"])
+    assert result.exit_code == 0
+    assert "repeats daily" in result.output
+    rule_id = result.output.split("(rule ")[1].split(")")[0]
+
+    result = runner.invoke(app, ["recur", "done", rule_id, "2030-01-03T09:00:00"])
+    assert result.exit_code == 0
+
+    result = runner.invoke(app, ["recur", "skip", rule_id, "2030-01-03T10:00:00"])
+    assert result.exit_code == 2
+
+    result = runner.invoke(app, [
+        "recur", "agenda", "--from", "2030-01-01", "--to", "2030-01-08",
+        "--format", "jsonl",
+    ])
+    assert result.exit_code == 0
+    rows = [json.loads(line) for line in result.output.splitlines()]
+    assert [row["due_date"][:10] for row in rows] == [
+        f"2030-01-0{day}" for day in range(2, 8)]
+    assert rows[1]["status"] == "completed"
+
+    result = runner.invoke(
+        app, ["recur", "add", task_id, "--every", "daily", "--cron", "* * * * *"])
+    assert result.exit_code == 2
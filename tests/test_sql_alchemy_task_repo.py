@@ -3,17 +3,54 @@
 # pylint: disable=unused-import
 # pylint: disable=wrong-import-order
 
-from typing import Any
-from pytest import mark, raises
+from typing import Any, Callable
+from pytest import fixture, mark, raises
 from datetime import datetime, timedelta
 from kink import di
 
 from .utils import test_task, override_get_db
 
-from src.task_manager.repositories import SQLAlchemyTaskRepository
+from src.task_manager.repositories import (
+    SQLAlchemyTaskRepository,
+    InMemoryTaskRepository,
+    LogTaskRepository,
+)
 from src.task_manager.protocols import TaskRepository
 from src.task_manager.models import Task
 
+# Every test in this module is a contract test run against each backend.
+BACKENDS = ["sqlalchemy", "memory", "log"]
+
+
+@fixture(params=BACKENDS, autouse=True)
+def backend(request, tmp_path):
+    original = di[TaskRepository]
+
+    if request.param == "memory":
+        di[TaskRepository] = InMemoryTaskRepository()
+    elif request.param == "log":
+        # A low threshold makes the suite exercise compaction as well.
+        di[TaskRepository] = LogTaskRepository(
+            tmp_path / "tasks.jsonl", compact_min_records=5)
+
+    yield request.param
+
+    if request.param == "log":
+        di[TaskRepository].close()
+
+    di[TaskRepository] = original
+
+
+@fixture
+def reopen(backend: str) -> Callable[[], TaskRepository]:
+    """A fresh view of the stored tasks, to check writes really landed."""
+    repository = di[TaskRepository]
+
+    if backend == "log":
+        return lambda: LogTaskRepository(repository.path)
+
+    return lambda: repository
+
 
 def test_get_task(test_task: Task):
     repository = di[TaskRepository]
@@ -41,15 +78,25 @@ def test_task_id_check(task_id: str | int, exc_type: Any):
         repository.complete(task_id)    # type: ignore
 
 
-def test_task_complete(test_task: Task):
+def test_task_complete(test_task: Task, reopen):
     repository = di[TaskRepository]
     repository.complete(test_task.id)
 
-    with override_get_db() as db:
-        task = db.get(Task, test_task.id)
+    task = reopen().get(test_task.id)
+
+    assert task is not None
+    assert task.completed is True
+
 
-        assert task is not None
-        assert task.completed is True
+def test_complete_and_delete_by_id_report_rowcount(test_task: Task):
+    repository = di[TaskRepository]
+
+    assert repository.complete(test_task.id) == 1
+    assert repository.complete(999) == 0
+
+    assert repository.delete_by_id(test_task.id) == 1
+    assert repository.delete_by_id(test_task.id) == 0
+    assert repository.get(test_task.id) is None
 
 
 def test_task_list(test_task: Task):
@@ -73,7 +120,7 @@ def test_task_type_check():
         repository.delete(456)      # type: ignore
 
 
-def test_add_task():
+def test_add_task(reopen):
     repository = di[TaskRepository]
 
     task = Task(
@@ -88,50 +135,57 @@ def test_add_task():
     assert task_id is not None
     assert task_id == 1
 
-    with override_get_db() as db:
-        task = db.get(Task, task_id)
+    task = reopen().get(task_id)
 
-        assert task is not None
-        assert task.id == 1
-        assert task.name == "TaskName"
-        assert task.description == "TaskDescription"
-        assert task.completed is False
+    assert task is not None
+    assert task.id == 1
+    assert task.name == "TaskName"
+    assert task.description == "TaskDescription"
+    assert task.completed is False
 
 
-def test_delete_task(test_task: Task):
+def test_deleted_ids_are_not_reused(test_task: Task, backend: str, reopen):
     repository = di[TaskRepository]
+    newest = max(task.id for task in repository.list())
+    repository.delete_by_id(newest)
+
+    if backend == "log":
+        # Compaction drops every record of the deleted task.
+        repository.compact()
+
+    task_id = reopen().add(Task(name="After the delete", due_date=datetime.now()))
+
+    assert task_id > newest
 
-    task = None
-    with override_get_db() as db:
-        task = db.get(Task, test_task.id)
+
+def test_delete_task(test_task: Task, reopen):
+    repository = di[TaskRepository]
+
+    task = reopen().get(test_task.id)
 
     assert task is not None
     repository.delete(task)
 
-    with override_get_db() as db:
-        task = db.get(Task, test_task.id)
-        assert task is None
+    assert reopen().get(test_task.id) is None
 
 
-def test_update_task(test_task: Task):
+def test_update_task(test_task: Task, reopen):
     repository = di[TaskRepository]
 
-    with override_get_db() as db:
-        task = db.get(Task, test_task.id)
-        assert task is not None
+    task = reopen().get(test_task.id)
+    assert task is not None
 
-        task.name = "Updated Task"
-        task.description = "Updated Description"
-        task.completed = True
+    task.name = "Updated Task"
+    task.description = "Updated Description"
+    task.completed = True
 
     repository.update(task)
 
-    with override_get_db() as db:
-        updated = db.get(Task, test_task.id)
-        assert updated is not None
-        assert updated.name == "Updated Task"
-        assert updated.description == "Updated Description"
-        assert updated.completed is True
+    updated = reopen().get(test_task.id)
+    assert updated is not None
+    assert updated.name == "Updated Task"
+    assert updated.description == "Updated Description"
+    assert updated.completed is True
 
 
 @mark.parametrize(
@@ -176,3 +230,299 @@ def test_filter_by_status_invalid_types(kwargs):
 
     with raises(TypeError):
         repository.filter_by_status(**kwargs)
+
+
+@mark.parametrize("page_size", [1, 2, 100])
+def test_iter_tasks_pages_in_id_order(test_task: Task, page_size: int):
+    repository = di[TaskRepository]
+    tasks = list(repository.iter_tasks(page_size=page_size))
+
+    assert [t.name for t in tasks] == [
+        "Water the baguettes",
+        "Take the cat for a walk",
+        "Go to the store",
+    ]
+    assert [t.id for t in tasks] == sorted(t.id for t in tasks)
+
+
+def test_iter_tasks_after_id_and_filters(test_task: Task):
+    repository = di[TaskRepository]
+
+    after_first = list(repository.iter_tasks(after_id=test_task.id))
+    assert len(after_first) == 2
+    assert all(t.id > test_task.id for t in after_first)
+
+    pending = list(repository.iter_tasks(page_size=1, completed=False))
+    assert len(pending) == 2
+    assert all(t.completed is False for t in pending)
+
+
+@mark.parametrize(
+    "kwargs",
+    [
+        {"after_id": -1},
+        {"page_size": 0},
+        {"page_size": "ten"},
+    ],
+)
+def test_iter_tasks_invalid_page(kwargs):
+    repository = di[TaskRepository]
+
+    with raises(ValueError):
+        repository.iter_tasks(**kwargs)
+
+
+def test_iter_summaries_computes_status_in_sql(test_task: Task):
+    repository = di[TaskRepository]
+    summaries = list(repository.iter_summaries(page_size=2))
+
+    assert [s.status for s in summaries] == ["overdue", "completed", "pending"]
+    assert summaries[0].name == test_task.name
+    assert summaries[0].description == test_task.description
+
+    earlier = datetime.now() - timedelta(days=1)
+    statuses = [s.status for s in repository.iter_summaries(now=earlier)]
+    assert statuses == ["pending", "completed", "pending"]
+
+    pending = list(repository.iter_summaries(completed=False, after_id=test_task.id))
+    assert [s.name for s in pending] == ["Go to the store"]
+
+
+def test_iter_summaries_invalid_now():
+    repository = di[TaskRepository]
+
+    with raises(TypeError):
+        repository.iter_summaries(now="today")
+
+
+@mark.parametrize("page_size", [1, 2, 100])
+def test_iter_summaries_sorted_by_due_date_and_name(test_task: Task, page_size: int):
+    repository = di[TaskRepository]
+    repository.add(Task(name="Go to the store", due_date=test_task.due_date))
+
+    by_due = list(repository.iter_summaries(page_size=page_size, sort="due"))
+    assert [(s.name, s.due_date) for s in by_due] == sorted(
+        ((s.name, s.due_date) for s in by_due), key=lambda item: item[1])
+    assert by_due[-1].name == "Go to the store"
+
+    by_name = list(repository.iter_summaries(page_size=page_size, sort="name"))
+    assert [s.name for s in by_name] == [
+        "Go to the store",
+        "Go to the store",
+        "Take the cat for a walk",
+        "Water the baguettes",
+    ]
+    assert by_name[0].id < by_name[1].id
+
+    window = list(repository.iter_summaries(
+        page_size=page_size,
+        sort="due",
+        completed=False,
+        due_after=test_task.due_date,
+        due_before=test_task.due_date + timedelta(hours=1),
+    ))
+    assert [s.id for s in window] == [test_task.id, by_name[1].id]
+
+
+@mark.parametrize("kwargs, exc_type", [
+    ({"sort": "priority"}, ValueError),
+    ({"sort": "due", "after_id": 1}, ValueError),
+])
+def test_iter_summaries_invalid_sort(kwargs, exc_type):
+    with raises(exc_type):
+        di[TaskRepository].iter_summaries(**kwargs)
+
+
+def test_count_by_status(test_task: Task):
+    repository = di[TaskRepository]
+
+    assert repository.count_by_status() == {
+        "completed": 1, "pending": 1, "overdue": 1}
+
+    earlier = datetime.now() - timedelta(days=1)
+    assert repository.count_by_status(now=earlier)["pending"] == 2
+
+
+def test_histogram_by_due_date():
+    repository = di[TaskRepository]
+    now = datetime(2030, 1, 9, 12, 0)  # A Wednesday.
+    repository.add_many([
+        {"name": name, "due_date": due, "completed": name == "Done"}
+        for name, due in [
+            ("Monday", datetime(2030, 1, 7, 9, 0)),
+            ("Sunday", datetime(2030, 1, 13, 9, 0)),
+            ("Done", datetime(2030, 1, 13, 18, 0)),
+            ("Next", datetime(2030, 1, 14, 9, 0)),
+        ]
+    ])
+
+    days = repository.histogram_by_due_date(now=now)
+    assert [(str(b.start), b.completed, b.pending, b.overdue) for b in days] == [
+        ("2030-01-07", 0, 0, 1),
+        ("2030-01-13", 1, 1, 0),
+        ("2030-01-14", 0, 1, 0),
+    ]
+
+    weeks = repository.histogram_by_due_date(
+        "week", now=now, due_before=datetime(2030, 1, 14))
+    assert [(str(b.start), b.total) for b in weeks] == [("2030-01-07", 3)]
+
+    with override_get_db() as db:
+        db.query(Task).delete()
+        db.commit()
+
+
+def test_histogram_by_due_date_invalid_bucket():
+    repository = di[TaskRepository]
+
+    with raises(ValueError):
+        repository.histogram_by_due_date("month")
+
+
+def test_search_prefix_and_exact(test_task: Task):
+    repository = di[TaskRepository]
+
+    assert [t.name for t in repository.search("bag")] == ["Water the baguettes"]
+    assert repository.search("bag", prefix=False) == []
+    assert [t.status for t in repository.search("cat walk")] == ["completed"]
+    assert [t.name for t in repository.search("food")] == ["Go to the store"]
+
+
+def test_search_ranks_and_ignores_operators(test_task: Task):
+    repository = di[TaskRepository]
+    repository.add(Task(
+        name="Store store store", description="store", due_date=datetime.now()))
+
+    names = [t.name for t in repository.search('store" OR NOT (x*')]
+    assert names == []
+
+    names = [t.name for t in repository.search("store", limit=1)]
+    assert names == ["Store store store"]
+
+    with raises(ValueError):
+        repository.search("  ?! ")
+
+
+def test_search_index_follows_writes(test_task: Task):
+    repository = di[TaskRepository]
+    repository.update_many({"name": "Feed the ducks"}, task_ids=[test_task.id])
+
+    assert repository.search("baguettes") == []
+    assert [t.id for t in repository.search("ducks")] == [test_task.id]
+
+    repository.delete_by_id(test_task.id)
+    assert repository.search("ducks") == []
+
+
+def test_add_many_and_export_rows():
+    repository = di[TaskRepository]
+    due = datetime(2030, 1, 1, 9, 30)
+
+    count = repository.add_many(
+        ({"name": f"Bulk {n}", "due_date": due} for n in range(25)),
+        batch_size=10,
+    )
+
+    assert count == 25
+
+    rows = list(repository.export_rows(batch_size=7))
+    assert len(rows) == 25
+    assert rows[0] == {
+        "id": 1,
+        "name": "Bulk 0",
+        "description": None,
+        "completed": False,
+        "due_date": due,
+    }
+
+    with override_get_db() as db:
+        db.query(Task).delete()
+        db.commit()
+
+
+def test_add_many_rolls_back_on_error():
+    repository = di[TaskRepository]
+
+    def rows():
+        yield {"name": "Fine", "due_date": datetime.now()}
+        raise ValueError("bad row")
+
+    with raises(ValueError):
+        repository.add_many(rows(), batch_size=1)
+
+    assert repository.list() == []
+
+
+def test_complete_many_by_ids_and_ranges(test_task: Task):
+    repository = di[TaskRepository]
+    first = test_task.id
+
+    assert repository.complete_many(
+        task_ids=[first], id_ranges=[(first + 2, None)]) == 2
+    assert len(repository.filter_by_status(completed=True)) == 3
+
+
+def test_update_many_and_delete_many_with_filters(test_task: Task):
+    repository = di[TaskRepository]
+
+    updated = repository.update_many(
+        {"description": "Bulk edited"}, completed=False)
+    assert updated == 2
+    assert {t.description for t in repository.filter_by_status(completed=False)} == {
+        "Bulk edited"}
+
+    assert repository.delete_many(
+        completed=False, due_before=datetime.now()) == 1
+    assert len(repository.list()) == 2
+
+
+@mark.parametrize(
+    "method, args, kwargs",
+    [
+        ("complete_many", (), {}),
+        ("delete_many", (), {"task_ids": [0]}),
+        ("delete_many", (), {"id_ranges": [(5, 2)]}),
+        ("update_many", ({},), {"task_ids": [1]}),
+        ("update_many", ({"id": 9},), {"task_ids": [1]}),
+    ],
+)
+def test_set_operations_reject_bad_selection(method, args, kwargs):
+    repository = di[TaskRepository]
+
+    with raises(ValueError):
+        getattr(repository, method)(*args, **kwargs)
+
+
+def test_changes_since_cursor(test_task: Task):
+    repository = di[TaskRepository]
+    cursor = repository.change_cursor()
+
+    task_id = repository.add(Task(name="Feed the cat", due_date=datetime(2030, 1, 1)))
+    assert repository.complete(task_id) == 1
+    assert repository.complete(task_id) == 1
+    repository.update_many({"description": "Tuna"}, task_ids=[test_task.id])
+    repository.delete_by_id(task_id)
+
+    changes = repository.changes_since(cursor)
+
+    # Completing an already completed task changes nothing, so it is not logged.
+    assert [(c.kind, c.task_id) for c in changes] == [
+        ("insert", task_id),
+        ("update", task_id),
+        ("update", test_task.id),
+        ("delete", task_id),
+    ]
+    assert [c.seq for c in changes] == list(range(cursor + 1, cursor + 5))
+    assert changes[2].description == "Tuna"
+    assert changes[0].name is None and changes[3].name is None
+    assert repository.change_cursor() == changes[-1].seq
+
+    resumed = repository.changes_since(changes[1].seq, limit=1)
+    assert resumed == [changes[2]]
+    assert not repository.changes_since(changes[-1].seq)
+
+
+@mark.parametrize("seq, limit", [(-1, 10), ("1", 10), (0, 0)])
+def test_changes_since_rejects_bad_cursor(seq, limit):
+    with raises(ValueError):
+        di[TaskRepository].changes_since(seq, limit=limit)
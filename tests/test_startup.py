@@ -0,0 +1,108 @@
+import sys
+import subprocess
+from os import getenv, path
+
+from sqlalchemy import update
+
+from src.task_manager.database import BASE, create_database_engine
+from src.task_manager.migrations import (
+    SCHEMA_VERSION,
+    SCHEMA_VERSION_TABLE,
+    migrate,
+    schema_is_current,
+)
+
+ROOT_DIR = path.dirname(path.dirname(path.abspath(__file__)))
+
+# Generous enough for slow CI runners while still catching an eager
+# SQLAlchemy import, which alone costs several hundred milliseconds.
+COLD_START_BUDGET_MS = float(getenv("TASK_MANAGER_COLD_START_BUDGET_MS", "400"))
+
+
+def import_times(*args: str) -> dict[str, int]:
+    """Run Python with ``-X importtime`` and return cumulative times in µs."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        capture_output=True,
+        text=True,
+        cwd=ROOT_DIR,
+        check=True,
+    )
+
+    times = {}
+
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+
+        _, cumulative, name = line.split("|")
+        times[name.strip()] = int(cumulative)
+
+    return times
+
+
+def loaded_packages(times: dict[str, int]) -> set[str]:
+    return {name.split(".")[0] for name in times}
+
+
+def test_cli_import_defers_heavy_dependencies():
+    times = import_times("-c", "import src.task_manager.cli")
+    assert not loaded_packages(times) & {"sqlalchemy", "rich", "kink", "asyncio"}
+
+
+def test_help_does_not_touch_the_database():
+    # Typer renders help with rich, but nothing should reach SQLAlchemy.
+    times = import_times("-m", "src.task_manager", "--help")
+    assert not loaded_packages(times) & {"sqlalchemy", "kink"}
+
+
+def test_machine_formats_do_not_load_rich(monkeypatch):
+    monkeypatch.setenv("DATABASE_URL", "sqlite://")
+    monkeypatch.setenv("TASK_MANAGER_NO_DAEMON", "1")
+
+    times = import_times("-m", "src.task_manager", "list", "--format", "jsonl")
+    assert "sqlalchemy" in loaded_packages(times)
+    assert "rich" not in loaded_packages(times)
+
+    # Piped output defaults to tsv rather than a table.
+    times = import_times("-m", "src.task_manager", "list")
+    assert "rich" not in loaded_packages(times)
+
+
+def test_cli_cold_start_within_budget():
+    times = import_times("-c", "import src.task_manager.cli")
+    assert times["src.task_manager.cli"] / 1000 < COLD_START_BUDGET_MS
+
+
+def test_schema_version_is_read_from_the_database(tmp_path):
+    database_file = tmp_path / "tasks.db"
+    engine = create_database_engine(f"sqlite:///{database_file}")
+
+    try:
+        assert not schema_is_current(engine)
+
+        BASE.metadata.create_all(bind=engine)
+        migrate(engine)
+        assert schema_is_current(engine)
+
+        # A database replaced at the same path starts over.
+        engine.dispose()
+        database_file.unlink()
+        assert not schema_is_current(engine)
+    finally:
+        engine.dispose()
+
+
+def test_schema_behind_the_code_is_not_current(tmp_path):
+    engine = create_database_engine(f"sqlite:///{tmp_path / 'tasks.db'}")
+
+    try:
+        BASE.metadata.create_all(bind=engine)
+        migrate(engine)
+
+        with engine.begin() as connection:
+            connection.execute(update(SCHEMA_VERSION_TABLE).values(version=SCHEMA_VERSION - 1))
+
+        assert not schema_is_current(engine)
+    finally:
+        engine.dispose()
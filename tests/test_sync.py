@@ -0,0 +1,106 @@
+# pylint: disable=redefined-outer-name
+# pylint: disable=unused-argument
+# pylint: disable=unused-import
+# pylint: disable=wrong-import-order
+
+import time
+from contextlib import ExitStack
+from datetime import datetime
+
+from pytest import fixture, mark, raises
+from typer.testing import CliRunner
+
+from .utils import test_task, override_get_db
+
+from src.task_manager.cli import app
+from src.task_manager.models import Task
+from src.task_manager.repositories import SQLAlchemyTaskRepository
+from src.task_manager.sync import open_peer, sync
+
+runner = CliRunner()
+
+DUE_DATE = datetime(2030, 1, 1)
+
+
+@fixture
+def databases(tmp_path):
+    """Session contexts for a workstation and a shared database file."""
+    with ExitStack() as stack:
+        yield tuple(
+            stack.enter_context(open_peer(f"sqlite:///{tmp_path / name}"))
+            for name in ("local.db", "shared.db")
+        )
+
+
+def names(context) -> list[str]:
+    return sorted(task.name for task in SQLAlchemyTaskRepository(context).list())
+
+
+def test_sync_copies_only_changed_tasks(databases):
+    local, shared = databases
+    local_repo = SQLAlchemyTaskRepository(local)
+    shared_repo = SQLAlchemyTaskRepository(shared)
+    local_repo.add_many({"name": f"Task {n}", "due_date": DUE_DATE} for n in range(50))
+    shared_repo.add(Task(name="From the office", due_date=DUE_DATE))
+
+    stats = sync(local, shared, "shared")
+    assert (stats.pushed, stats.pulled, stats.conflicts) == (50, 1, 0)
+    assert names(local) == names(shared)
+
+    assert sync(local, shared, "shared") == type(stats)()
+
+    local_repo.complete(4)
+    local_repo.delete_by_id(5)
+    shared_id = shared_repo.add(Task(name="New at the office", due_date=DUE_DATE))
+    stats = sync(local, shared, "shared")
+
+    assert (stats.pushed, stats.pulled, stats.conflicts) == (2, 1, 0)
+    assert names(local) == names(shared)
+    assert "Task 3" in [t.name for t in shared_repo.filter_by_status(completed=True)]
+
+    # Copies keep the uid and version, and are not echoed back.
+    copied = next(t for t in local_repo.list() if t.name == "New at the office")
+    assert copied.uid == shared_repo.get(shared_id).uid
+    assert sync(local, shared, "shared") == type(stats)()
+
+
+@mark.parametrize("policy, winner", [
+    ("newer", "Shared edit"),
+    ("local", "Local edit"),
+    ("remote", "Shared edit"),
+])
+def test_sync_resolves_conflicts(databases, policy, winner):
+    local, shared = databases
+    local_repo = SQLAlchemyTaskRepository(local)
+    shared_repo = SQLAlchemyTaskRepository(shared)
+    local_repo.add(Task(name="Original", due_date=DUE_DATE))
+    sync(local, shared, "shared")
+
+    local_repo.update_many({"name": "Local edit"}, task_ids=[1])
+    time.sleep(0.01)
+    shared_repo.update_many({"name": "Shared edit"}, task_ids=[1])
+    stats = sync(local, shared, "shared", policy=policy)
+
+    assert stats.conflicts == 1
+    assert names(local) == names(shared) == [winner]
+    assert local_repo.list()[0].version == shared_repo.list()[0].version == 3
+    assert sync(local, shared, "shared", policy=policy).conflicts == 0
+
+
+def test_sync_rejects_bad_arguments(databases):
+    with raises(ValueError):
+        sync(*databases, "shared", policy="coin-toss")
+
+    with raises(ValueError):
+        sync(*databases, "shared", batch_size=0)
+
+
+def test_sync_command(test_task: Task, tmp_path):
+    url = f"sqlite:///{tmp_path / 'shared.db'}"
+
+    result = runner.invoke(app, ["sync", "--to", url])
+    assert result.exit_code == 0
+    assert "Pushed 3 and pulled 0 tasks" in result.stdout
+
+    result = runner.invoke(app, ["sync", "--to", url, "--conflict", "remote"])
+    assert "Pushed 0 and pulled 0 tasks" in result.stdout
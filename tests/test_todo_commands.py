@@ -2,12 +2,16 @@
 # pylint: disable=unused-argument
 # pylint: disable=unused-import
 
-from pytest import fixture
+import json
+from datetime import timedelta
+
+from pytest import fixture, mark
 from kink import di
 from typer.testing import CliRunner
 
 from src.task_manager.cli import app
-from .utils import test_task, Task
+from src.task_manager.protocols import TaskRepository
+from .utils import test_task, sql_statements, Task
 
 runner = CliRunner()
 
@@ -36,18 +40,121 @@ def test_list_tasks(test_task: Task):
     assert "Go to the store" in result.output
 
 
+def test_list_tasks_machine_formats(test_task: Task):
+    result = runner.invoke(app, ["list", "--format", "jsonl", "--status", "pending"])
+    assert result.exit_code == 0
+    assert [json.loads(line)["name"] for line in result.output.splitlines()] == [
+        "Go to the store"]
+
+    result = runner.invoke(app, ["list", "--format", "json"])
+    assert result.exit_code == 0
+    rows = json.loads(result.output)
+    assert [row["status"] for row in rows] == ["overdue", "completed", "pending"]
+    assert rows[0]["due_date"] == test_task.due_date.isoformat()
+
+    result = runner.invoke(app, ["list", "-f", "tsv", "--limit", "1"])
+    assert result.exit_code == 0
+    header, row = result.output.splitlines()
+    assert header.split("\t") == ["id", "name", "due_date", "description", "status"]
+    assert row.split("\t")[1] == "Water the baguettes"
+
+    result = runner.invoke(app, ["search", "cat", "--format", "csv"])
+    assert result.exit_code == 0
+    assert result.output.splitlines()[1].endswith(",completed")
+
+
+def test_list_tasks_machine_formats_when_empty():
+    result = runner.invoke(app, ["list", "--format", "json"])
+    assert result.output == "[]\n"
+
+    result = runner.invoke(app, ["list", "--format", "jsonl"])
+    assert result.output == ""
+
+
+def test_list_defaults_to_tsv_when_piped(test_task: Task):
+    result = runner.invoke(app, ["list", "--limit", "1"])
+    assert result.exit_code == 0
+    assert result.output.splitlines() == [
+        "id\tname\tdue_date\tdescription\tstatus",
+        f"{test_task.id}\tWater the baguettes\t{test_task.due_date.isoformat()}"
+        f"\tStrange dream\toverdue",
+    ]
+
+
 def test_list_tasks_no_tasks():
-    result = runner.invoke(app, ["list"])
+    result = runner.invoke(app, ["list", "-f", "table"])
     assert result.exit_code == 0
     assert "No tasks found" in result.output
 
 
+def test_list_tasks_is_one_projection_query(test_task: Task, sql_statements):
+    sql_statements.clear()
+    result = runner.invoke(app, ["list", "-f", "table"])
+
+    assert result.exit_code == 0
+    assert "❌ Overdue" in result.output
+    assert len(sql_statements) == 1
+    assert "CASE" in sql_statements[0]
+    assert "tasks.completed AS" not in sql_statements[0]
+
+
+def test_search_tasks(test_task: Task):
+    result = runner.invoke(app, ["search", "stor"])
+    assert result.exit_code == 0
+    assert "Go to the store" in result.output
+
+    result = runner.invoke(app, ["search", "stor", "--exact", "-f", "table"])
+    assert result.exit_code == 0
+    assert "No matching tasks found" in result.output
+
+    result = runner.invoke(app, ["search", "--", "--"])
+    assert result.exit_code == 2
+
+
+def test_stats_json_is_one_query(test_task: Task, sql_statements):
+    sql_statements.clear()
+    result = runner.invoke(app, ["stats", "--by", "week", "--json"])
+
+    assert result.exit_code == 0
+    assert len(sql_statements) == 1
+    assert "GROUP BY" in sql_statements[0]
+
+    document = json.loads(result.output)
+    assert document["totals"] == {
+        "completed": 1, "pending": 1, "overdue": 1, "total": 3}
+    assert document["bucket"] == "week"
+    assert sum(b["total"] for b in document["histogram"]) == 3
+
+
+def test_stats_tables(test_task: Task):
+    result = runner.invoke(app, ["stats"])
+
+    assert result.exit_code == 0
+    assert "Tasks by Status" in result.output
+    assert "Tasks by Due Day" in result.output
+
+
 def test_complete_task(test_task: Task):
     result = runner.invoke(app, ["complete", "1"])
     assert result.exit_code == 0
     assert f"Task {test_task.id} marked complete" in result.output
 
 
+def test_complete_task_is_one_statement(test_task: Task, sql_statements):
+    task_id = str(test_task.id)
+    sql_statements.clear()
+
+    result = runner.invoke(app, ["complete", task_id])
+    assert result.exit_code == 0
+    assert len(sql_statements) == 1
+    assert sql_statements[0].startswith("UPDATE tasks")
+
+    sql_statements.clear()
+    result = runner.invoke(app, ["complete", "999"])
+    assert result.exit_code == 2
+    assert len(sql_statements) == 1
+
+
 def test_complete_bad_task_id(test_task: Task):
     result = runner.invoke(app, ["complete", "-10"])
     assert result.exit_code == 2
@@ -68,6 +175,21 @@ def test_delete_task(test_task: Task):
     assert "Task 1 deleted" in result.output
 
 
+def test_delete_task_is_one_statement(test_task: Task, sql_statements):
+    task_id = str(test_task.id)
+    sql_statements.clear()
+
+    result = runner.invoke(app, ["delete", task_id])
+    assert result.exit_code == 0
+    assert len(sql_statements) == 1
+    assert sql_statements[0].startswith("DELETE FROM tasks")
+
+    sql_statements.clear()
+    result = runner.invoke(app, ["delete", task_id])
+    assert result.exit_code == 2
+    assert len(sql_statements) == 1
+
+
 def test_delete_bad_task_id(test_task: Task):
     result = runner.invoke(app, ["delete", "-10"])
     assert result.exit_code == 2
@@ -169,3 +291,197 @@ def test_update_bad_task_id(test_task: Task):
     )
     assert result.exit_code == 2
     assert "Task 999 not found" in result.output
+
+
+def test_list_tasks_limit_and_after(test_task: Task):
+    result = runner.invoke(app, ["list", "--limit", "1"])
+    assert result.exit_code == 0
+    assert "Water" in result.output
+    assert "Go to the store" not in result.output
+
+    result = runner.invoke(
+        app, ["list", "--after", str(test_task.id), "--page-size", "1"])
+    assert result.exit_code == 0
+    assert "Water" not in result.output
+    assert "Take the cat" in result.output
+    assert "Go to the store" in result.output
+
+    result = runner.invoke(app, ["list", "--after", "999", "-f", "table"])
+    assert result.exit_code == 0
+    assert "No tasks found" in result.output
+
+
+def list_names(*args: str) -> list[str]:
+    result = runner.invoke(app, ["list", "--format", "jsonl", *args])
+    assert result.exit_code == 0, result.output
+    return [json.loads(line)["name"] for line in result.output.splitlines()]
+
+
+def test_list_tasks_due_windows(test_task: Task):
+    tomorrow = (test_task.due_date + timedelta(days=1)).strftime("%Y-%m-%d")
+
+    assert "Go to the store" not in list_names("--today")
+    assert list_names("--next", "2", "--status", "pending") == ["Go to the store"]
+    assert list_names("--due-from", tomorrow) == ["Go to the store"]
+    assert list_names("--due-to", tomorrow, "--status", "completed") == [
+        "Take the cat for a walk"]
+    assert len(list_names("--this-week")) in (2, 3)
+
+    result = runner.invoke(app, ["list", "--today", "--next", "3"])
+    assert result.exit_code == 2
+
+
+def test_list_tasks_sort_is_a_single_top_n_query(test_task: Task, sql_statements):
+    sql_statements.clear()
+
+    assert list_names("--sort", "name", "--limit", "2") == [
+        "Go to the store", "Take the cat for a walk"]
+    assert len(sql_statements) == 1
+    assert "ORDER BY tasks.name, tasks.id" in sql_statements[0]
+    assert "LIMIT" in sql_statements[0]
+
+    assert list_names("--sort", "due", "--due-from", "2000-01-01")[-1] == "Go to the store"
+
+    result = runner.invoke(app, ["list", "--sort", "due", "--after", "1"])
+    assert result.exit_code == 2
+
+
+def test_list_tasks_due_sort_uses_the_index(test_task: Task):
+    from sqlalchemy import text
+    from .utils import engine
+
+    with engine.connect() as connection:
+        plan = " ".join(row[3] for row in connection.execute(text(
+            "EXPLAIN QUERY PLAN SELECT id FROM tasks "
+            "WHERE completed IS 0 AND due_date >= :start AND due_date < :end "
+            "ORDER BY due_date, id LIMIT 10"
+        ), {"start": "2026-01-01", "end": "2026-02-01"}))
+
+    assert "ix_tasks_completed_due_date" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+def test_list_tasks_window_includes_recurring_occurrences(test_task: Task):
+    result = runner.invoke(app, ["create", "Feed the fish", "2030-01-01T09:00:00"])
+    task_id = result.output.split("ID ")[1].split()[0]
+    runner.invoke(app, ["recur", "add", task_id, "--every", "daily"])
+
+    window = ["--due-from", "2030-01-01", "--due-to", "2030-01-03"]
+    result = runner.invoke(app, ["list", "-f", "jsonl", "--sort", "due", *window])
+    rows = [json.loads(line) for line in result.output.splitlines()]
+
+    assert [row["due_date"][:10] for row in rows] == [
+        "2030-01-01", "2030-01-02", "2030-01-03"]
+    assert {row["id"] for row in rows} == {int(task_id)}
+
+    assert len(list_names(*window, "--limit", "2")) == 2
+    assert list_names("--due-from", "2030-01-01") == ["Feed the fish"]
+
+
+@mark.parametrize("suffix", ["csv", "jsonl"])
+def test_export_import_round_trip(test_task: Task, tmp_path, suffix: str):
+    export_file = tmp_path / f"tasks.{suffix}"
+
+    result = runner.invoke(app, ["export", str(export_file)])
+    assert result.exit_code == 0
+    assert "Exported 3 tasks" in result.output
+
+    result = runner.invoke(app, ["import", str(export_file)])
+    assert result.exit_code == 0
+    assert "Imported 3 tasks" in result.output
+
+    result = runner.invoke(app, ["export", "--format", "jsonl"])
+    assert result.exit_code == 0
+    assert result.output.count("Water the baguettes") == 2
+    assert result.output.count('"completed": true') == 2
+
+
+def test_import_rejects_bad_rows(tmp_path):
+    import_file = tmp_path / "tasks.csv"
+    import_file.write_text(
+        "name,description,completed,due_date\n"
+        "Good,,false,2030-01-01T00:00:00\n"
+        "Bad,,maybe,2030-01-01T00:00:00\n"
+    )
+
+    result = runner.invoke(app, ["import", str(import_file)])
+    assert result.exit_code == 1
+    assert "Line 3" in result.output
+
+    result = runner.invoke(app, ["list", "-f", "table"])
+    assert "No tasks found" in result.output
+
+    result = runner.invoke(app, ["import", str(tmp_path / "missing.csv")])
+    assert result.exit_code == 2
+
+
+def test_complete_many_ids_and_ranges(test_task: Task):
+    result = runner.invoke(app, ["complete", "1", "2-3"])
+    assert result.exit_code == 0
+    assert "3 tasks marked complete" in result.output
+
+    result = runner.invoke(app, ["list", "--status", "pending", "-f", "table"])
+    assert "No tasks found" in result.output
+
+
+def test_delete_by_status_filter(test_task: Task):
+    result = runner.invoke(app, ["delete", "--status", "completed"])
+    assert result.exit_code == 0
+    assert "1 task deleted" in result.output
+
+    result = runner.invoke(app, ["delete", "--status", "completed"])
+    assert result.exit_code == 2
+    assert "No matching tasks found" in result.output
+
+
+def test_update_persists_changes(test_task: Task):
+    result = runner.invoke(app, ["update", str(test_task.id), "--name", "Renamed"])
+    assert result.exit_code == 0
+
+    result = runner.invoke(app, ["list", "--limit", "1"])
+    assert "Renamed" in result.output
+
+
+def test_update_by_filter_and_selection_errors(test_task: Task):
+    result = runner.invoke(
+        app, ["update", "--status", "pending", "--description", "Later"])
+    assert result.exit_code == 0
+    assert "1 task updated" in result.output
+
+    result = runner.invoke(app, ["delete"])
+    assert result.exit_code == 2
+    assert "Select tasks by ID" in result.output
+
+    result = runner.invoke(app, ["update", "1"])
+    assert result.exit_code == 2
+    assert "Pass at least one of" in result.output
+
+    result = runner.invoke(app, ["complete", "5-2"])
+    assert result.exit_code == 2
+    assert "Invalid value" in result.output
+
+
+def test_watch_prints_changes_after_the_cursor(test_task: Task):
+    cursor = di[TaskRepository].change_cursor()
+
+    runner.invoke(app, ["complete", str(test_task.id)])
+    runner.invoke(app, ["delete", str(test_task.id)])
+
+    result = runner.invoke(
+        app, ["watch", "--since", str(cursor), "--once", "--format", "jsonl"])
+    assert result.exit_code == 0
+    rows = [json.loads(line) for line in result.output.splitlines()]
+    assert [(row["seq"], row["kind"]) for row in rows] == [
+        (cursor + 1, "update"), (cursor + 2, "delete")]
+    assert rows[1]["task_id"] == test_task.id
+
+    result = runner.invoke(app, ["watch", "--since", str(cursor + 1), "--once"])
+    assert result.exit_code == 0
+    assert f"#{cursor + 2}" in result.output
+    assert f"#{cursor + 1}" not in result.output
+
+    result = runner.invoke(app, ["watch", "--once"])
+    assert "No changes after" in result.output
+
+    result = runner.invoke(app, ["watch", "--once", "--format", "csv"])
+    assert result.exit_code == 2
@@ -0,0 +1,102 @@
+# pylint: disable=redefined-outer-name
+# pylint: disable=unused-argument
+# pylint: disable=unused-import
+# pylint: disable=wrong-import-order
+
+from datetime import datetime
+
+from pytest import fixture, raises
+from sqlalchemy import event
+from typer.testing import CliRunner
+
+from .utils import test_task, engine, override_get_db
+
+from src.task_manager.cli import app
+from src.task_manager.models import Task
+from src.task_manager.repositories import SQLAlchemyTaskRepository
+from src.task_manager.unit_of_work import ambient_session, unit_of_work
+
+runner = CliRunner()
+
+
+@fixture
+def repo():
+    return SQLAlchemyTaskRepository(override_get_db)
+
+
+@fixture
+def checkouts():
+    """Count connection checkouts from the test engine's pool."""
+    counter = []
+
+    def record(dbapi_connection, connection_record, connection_proxy):
+        counter.append(1)
+
+    event.listen(engine.pool, "checkout", record)
+    yield counter
+    event.remove(engine.pool, "checkout", record)
+
+
+def test_calls_share_one_session(test_task: Task, repo, checkouts):
+    with unit_of_work(override_get_db) as session:
+        assert ambient_session(override_get_db) is session
+        task_id = repo.add(Task(name="Inside", due_date=datetime.now()))
+
+        assert repo.get(task_id).name == "Inside"
+        assert len(repo.list()) == 4
+
+    assert len(checkouts) == 1
+    assert ambient_session(override_get_db) is None
+    assert repo.get(task_id).name == "Inside"
+
+
+def test_changes_to_fetched_tasks_are_saved(test_task: Task, repo):
+    with unit_of_work(override_get_db):
+        task = repo.get(test_task.id)
+        task.name = "Renamed"
+
+    assert task.name == "Renamed"
+    assert repo.get(test_task.id).name == "Renamed"
+
+
+def test_error_rolls_back_every_call(test_task: Task, repo):
+    with raises(RuntimeError):
+        with unit_of_work(override_get_db):
+            repo.add(Task(name="Discarded", due_date=datetime.now()))
+            repo.complete(test_task.id)
+            raise RuntimeError("boom")
+
+    assert [task.name for task in repo.list()].count("Discarded") == 0
+    assert not repo.get(test_task.id).completed
+
+
+def test_nested_units_join_the_outer_one(test_task: Task, repo):
+    with unit_of_work(override_get_db) as outer:
+        with unit_of_work(override_get_db) as inner:
+            assert inner is outer
+
+        repo.complete(test_task.id)
+
+    assert repo.get(test_task.id).completed
+
+
+def test_list_command_reads_each_page_in_its_own_transaction(test_task: Task):
+    events = []
+
+    def record(name):
+        return lambda *args: events.append(name)
+
+    on_checkout, on_checkin = record("checkout"), record("checkin")
+    event.listen(engine.pool, "checkout", on_checkout)
+    event.listen(engine.pool, "checkin", on_checkin)
+
+    try:
+        result = runner.invoke(app, ["list", "--page-size", "1", "--format", "jsonl"])
+    finally:
+        event.remove(engine.pool, "checkout", on_checkout)
+        event.remove(engine.pool, "checkin", on_checkin)
+
+    assert result.exit_code == 0
+    assert len(result.output.splitlines()) == 3
+    # Three full pages and an empty one; none stays open across pages.
+    assert events == ["checkout", "checkin"] * 4
@@ -11,7 +11,7 @@ from datetime import datetime, timedelta
 from pytest import fixture
 from kink import di
 
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, event, text
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
@@ -50,14 +50,16 @@ di["db_url"] = SQLALCHEMY_DATABASE_URL
 # Both of these modules depend on the "db_url" and "db_session_context".
 from src.task_manager.database import BASE
 from src.task_manager.models import Task
+from src.task_manager.migrations import migrate
+from src.task_manager.protocols import TaskRepository
+from src.task_manager.repositories import InMemoryTaskRepository
 
 BASE.metadata.create_all(bind=engine)
+migrate(engine)
 
 
 @fixture
 def test_task():
-    db = TestingSessionLocal()
-
     task = Task(
         name="Water the baguettes",
         description="Strange dream",
@@ -65,9 +67,6 @@ def test_task():
         due_date=datetime.now()
     )
 
-    db.add(task)
-    db.commit()
-
     task_2 = Task(
         name="Take the cat for a walk",
         description="This is impossible",
@@ -75,9 +74,6 @@ def test_task():
         due_date=datetime.now()
     )
 
-    db.add(task_2)
-    db.commit()
-
     task_3 = Task(
         name="Go to the store",
         description="Need food",
@@ -85,11 +81,43 @@ def test_task():
         due_date=datetime.now() + timedelta(days=1)
     )
 
-    db.add(task_3)
-    db.commit()
+    # Contract tests can swap in a non-SQL backend; seed that one directly.
+    repository = di[TaskRepository]
+
+    if isinstance(repository, InMemoryTaskRepository):
+        for seeded in (task, task_2, task_3):
+            repository.add(seeded)
+
+        yield task
+        return
+
+    db = TestingSessionLocal()
+
+    for seeded in (task, task_2, task_3):
+        db.add(seeded)
+        db.commit()
 
     yield task
 
     with engine.connect() as connection:
         connection.execute(text("DELETE FROM tasks;"))
+        # Tasks get AUTOINCREMENT IDs; the next test starts again from 1.
+        connection.execute(text("DELETE FROM sqlite_sequence WHERE name = 'tasks';"))
         connection.commit()
+
+
+@fixture
+def sql_statements():
+    """Record every SQL statement sent to the test engine."""
+    from src.task_manager.bootstrap import initialize
+
+    # Schema setup on first use must not count towards the command.
+    initialize()
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    yield statements
+    event.remove(engine, "before_cursor_execute", record)